@@ -0,0 +1,227 @@
+"""Benchmark de reruns por página usando ``streamlit.testing.v1.AppTest``.
+
+Cada escenario abre una página y repite la interacción que hacen los usuarios
+(cambiar el radio de Tipos, el selectbox de Familias, enviar el test...). Se mide:
+
+* ``cold``: la primera ejecución en un proceso nuevo (imports y cachés vacías).
+* ``warm``: los reruns siguientes dentro del mismo proceso.
+
+Los resultados se escriben en JSON para poder compararlos entre commits::
+
+    python benchmarks/bench_pages.py --output bench.json
+    python benchmarks/bench_pages.py --compare bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+APP_DIR = Path(__file__).resolve().parent.parent
+APP_SCRIPT = APP_DIR / "app.py"
+
+
+def _page(name: str) -> str:
+    """Ruta de una página relativa al script principal (carpeta ``pages/``)."""
+
+    return f"pages/{name}"
+
+
+def _open(page: Optional[str]) -> Callable[[object], None]:
+    def setup(at) -> None:
+        if page:
+            at.switch_page(page)
+
+    return setup
+
+
+def _rerun(at, step: int) -> None:
+    """Rerun sin interacción (navegación o recarga de la página)."""
+
+
+def _tipos_radio(at, step: int) -> None:
+    radio = at.radio[0]
+    radio.set_value(radio.options[step % len(radio.options)])
+
+
+def _familias_selectbox(at, step: int) -> None:
+    selectbox = at.selectbox[0]
+    selectbox.select(selectbox.options[step % len(selectbox.options)])
+
+
+def _quiz_submit(at, step: int) -> None:
+    for radio in at.radio:
+        radio.set_value(radio.options[step % len(radio.options)])
+    at.button[0].click()
+
+
+# nombre -> (página, interacción que precede a cada rerun medido)
+SCENARIOS: Dict[str, tuple] = {
+    "inicio": (None, _rerun),
+    "tipos_radio": (_page("1_Tipos_de_Perfumes.py"), _tipos_radio),
+    "familias_selectbox": (_page("2_Familias_Olfativas.py"), _familias_selectbox),
+    "curiosidades": (_page("3_Curiosidades.py"), _rerun),
+    "quiz_submit": (_page("4_Test_Interactivo.py"), _quiz_submit),
+    "contacto": (_page("5_Contacto.py"), _rerun),
+}
+
+
+def percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    """p50/p90/p99 (interpolación lineal), mínimo, máximo y media, en milisegundos."""
+
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+
+    def pick(q: float) -> float:
+        pos = (len(ordered) - 1) * q
+        low = int(pos)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+    return {
+        "p50": round(pick(0.50), 3),
+        "p90": round(pick(0.90), 3),
+        "p99": round(pick(0.99), 3),
+        "min": round(ordered[0], 3),
+        "max": round(ordered[-1], 3),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "n": len(ordered),
+    }
+
+
+def _timed_run(at, timeout: float) -> float:
+    start = time.perf_counter()
+    at.run(timeout=timeout)
+    elapsed = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(f"La página lanzó una excepción: {at.exception[0].value}")
+    return elapsed
+
+
+def run_scenario(name: str, repeats: int, timeout: float) -> Dict[str, object]:
+    """Ejecuta un escenario en el proceso actual; se espera que sea un proceso recién creado."""
+
+    os.chdir(APP_DIR)
+    if str(APP_DIR) not in sys.path:
+        sys.path.insert(0, str(APP_DIR))
+
+    from streamlit.testing.v1 import AppTest
+
+    page, interact = SCENARIOS[name]
+    at = AppTest.from_file(str(APP_SCRIPT), default_timeout=timeout)
+
+    cold_ms = _timed_run(at, timeout)
+    if page:
+        _open(page)(at)
+        cold_ms += _timed_run(at, timeout)
+
+    tracemalloc.start()
+    warm: List[float] = []
+    for step in range(repeats):
+        interact(at, step)
+        warm.append(_timed_run(at, timeout))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "cold_ms": cold_ms,
+        "warm_ms": warm,
+        "peak_tracemalloc_kb": round(peak / 1024, 1),
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def _worker(args) -> Dict[str, object]:
+    return run_scenario(*args)
+
+
+def benchmark(names: Sequence[str], repeats: int, cold_repeats: int, timeout: float) -> Dict[str, object]:
+    """Lanza cada escenario ``cold_repeats`` veces, cada una en un proceso nuevo."""
+
+    context = multiprocessing.get_context("spawn")
+    results: Dict[str, object] = {}
+    for name in names:
+        runs = []
+        for _ in range(cold_repeats):
+            with context.Pool(1) as pool:
+                runs.append(pool.apply(_worker, ((name, repeats, timeout),)))
+        results[name] = {
+            "cold_ms": percentiles([run["cold_ms"] for run in runs]),
+            "warm_ms": percentiles([sample for run in runs for sample in run["warm_ms"]]),
+            "peak_tracemalloc_kb": max(run["peak_tracemalloc_kb"] for run in runs),
+            "max_rss_kb": max(run["max_rss_kb"] for run in runs),
+        }
+    return results
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object]) -> List[str]:
+    """Líneas legibles con la variación de p50 en frío y en caliente respecto a otra ejecución."""
+
+    lines = []
+    for name, result in current["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for metric in ("cold_ms", "warm_ms"):
+            before, after = previous[metric]["p50"], result[metric]["p50"]
+            delta = (after - before) / before * 100 if before else 0.0
+            lines.append(f"{name:<20} {metric:<8} p50 {before:9.2f} -> {after:9.2f} ms ({delta:+.1f}%)")
+    return lines
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenarios", nargs="*", help=f"escenarios a medir (por defecto todos): {', '.join(SCENARIOS)}")
+    parser.add_argument("--repeats", type=int, default=20, help="reruns en caliente por proceso")
+    parser.add_argument("--cold-repeats", type=int, default=3, help="procesos nuevos por escenario")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", type=Path, help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--compare", type=Path, help="JSON de una ejecución anterior para comparar")
+    args = parser.parse_args(argv)
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"escenarios desconocidos: {', '.join(sorted(unknown))}")
+
+    report = {
+        "revision": _git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeats": args.repeats,
+        "cold_repeats": args.cold_repeats,
+        "scenarios": benchmark(args.scenarios or list(SCENARIOS), args.repeats, args.cold_repeats, args.timeout),
+    }
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+    if args.compare:
+        for line in compare(report, json.loads(args.compare.read_text(encoding="utf-8"))):
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
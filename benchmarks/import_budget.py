@@ -0,0 +1,128 @@
+"""Informe de tiempos de importación y control de presupuesto para el arranque en frío.
+
+Cada página importa ``utils`` antes de mostrar nada, así que su costo de importación se
+paga en cada réplica nueva. Este script importa los módulos indicados en un intérprete
+nuevo con ``python -X importtime``, muestra los módulos más costosos y falla si:
+
+* el tiempo acumulado de un módulo supera ``--budget-ms`` (mediana de ``--repeats``), o
+* se importa de forma anticipada alguno de los módulos pesados de ``--forbid``.
+
+Uso::
+
+    python benchmarks/import_budget.py
+    python benchmarks/import_budget.py utils profiling --budget-ms 150 --output imports.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODULES = ("utils",)
+DEFAULT_BUDGET_MS = 250.0
+# Dependencias que solo deben cargarse cuando una página las usa de verdad.
+DEFAULT_FORBIDDEN = ("pandas", "numpy", "PIL", "streamlit", "urllib.request", "http.server", "cProfile")
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+def parse_importtime(output: str, target: str) -> List[ImportRecord]:
+    """Registros de ``-X importtime`` que pertenecen al árbol de importación de ``target``.
+
+    La salida está en postorden: los submódulos aparecen antes que el módulo que los
+    importa y la sangría del nombre indica la profundidad.
+    """
+
+    subtree: List[ImportRecord] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # cabecera "self [us] | cumulative | imported package"
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        subtree.append(ImportRecord(stripped, int(self_us) / 1000, int(cumulative_us) / 1000, depth))
+        if depth == 0:
+            if stripped == target:
+                return subtree
+            subtree = []
+    return []
+
+
+def measure(module: str) -> List[ImportRecord]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"no se pudo importar {module}:\n{completed.stderr[-2000:]}")
+    return parse_importtime(completed.stderr, module)
+
+
+def report_module(module: str, repeats: int, budget_ms: float, forbidden: Sequence[str], top: int) -> Dict[str, object]:
+    runs = [measure(module) for _ in range(repeats)]
+    totals = [run[-1].cumulative_ms for run in runs if run]
+    median_run = sorted(runs, key=lambda run: run[-1].cumulative_ms if run else 0.0)[len(runs) // 2]
+    imported = {record.module for record in median_run}
+    eager = sorted(name for name in forbidden if name in imported)
+    total_ms = statistics.median(totals) if totals else 0.0
+    return {
+        "module": module,
+        "cumulative_ms": round(total_ms, 2),
+        "budget_ms": budget_ms,
+        "over_budget": total_ms > budget_ms,
+        "eager_imports": eager,
+        "slowest": [asdict(record) for record in sorted(median_run, key=lambda r: r.self_ms, reverse=True)[:top]],
+    }
+
+
+def format_report(reports: Sequence[Dict[str, object]]) -> str:
+    lines = []
+    for report in reports:
+        status = "FUERA DE PRESUPUESTO" if report["over_budget"] else "ok"
+        lines.append(f"{report['module']}: {report['cumulative_ms']:.1f} ms (presupuesto {report['budget_ms']:.0f} ms) {status}")
+        lines.append(f"  {'propio ms':>10} {'acumulado ms':>13}  módulo")
+        for record in report["slowest"]:
+            lines.append(f"  {record['self_ms']:>10.2f} {record['cumulative_ms']:>13.2f}  {'  ' * record['depth']}{record['module']}")
+        if report["eager_imports"]:
+            lines.append(f"  importaciones anticipadas no permitidas: {', '.join(report['eager_imports'])}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", help=f"módulos a importar (por defecto: {', '.join(DEFAULT_MODULES)})")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="tiempo acumulado máximo por módulo")
+    parser.add_argument("--forbid", nargs="*", default=list(DEFAULT_FORBIDDEN), help="módulos que no deben importarse al inicio")
+    parser.add_argument("--repeats", type=int, default=5, help="intérpretes nuevos por módulo (se usa la mediana)")
+    parser.add_argument("--top", type=int, default=15, help="módulos más lentos a mostrar")
+    parser.add_argument("--output", type=Path, help="archivo JSON donde guardar el informe")
+    args = parser.parse_args(argv)
+
+    reports = [report_module(module, args.repeats, args.budget_ms, args.forbid, args.top) for module in args.modules or DEFAULT_MODULES]
+    print(format_report(reports))
+    if args.output:
+        args.output.write_text(json.dumps(reports, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return 1 if any(report["over_budget"] or report["eager_imports"] for report in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
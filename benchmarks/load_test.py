@@ -0,0 +1,454 @@
+"""Generador de carga con muchas sesiones simultáneas.
+
+Cada proceso trabajador mantiene ``--sessions`` sesiones abiertas a la vez, que
+repiten el recorrido habitual de un visitante hasta agotar ``--duration``:
+
+    inicio → Tipos (cambios del radio) → Familias (cambios del selectbox) → envío del test
+
+Hay dos modos:
+
+* ``apptest`` (por defecto): cada sesión es un ``AppTest`` dentro del proceso
+  trabajador, así que todas comparten las cachés del proceso como en un servidor real.
+  ``AppTest`` no admite ejecuciones en paralelo dentro de un proceso, de modo que las
+  sesiones de un trabajador se intercalan paso a paso y la concurrencia real la dan
+  los procesos.
+* ``websocket``: las sesiones hablan con un servidor de Streamlit por el mismo websocket
+  que usa el navegador (requiere el paquete ``websockets``). Se puede indicar un
+  servidor ya en marcha con ``--url`` y ``--server-pid`` o arrancar uno con
+  ``--start-server``.
+
+Se informa de sesiones y reruns por segundo, percentiles de latencia por paso y la
+memoria residente añadida por sesión::
+
+    python benchmarks/load_test.py --processes 4 --sessions 8 --duration 60
+    python benchmarks/load_test.py --mode websocket --start-server --sessions 16 --output carga.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from bench_pages import APP_DIR, APP_SCRIPT, _git_revision, _page, percentiles
+
+TIPOS = _page("1_Tipos_de_Perfumes.py")
+FAMILIAS = _page("2_Familias_Olfativas.py")
+QUIZ = _page("4_Test_Interactivo.py")
+
+Sample = Tuple[str, float]
+
+
+class SessionError(RuntimeError):
+    """La página respondió con una excepción durante el recorrido."""
+
+
+def _rss_kb(pid: Optional[int] = None) -> Optional[int]:
+    """Memoria residente actual de un proceso (Linux), o ``None`` si no se puede leer."""
+
+    try:
+        with open(f"/proc/{pid or 'self'}/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+class _RssSampler:
+    """Muestrea la memoria residente de un proceso en segundo plano y guarda el máximo."""
+
+    def __init__(self, pid: Optional[int] = None, interval: float = 0.2) -> None:
+        self.pid = pid
+        self.interval = interval
+        self.baseline = _rss_kb(pid)
+        self.peak = self.baseline
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            current = _rss_kb(self.pid)
+            if current is not None and (self.peak is None or current > self.peak):
+                self.peak = current
+
+    def __enter__(self) -> "_RssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+class AppTestSession:
+    """Sesión simulada con ``streamlit.testing.v1.AppTest`` en el proceso actual."""
+
+    def __init__(self, timeout: float) -> None:
+        from streamlit.testing.v1 import AppTest
+
+        self.timeout = timeout
+        self.at = AppTest.from_file(str(APP_SCRIPT), default_timeout=timeout)
+
+    def _run(self) -> None:
+        self.at.run(timeout=self.timeout)
+        if self.at.exception:
+            raise SessionError(self.at.exception[0].value)
+
+    def open(self, page: Optional[str]) -> None:
+        if page:
+            self.at.switch_page(page)
+        self._run()
+
+    def choose(self, kind: str, index: int) -> None:
+        widget = getattr(self.at, kind)[0]
+        if kind == "selectbox":
+            widget.select(widget.options[index % len(widget.options)])
+        else:
+            widget.set_value(widget.options[index % len(widget.options)])
+        self._run()
+
+    def submit_form(self, rng: random.Random) -> None:
+        for radio in self.at.radio:
+            radio.set_value(rng.choice(radio.options))
+        self.at.button[0].click()
+        self._run()
+
+    def close(self) -> None:
+        pass
+
+
+class WebsocketSession:
+    """Sesión que habla con un servidor de Streamlit por ``/_stcore/stream`` como un navegador."""
+
+    def __init__(self, url: str, timeout: float) -> None:
+        from websockets.sync.client import connect
+
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        self._BackMsg, self._ForwardMsg, self._WidgetState = BackMsg, ForwardMsg, WidgetState
+        stream = url.rstrip("/").replace("http://", "ws://").replace("https://", "wss://") + "/_stcore/stream"
+        self.timeout = timeout
+        self.ws = connect(stream, subprotocols=["streamlit"], max_size=None, open_timeout=timeout)
+        self.pages: Dict[str, str] = {}
+        self.page_hash = ""
+        self.widgets: Dict[str, list] = {}
+        self.rendered: Tuple[bytes, ...] = ()
+        self.selected: Dict[str, str] = {}
+
+    def _rerun(self, states: Sequence[object] = ()) -> None:
+        message = self._BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.page_script_hash = self.page_hash
+        message.rerun_script.widget_states.widgets.extend(states)
+        self.ws.send(message.SerializeToString())
+
+        widgets: Dict[str, list] = {}
+        rendered: List[bytes] = []
+        while True:
+            reply = self._ForwardMsg()
+            reply.ParseFromString(self.ws.recv(timeout=self.timeout))
+            kind = reply.WhichOneof("type")
+            if kind == "script_finished":
+                break
+            if kind == "navigation":
+                self.pages = {page.url_pathname: page.page_script_hash for page in reply.navigation.app_pages}
+            elif kind == "delta" and reply.delta.WhichOneof("type") == "new_element":
+                element = reply.delta.new_element
+                name = element.WhichOneof("type")
+                if name == "exception":
+                    raise SessionError(element.exception.message)
+                widgets.setdefault(name, []).append(getattr(element, name))
+                rendered.append(element.SerializeToString())
+        self.widgets = widgets
+        self.rendered = tuple(rendered)
+
+    def _rerun_changing(self, states: Sequence[object], what: str) -> None:
+        """Rerun que debe cambiar la página; si el servidor ignoró los valores, falla la sesión."""
+
+        previous = self.rendered
+        self._rerun(states)
+        if self.rendered == previous:
+            raise SessionError(f"el servidor ignoró {what}: la página no cambió")
+
+    def open(self, page: Optional[str]) -> None:
+        if page:
+            # "pages/1_Tipos_de_Perfumes.py" se publica como "Tipos_de_Perfumes"
+            self.page_hash = self.pages[Path(page).stem.split("_", 1)[1]]
+        self.selected = {}  # un rerun sin estados devuelve los widgets a su valor inicial
+        self._rerun()
+
+    def choose(self, kind: str, index: int) -> None:
+        widget = self.widgets[kind][0]
+        value = widget.options[index % len(widget.options)]
+        state = self._WidgetState(id=widget.id, string_value=value)
+        if value == self.selected.get(widget.id, widget.options[widget.default]):
+            self._rerun([state])
+        else:
+            self._rerun_changing([state], f"el valor {value!r} del {kind}")
+        self.selected[widget.id] = value
+
+    def submit_form(self, rng: random.Random) -> None:
+        states = [self._WidgetState(id=radio.id, string_value=rng.choice(radio.options)) for radio in self.widgets["radio"]]
+        states += [self._WidgetState(id=button.id, trigger_value=True) for button in self.widgets["button"] if button.is_form_submitter]
+        self._rerun_changing(states, "el envío del formulario")
+
+    def close(self) -> None:
+        self.ws.close()
+
+
+def click_path(session, rng: random.Random, changes: int) -> List[Tuple[str, Callable[[], None]]]:
+    """Pasos del recorrido de un visitante: portada, Tipos, Familias y envío del test."""
+
+    steps: List[Tuple[str, Callable[[], None]]] = [("inicio", lambda: session.open(None)), ("tipos", lambda: session.open(TIPOS))]
+    steps += [("tipos_radio", lambda: session.choose("radio", rng.randrange(10)))] * changes
+    steps += [("familias", lambda: session.open(FAMILIAS))]
+    steps += [("familias_selectbox", lambda: session.choose("selectbox", rng.randrange(10)))] * changes
+    steps += [("quiz", lambda: session.open(QUIZ)), ("quiz_submit", lambda: session.submit_form(rng))]
+    return steps
+
+
+class _Visit:
+    """Una sesión en curso: su cliente y los pasos que le quedan por ejecutar."""
+
+    def __init__(self, mode: str, url: str, timeout: float, rng: random.Random, changes: int) -> None:
+        self.session = AppTestSession(timeout) if mode == "apptest" else WebsocketSession(url, timeout)
+        self.steps = click_path(self.session, rng, changes)
+        self.samples: List[Sample] = []
+
+    def step(self) -> bool:
+        """Ejecuta el siguiente paso; devuelve ``False`` cuando el recorrido terminó."""
+
+        name, action = self.steps.pop(0)
+        start = time.perf_counter()
+        action()
+        self.samples.append((name, (time.perf_counter() - start) * 1000))
+        return bool(self.steps)
+
+
+def run_worker(mode: str, sessions: int, duration: float, changes: int, timeout: float, url: str, seed: int) -> Dict[str, object]:
+    """Ejecuta ``sessions`` sesiones concurrentes en este proceso hasta agotar ``duration``."""
+
+    os.chdir(APP_DIR)
+    if str(APP_DIR) not in sys.path:
+        sys.path.insert(0, str(APP_DIR))
+
+    samples: List[Sample] = []
+    errors: List[str] = []
+    completed = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def finish(visit: Optional[_Visit], error: Optional[Exception]) -> None:
+        with lock:
+            if error is not None:
+                errors.append(f"{type(error).__name__}: {error}")
+            else:
+                completed[0] += 1
+            if visit is not None:
+                samples.extend(visit.samples)
+                visit.session.close()
+
+    def interleaved(rng: random.Random) -> None:
+        """Modo ``apptest``: todas las sesiones del proceso avanzan un paso por turno."""
+
+        visits: List[Optional[_Visit]] = [None] * sessions
+        while time.monotonic() < deadline or any(visits):
+            for slot, visit in enumerate(visits):
+                try:
+                    if visit is None:
+                        if time.monotonic() >= deadline:
+                            continue
+                        visit = visits[slot] = _Visit(mode, url, timeout, rng, changes)
+                    if not visit.step():
+                        finish(visit, None)
+                        visits[slot] = None
+                except Exception as error:  # una sesión fallida no detiene la prueba
+                    finish(visit, error)
+                    visits[slot] = None
+
+    def threaded(index: int) -> None:
+        """Modo ``websocket``: cada sesión en su hilo, como navegadores independientes."""
+
+        rng = random.Random(seed * 1000 + index)
+        while time.monotonic() < deadline:
+            visit = None
+            try:
+                visit = _Visit(mode, url, timeout, rng, changes)
+                while visit.step():
+                    pass
+            except Exception as error:  # una sesión fallida no detiene la prueba
+                finish(visit, error)
+            else:
+                finish(visit, None)
+
+    if mode == "apptest":
+        # Imports y cachés del proceso se cargan antes de medir, como en un servidor ya arrancado.
+        AppTestSession(timeout).open(None)
+
+    with _RssSampler() as sampler:
+        if mode == "apptest":
+            interleaved(random.Random(seed))
+        else:
+            threads = [threading.Thread(target=threaded, args=(index,), daemon=True) for index in range(sessions)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+    return {
+        "samples": samples,
+        "sessions": completed[0],
+        "errors": errors,
+        "rss_baseline_kb": sampler.baseline,
+        "rss_peak_kb": sampler.peak,
+    }
+
+
+def _worker(args) -> Dict[str, object]:
+    return run_worker(*args)
+
+
+def start_server(port: int, timeout: float = 60.0) -> subprocess.Popen:
+    """Arranca ``streamlit run app.py`` sin navegador y espera a que responda el health check."""
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(APP_SCRIPT), "--server.headless", "true", "--server.port", str(port)],
+        cwd=APP_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=2) as response:
+                if response.status == 200:
+                    return process
+        except OSError:
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("el servidor de Streamlit no respondió a tiempo")
+
+
+def load_test(
+    mode: str,
+    processes: int,
+    sessions: int,
+    duration: float,
+    changes: int,
+    timeout: float,
+    url: str,
+    server_pid: Optional[int],
+) -> Dict[str, object]:
+    context = multiprocessing.get_context("spawn")
+    jobs = [(mode, sessions, duration, changes, timeout, url, seed) for seed in range(processes)]
+    if mode == "websocket":
+        # Una visita previa carga los módulos de la app en el servidor antes de medir su memoria.
+        warmup = WebsocketSession(url, timeout)
+        warmup.open(None)
+        warmup.close()
+    server_sampler = _RssSampler(server_pid) if server_pid else None
+
+    start = time.perf_counter()
+    if server_sampler is not None:
+        server_sampler.__enter__()
+    try:
+        with context.Pool(processes) as pool:
+            runs = pool.map(_worker, jobs)
+    finally:
+        if server_sampler is not None:
+            server_sampler.__exit__()
+    elapsed = time.perf_counter() - start
+
+    samples = [sample for run in runs for sample in run["samples"]]
+    by_step: Dict[str, List[float]] = {}
+    for step, ms in samples:
+        by_step.setdefault(step, []).append(ms)
+    concurrent = processes * sessions
+
+    if mode == "apptest":
+        # Cada trabajador es el "servidor" de sus sesiones: se promedia lo que añadió cada una.
+        growth = [run["rss_peak_kb"] - run["rss_baseline_kb"] for run in runs if run["rss_peak_kb"] and run["rss_baseline_kb"]]
+        rss_per_session = round(sum(growth) / len(growth) / sessions, 1) if growth else None
+        rss_peak = max((run["rss_peak_kb"] or 0) for run in runs) or None
+    elif server_sampler is not None and server_sampler.peak and server_sampler.baseline:
+        rss_per_session = round((server_sampler.peak - server_sampler.baseline) / concurrent, 1)
+        rss_peak = server_sampler.peak
+    else:
+        rss_per_session = rss_peak = None
+
+    errors = [error for run in runs for error in run["errors"]]
+    completed = sum(run["sessions"] for run in runs)
+    return {
+        "sessions_completed": completed,
+        "sessions_per_second": round(completed / elapsed, 3),
+        "reruns_per_second": round(len(samples) / elapsed, 3),
+        "rerun_ms": percentiles([ms for _, ms in samples]),
+        "steps_ms": {step: percentiles(values) for step, values in by_step.items()},
+        "server_rss_peak_kb": rss_peak,
+        "server_rss_per_session_kb": rss_per_session,
+        "errors": len(errors),
+        "error_examples": sorted(set(errors))[:5],
+        "elapsed_s": round(elapsed, 2),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("apptest", "websocket"), default="apptest")
+    parser.add_argument("--processes", type=int, default=2, help="procesos generadores de carga")
+    parser.add_argument("--sessions", type=int, default=4, help="sesiones simultáneas por proceso")
+    parser.add_argument("--duration", type=float, default=30.0, help="segundos de carga")
+    parser.add_argument("--changes", type=int, default=3, help="cambios de radio/selectbox por página")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--url", default="http://127.0.0.1:8501", help="servidor para el modo websocket")
+    parser.add_argument("--server-pid", type=int, help="PID del servidor para medir su memoria (modo websocket)")
+    parser.add_argument("--start-server", action="store_true", help="arranca un servidor propio en --port")
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--output", type=Path, help="archivo JSON donde guardar los resultados")
+    args = parser.parse_args(argv)
+
+    server = None
+    url, server_pid = args.url, args.server_pid
+    if args.mode == "websocket" and args.start_server:
+        server = start_server(args.port)
+        url, server_pid = f"http://127.0.0.1:{args.port}", server.pid
+    try:
+        results = load_test(
+            args.mode, args.processes, args.sessions, args.duration, args.changes, args.timeout, url, server_pid
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    report = {
+        "revision": _git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "mode": args.mode,
+        "processes": args.processes,
+        "sessions_per_process": args.sessions,
+        "duration_s": args.duration,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 1 if results["errors"] and not results["sessions_completed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
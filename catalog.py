@@ -0,0 +1,389 @@
+"""Catálogo persistente de perfumes en SQLite con consultas paginadas.
+
+La base se genera la primera vez a partir de ``SEED_PERFUMES`` (o se reemplaza con
+``python catalog.py --import catalogo.csv``) y luego solo se lee. Las columnas por las
+que filtran las páginas (tipo, familia, marca y concentración) están indexadas, de modo
+que cada consulta lee únicamente la página pedida aunque el catálogo tenga cientos de
+miles de referencias.
+
+Los perfumes marcados como ``destacado`` son los ejemplos que se muestran para cada tipo;
+si un tipo no tiene ninguno se usan los primeros del catálogo.
+
+Al cambiar el esquema, una base anterior se migra conservando sus perfumes (un catálogo
+importado no se pierde); si no se puede migrar, se lanza :class:`CatalogError` en lugar
+de sustituirla por los datos de ejemplo.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import math
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+DB_ENV_VAR = "PERFUME_CATALOG_DB"
+DEFAULT_DB_PATH = Path(__file__).parent / "data" / "catalog.sqlite"
+
+# Incrementar al cambiar el esquema: las bases anteriores se migran al abrirlas.
+SCHEMA_VERSION = 3
+
+# Concentración típica de esencia (%) por tipo, usada cuando un registro no la especifica.
+TYPICAL_CONCENTRATION = {
+    "Parfum (Extracto)": 30.0,
+    "Eau de Parfum": 17.5,
+    "Eau de Toilette": 10.0,
+    "Eau de Cologne": 3.5,
+    "Body Mist": 2.0,
+}
+
+# (nombre, marca, tipo, familia, notas)
+SEED_PERFUMES: Tuple[Tuple[str, str, str, str, str], ...] = (
+    ("Chanel No.5 Parfum", "Chanel", "Parfum (Extracto)", "Floral", "aldehídos, rosa, jazmín, iris, sándalo, vainilla"),
+    ("Maison Francis Kurkdjian Baccarat Rouge 540", "Maison Francis Kurkdjian", "Parfum (Extracto)", "Oriental", "azafrán, jazmín, ámbar, cedro"),
+    ("Dior J'adore", "Dior", "Eau de Parfum", "Floral", "flores blancas, jazmín, rosa, frutal"),
+    ("YSL Libre", "Yves Saint Laurent", "Eau de Parfum", "Floral", "lavanda, flores blancas, vainilla, mandarina"),
+    ("Acqua di Gio", "Giorgio Armani", "Eau de Toilette", "Cítrica", "acuático, cítricos, bergamota, romero, almizcle"),
+    ("CH 212", "Carolina Herrera", "Eau de Toilette", "Floral", "flores blancas, cítricos, almizcle, sándalo"),
+    ("4711 Original", "4711", "Eau de Cologne", "Cítrica", "cítricos, bergamota, limón, neroli, romero"),
+    ("Tom Ford Neroli Portofino", "Tom Ford", "Eau de Cologne", "Cítrica", "neroli, bergamota, limón, mandarina, ámbar"),
+    ("Victoria's Secret Love Spell", "Victoria's Secret", "Body Mist", "Floral", "frutal, flores blancas, jazmín"),
+    ("Bath & Body Works Gingham", "Bath & Body Works", "Body Mist", "Floral", "frutal, verde, almizcle, flores blancas"),
+    ("Marc Jacobs Daisy", "Marc Jacobs", "Eau de Toilette", "Floral", "frutal, verde, jazmín, almizcle"),
+    ("Dior Eau Sauvage", "Dior", "Eau de Toilette", "Cítrica", "limón, bergamota, romero, vetiver"),
+    ("Atelier Cologne Orange Sanguine", "Atelier Cologne", "Eau de Parfum", "Cítrica", "mandarina, cítricos, jazmín, cedro"),
+    ("Terre d'Hermès", "Hermès", "Eau de Toilette", "Amaderada", "mandarina, especias, vetiver, cedro"),
+    ("Tom Ford Oud Wood", "Tom Ford", "Eau de Parfum", "Amaderada", "oud, sándalo, especias, vainilla, tonka"),
+    ("Guerlain Shalimar", "Guerlain", "Eau de Parfum", "Oriental", "bergamota, vainilla, incienso, iris, ámbar"),
+    ("Yves Saint Laurent Opium", "Yves Saint Laurent", "Eau de Parfum", "Oriental", "especias, incienso, ámbar, vainilla, pachulí"),
+    ("Giorgio Armani Acqua di Giò Profumo", "Giorgio Armani", "Eau de Parfum", "Aromática", "acuático, bergamota, salvia, incienso, pachulí"),
+    ("Dior Sauvage", "Dior", "Eau de Toilette", "Aromática", "bergamota, especias, lavanda, ámbar, cedro"),
+)
+
+# Ejemplos elegidos para cada tipo (se marcan como destacados al generar la base).
+SEED_FEATURED = frozenset(
+    {
+        "Chanel No.5 Parfum",
+        "Maison Francis Kurkdjian Baccarat Rouge 540",
+        "Dior J'adore",
+        "YSL Libre",
+        "Acqua di Gio",
+        "CH 212",
+        "4711 Original",
+        "Tom Ford Neroli Portofino",
+        "Victoria's Secret Love Spell",
+        "Bath & Body Works Gingham",
+    }
+)
+
+_SCHEMA = """
+CREATE TABLE perfumes (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    marca TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    familia TEXT NOT NULL,
+    concentracion REAL NOT NULL,
+    notas TEXT NOT NULL DEFAULT '',
+    destacado INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX idx_perfumes_tipo ON perfumes (tipo, familia);
+CREATE INDEX idx_perfumes_destacado ON perfumes (tipo, destacado DESC, id);
+CREATE INDEX idx_perfumes_familia ON perfumes (familia);
+CREATE INDEX idx_perfumes_marca ON perfumes (marca);
+CREATE INDEX idx_perfumes_concentracion ON perfumes (concentracion);
+"""
+
+
+class CatalogError(RuntimeError):
+    """La base del catálogo existe pero no se puede usar ni migrar al esquema actual."""
+
+
+@dataclass(frozen=True)
+class Perfume:
+    id: int
+    nombre: str
+    marca: str
+    tipo: str
+    familia: str
+    concentracion: float
+    notas: str = ""
+
+    @property
+    def lista_notas(self) -> List[str]:
+        return [nota.strip() for nota in self.notas.split(",") if nota.strip()]
+
+
+class CatalogError(RuntimeError):
+    """La base del catálogo existe pero no se puede usar ni migrar al esquema actual."""
+
+
+@dataclass(frozen=True)
+class PerfumePage:
+    """Una página de resultados junto con el total de coincidencias."""
+
+    items: List[Perfume]
+    total: int
+    page: int
+    page_size: int
+
+    @property
+    def pages(self) -> int:
+        return max(1, math.ceil(self.total / self.page_size))
+
+
+def db_path() -> Path:
+    return Path(os.environ.get(DB_ENV_VAR, DEFAULT_DB_PATH))
+
+
+def build_catalog(path: Path, records: Iterable[Sequence[object]]) -> None:
+    """Crea la base en un archivo temporal y la publica de forma atómica en ``path``.
+
+    Cada registro es ``(nombre, marca, tipo, familia[, notas[, concentracion[, destacado]]])``,
+    con las notas separadas por comas.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript(_SCHEMA)
+        conn.executemany(
+            "INSERT INTO perfumes (nombre, marca, tipo, familia, notas, concentracion, destacado) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    nombre,
+                    marca,
+                    tipo,
+                    familia,
+                    rest[0] if rest and rest[0] else "",
+                    float(rest[1]) if len(rest) > 1 and rest[1] not in (None, "") else TYPICAL_CONCENTRATION.get(tipo, 0.0),
+                    int(len(rest) > 2 and str(rest[2]).strip().lower() in {"1", "true", "yes", "si", "sí"}),
+                )
+                for nombre, marca, tipo, familia, *rest in records
+            ),
+        )
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    tmp.replace(path)
+
+
+def _schema_version(path: Path) -> Optional[int]:
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return None
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+
+
+def _seed_records() -> Iterator[Tuple[object, ...]]:
+    for nombre, marca, tipo, familia, notas in SEED_PERFUMES:
+        yield nombre, marca, tipo, familia, notas, "", nombre in SEED_FEATURED
+
+
+def _migrate(path: Path) -> None:
+    """Reconstruye ``path`` con el esquema actual conservando sus perfumes.
+
+    Una base idéntica a los datos de ejemplo se regenera desde ``SEED_PERFUMES`` (así
+    recupera los destacados); cualquier otra se copia fila a fila.
+    """
+
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(perfumes)")}
+            missing = sorted({"nombre", "marca", "tipo", "familia"} - columns)
+            if missing:
+                raise CatalogError(
+                    f"La base {path} no tiene las columnas {', '.join(missing)}; "
+                    "vuelve a importarla con python catalog.py --import <catalogo.csv>."
+                )
+            optional = ", ".join(column if column in columns else "NULL" for column in ("notas", "concentracion", "destacado"))
+            rows = conn.execute(f"SELECT nombre, marca, tipo, familia, {optional} FROM perfumes ORDER BY rowid").fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error as error:
+        raise CatalogError(
+            f"No se pudo migrar {path} al esquema {SCHEMA_VERSION} ({error}); "
+            "vuelve a importarla con python catalog.py --import <catalogo.csv>."
+        ) from error
+    if {row[0] for row in rows} == {perfume[0] for perfume in SEED_PERFUMES}:
+        build_catalog(path, _seed_records())
+    else:
+        build_catalog(path, rows)
+
+
+_init_lock = threading.Lock()
+_local = threading.local()
+
+
+def _file_version(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def _connection() -> sqlite3.Connection:
+    """Conexión de solo lectura por hilo (Streamlit ejecuta cada sesión en su propio hilo).
+
+    Si el archivo se reemplaza (``python catalog.py --import``) cambia su inodo o su fecha
+    de modificación y la conexión se vuelve a abrir sobre la base nueva.
+    """
+
+    path = db_path()
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == path and _local.version == _file_version(path):
+        return conn
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+    with _init_lock:
+        if not path.exists():
+            build_catalog(path, _seed_records())
+        elif _schema_version(path) != SCHEMA_VERSION:
+            _migrate(path)
+        version = _file_version(path)
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    _local.conn, _local.path, _local.version = conn, path, version
+    return conn
+
+
+def catalog_version() -> Optional[Tuple[int, int]]:
+    """Inodo y fecha de modificación de la base; cambia cuando se regenera el catálogo."""
+
+    _connection()  # genera la base si todavía no existe
+    return _file_version(db_path())
+
+
+_COLUMNS = "id, nombre, marca, tipo, familia, concentracion, notas"
+
+
+def _row_to_perfume(row: Sequence[object]) -> Perfume:
+    return Perfume(*row)  # type: ignore[arg-type]
+
+
+def query_perfumes(
+    tipo: Optional[str] = None,
+    familia: Optional[str] = None,
+    marca: Optional[str] = None,
+    concentracion_min: Optional[float] = None,
+    concentracion_max: Optional[float] = None,
+    page: int = 1,
+    page_size: int = 20,
+) -> PerfumePage:
+    """Devuelve la página ``page`` (desde 1) de perfumes que cumplen todos los filtros dados.
+
+    Los resultados siguen el orden de carga del catálogo, que es el orden editorial.
+    """
+
+    clauses: List[str] = []
+    params: List[object] = []
+    for column, value in (("tipo", tipo), ("familia", familia), ("marca", marca)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if concentracion_min is not None:
+        clauses.append("concentracion >= ?")
+        params.append(concentracion_min)
+    if concentracion_max is not None:
+        clauses.append("concentracion <= ?")
+        params.append(concentracion_max)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    page = max(1, page)
+    conn = _connection()
+    total = conn.execute(f"SELECT COUNT(*) FROM perfumes {where}", params).fetchone()[0]
+    rows = conn.execute(
+        f"SELECT {_COLUMNS} FROM perfumes {where} "
+        "ORDER BY id LIMIT ? OFFSET ?",
+        [*params, page_size, (page - 1) * page_size],
+    ).fetchall()
+    return PerfumePage(items=[_row_to_perfume(row) for row in rows], total=total, page=page, page_size=page_size)
+
+
+def featured_perfumes(tipo: str, limit: int = 2) -> List[Perfume]:
+    """Los ``limit`` ejemplos de ``tipo``: primero los destacados y después por orden editorial."""
+
+    rows = _connection().execute(
+        f"SELECT {_COLUMNS} FROM perfumes WHERE tipo = ? ORDER BY destacado DESC, id LIMIT ?", (tipo, limit)
+    ).fetchall()
+    return [_row_to_perfume(row) for row in rows]
+
+
+def iter_perfumes(batch_size: int = 5000) -> Iterator[Perfume]:
+    """Recorre todo el catálogo por lotes, sin cargarlo entero en memoria."""
+
+    cursor = _connection().execute(f"SELECT {_COLUMNS} FROM perfumes ORDER BY id")
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        for row in rows:
+            yield _row_to_perfume(row)
+
+
+def list_brands() -> List[str]:
+    """Marcas presentes en el catálogo, ordenadas alfabéticamente."""
+
+    return [row[0] for row in _connection().execute("SELECT DISTINCT marca FROM perfumes ORDER BY marca")]
+
+
+def _read_csv(path: Path) -> Iterable[Tuple[str, ...]]:
+    with path.open(newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            yield (
+                row["nombre"],
+                row["marca"],
+                row["tipo"],
+                row["familia"],
+                row.get("notas", ""),
+                row.get("concentracion", ""),
+                row.get("destacado", ""),
+            )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Genera la base del catálogo de perfumes.")
+    parser.add_argument(
+        "--import",
+        dest="source",
+        type=Path,
+        help="CSV con columnas nombre, marca, tipo, familia y (opcionales) notas, concentracion y destacado",
+    )
+    args = parser.parse_args(argv)
+    build_catalog(db_path(), _read_csv(args.source) if args.source else _seed_records())
+    print(f"Catálogo generado en {db_path()}")
+    return 0
+
+
+__all__ = [
+    "CatalogError",
+    "Perfume",
+    "PerfumePage",
+    "build_catalog",
+    "catalog_version",
+    "featured_perfumes",
+    "iter_perfumes",
+    "list_brands",
+    "query_perfumes",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,331 @@
+"""Formulario de contacto con procesamiento asíncrono.
+
+El rerun solo valida el mensaje y lo encola en memoria, sin esperar nunca: si la cola
+está llena se pide al usuario que lo intente más tarde. Un grupo de hilos vacía la cola
+por lotes: inserta cada lote en SQLite (``data/contact.sqlite``, configurable con
+``PERFUME_CONTACT_DB``) y después lo entrega al notificador configurado, que marca cada
+mensaje como notificado en cuanto lo envía. Al arrancar, los mensajes que quedaron sin
+notificar (por ejemplo, porque el proceso se detuvo) se vuelven a encolar.
+
+Notificación por correo con ``PERFUME_SMTP_HOST`` (y opcionalmente ``PERFUME_SMTP_PORT``,
+``PERFUME_SMTP_USER``, ``PERFUME_SMTP_PASSWORD``, ``PERFUME_CONTACT_TO`` y
+``PERFUME_CONTACT_FROM``); sin servidor configurado, los mensajes solo se registran en
+el log. Para probar el correo en local basta un servidor SMTP de depuración, por
+ejemplo ``python -m aiosmtpd -n -l localhost:1025`` con ``PERFUME_SMTP_PORT=1025``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Protocol, Sequence, Tuple
+
+from persistence import BatchWriter
+
+DB_ENV_VAR = "PERFUME_CONTACT_DB"
+DEFAULT_DB_PATH = Path(__file__).parent / "data" / "contact.sqlite"
+WORKERS_ENV_VAR = "PERFUME_CONTACT_WORKERS"
+
+CONTACT_REASONS = ("Consulta general", "Colaboración", "Talleres y eventos", "Prensa")
+
+MAX_NAME_LENGTH = 120
+MAX_MESSAGE_LENGTH = 4000
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+logger = logging.getLogger("perfume.contact")
+
+
+@dataclass(frozen=True)
+class ContactMessage:
+    nombre: str
+    email: str
+    motivo: str
+    mensaje: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    creado: float = field(default_factory=time.time)
+
+
+def validate_contact(nombre: str, email: str, motivo: str, mensaje: str) -> Tuple[Optional[ContactMessage], List[str]]:
+    """Normaliza y valida los campos; devuelve el mensaje o la lista de errores a mostrar."""
+
+    nombre, email, mensaje = nombre.strip(), email.strip().lower(), mensaje.strip()
+    errors = []
+    if not nombre:
+        errors.append("Indica tu nombre.")
+    elif len(nombre) > MAX_NAME_LENGTH:
+        errors.append(f"El nombre no puede superar {MAX_NAME_LENGTH} caracteres.")
+    if not _EMAIL_RE.match(email):
+        errors.append("El correo electrónico no parece válido.")
+    if motivo not in CONTACT_REASONS:
+        errors.append("Elige un motivo de contacto.")
+    if len(mensaje) < 10:
+        errors.append("El mensaje debe tener al menos 10 caracteres.")
+    elif len(mensaje) > MAX_MESSAGE_LENGTH:
+        errors.append(f"El mensaje no puede superar {MAX_MESSAGE_LENGTH} caracteres.")
+    if errors:
+        return None, errors
+    return ContactMessage(nombre, email, motivo, mensaje), []
+
+
+SentCallback = Callable[[ContactMessage], None]
+
+
+class Notifier(Protocol):
+    def send(self, messages: Sequence[ContactMessage], on_sent: Optional[SentCallback] = None) -> None:
+        """Notifica ``messages`` en orden y llama a ``on_sent`` tras cada uno que se entregó."""
+
+
+class LoggingNotifier:
+    """Notificador por defecto: deja constancia de cada mensaje en el log."""
+
+    def send(self, messages: Sequence[ContactMessage], on_sent: Optional[SentCallback] = None) -> None:
+        for message in messages:
+            logger.info("Nuevo contacto de %s <%s>: %s", message.nombre, message.email, message.motivo)
+            if on_sent is not None:
+                on_sent(message)
+
+
+class SMTPNotifier:
+    """Envía un correo por mensaje reutilizando una sola conexión SMTP por lote."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 25,
+        recipient: str = "contacto@fragrances-iej.example",
+        sender: str = "web@fragrances-iej.example",
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = False,
+        timeout: float = 10.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.recipient = recipient
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def send(self, messages: Sequence[ContactMessage], on_sent: Optional[SentCallback] = None) -> None:
+        import smtplib
+        from email.message import EmailMessage
+
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+            for message in messages:
+                email = EmailMessage()
+                email["Subject"] = f"[{message.motivo}] Mensaje de {message.nombre}"
+                email["From"] = self.sender
+                email["To"] = self.recipient
+                email["Reply-To"] = message.email
+                email.set_content(message.mensaje)
+                smtp.send_message(email)
+                if on_sent is not None:
+                    on_sent(message)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contact_messages (
+    id TEXT PRIMARY KEY,
+    creado REAL NOT NULL,
+    nombre TEXT NOT NULL,
+    email TEXT NOT NULL,
+    motivo TEXT NOT NULL,
+    mensaje TEXT NOT NULL,
+    notificado INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_contact_pendientes ON contact_messages (notificado) WHERE notificado = 0;
+"""
+
+
+class ContactPipeline:
+    """Cola acotada de mensajes que un grupo de hilos guarda en SQLite y notifica por lotes.
+
+    Cada lote se inserta antes de notificarse, de modo que un fallo del notificador no
+    pierde mensajes. Cada mensaje se marca ``notificado = 1`` en cuanto se entrega; si el
+    notificador falla a mitad de lote, el reintento solo incluye los que faltan (las
+    inserciones repetidas se ignoran por ``id``). Los que siguen con ``notificado = 0``
+    pasados ``requeue_after`` segundos se vuelven a encolar al crear el canal.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        notifier: Optional[Notifier] = None,
+        workers: int = 2,
+        max_queue: int = 1000,
+        max_batch: int = 50,
+        flush_interval: float = 0.5,
+        requeue_after: float = 60.0,
+    ) -> None:
+        self.path = path
+        self.notifier: Notifier = notifier or LoggingNotifier()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+        self._writer: BatchWriter[ContactMessage] = BatchWriter(
+            self._process,
+            name="perfume-contact-worker",
+            max_batch=max_batch,
+            flush_interval=flush_interval,
+            max_queue=max_queue,
+            workers=workers,
+        )
+        # Los pendientes de ejecuciones anteriores se leen en segundo plano: el rerun no espera.
+        self._requeue_thread = threading.Thread(
+            target=self._requeue_pending, args=(requeue_after,), name="perfume-contact-requeue", daemon=True
+        )
+        self._requeue_thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def submit(self, message: ContactMessage) -> bool:
+        """Encola el mensaje sin esperar; ``False`` si la cola está llena.
+
+        En ese caso la página pide al usuario que lo vuelva a enviar en lugar de bloquear
+        el rerun.
+        """
+
+        if self._writer.submit(message):
+            return True
+        logger.warning("Cola de contacto llena: %d mensajes pendientes", self._writer.pending())
+        return False
+
+    def _requeue_pending(self, older_than: float) -> int:
+        """Encola los mensajes guardados que llevan más de ``older_than`` segundos sin notificarse."""
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT nombre, email, motivo, mensaje, id, creado FROM contact_messages "
+                "WHERE notificado = 0 AND creado <= ? ORDER BY creado",
+                (time.time() - older_than,),
+            ).fetchall()
+        except sqlite3.Error as error:
+            logger.warning("No se pudieron leer los mensajes pendientes: %s", error)
+            return 0
+        finally:
+            conn.close()
+        requeued = 0
+        for row in rows:
+            if not self._writer.submit(ContactMessage(*row)):
+                break  # el resto se recupera en el próximo arranque
+            requeued += 1
+        if rows:
+            logger.info("Reencolados %d de %d mensajes de contacto sin notificar", requeued, len(rows))
+        return requeued
+
+    def pending(self) -> int:
+        return self._writer.pending()
+
+    def flush(self) -> None:
+        self._writer.join()
+
+    def close(self) -> None:
+        self._requeue_thread.join()
+        self._writer.close()
+
+    def _process(self, batch: List[ContactMessage]) -> None:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO contact_messages (id, creado, nombre, email, motivo, mensaje) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(m.id, m.creado, m.nombre, m.email, m.motivo, m.mensaje) for m in batch],
+                )
+            ids = [m.id for m in batch]
+            pending = {
+                row[0]
+                for row in conn.execute(
+                    f"SELECT id FROM contact_messages WHERE notificado = 0 AND id IN ({', '.join('?' * len(ids))})", ids
+                )
+            }
+
+            def mark_sent(message: ContactMessage) -> None:
+                with conn:
+                    conn.execute("UPDATE contact_messages SET notificado = 1 WHERE id = ?", (message.id,))
+
+            unsent = [m for m in batch if m.id in pending]
+            if unsent:
+                self.notifier.send(unsent, on_sent=mark_sent)
+        finally:
+            conn.close()
+
+
+def notifier_from_env() -> Notifier:
+    host = os.environ.get("PERFUME_SMTP_HOST")
+    if not host:
+        return LoggingNotifier()
+    options = {
+        key: value
+        for key, value in (
+            ("recipient", os.environ.get("PERFUME_CONTACT_TO")),
+            ("sender", os.environ.get("PERFUME_CONTACT_FROM")),
+        )
+        if value
+    }
+    return SMTPNotifier(
+        host,
+        port=int(os.environ.get("PERFUME_SMTP_PORT", "25")),
+        username=os.environ.get("PERFUME_SMTP_USER"),
+        password=os.environ.get("PERFUME_SMTP_PASSWORD"),
+        starttls=os.environ.get("PERFUME_SMTP_STARTTLS", "").strip().lower() in {"1", "true", "yes", "on"},
+        **options,
+    )
+
+
+_pipeline: Optional[ContactPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_contact_pipeline() -> ContactPipeline:
+    """Canal compartido del proceso; al salir se procesan los mensajes pendientes."""
+
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = ContactPipeline(
+                Path(os.environ.get(DB_ENV_VAR, DEFAULT_DB_PATH)),
+                notifier=notifier_from_env(),
+                workers=int(os.environ.get(WORKERS_ENV_VAR, "2")),
+            )
+            atexit.register(_pipeline.close)
+        return _pipeline
+
+
+def submit_contact(message: ContactMessage) -> bool:
+    return get_contact_pipeline().submit(message)
+
+
+__all__ = [
+    "CONTACT_REASONS",
+    "ContactMessage",
+    "ContactPipeline",
+    "LoggingNotifier",
+    "Notifier",
+    "SMTPNotifier",
+    "get_contact_pipeline",
+    "notifier_from_env",
+    "submit_contact",
+    "validate_contact",
+]
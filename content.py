@@ -0,0 +1,308 @@
+"""Contenido editorial compilado a una instantánea binaria con recarga en caliente.
+
+Los textos (tipos, familias, curiosidades, hitos históricos, preguntas y resultados del
+test) se editan en los YAML de ``content/``. Se compilan a una instantánea validada que
+se guarda con pickle y una versión de esquema en ``data/content.pickle`` (configurable
+con ``PERFUME_CONTENT_SNAPSHOT``), así que al arrancar basta con leer ese archivo; el
+YAML solo se interpreta cuando cambia.
+
+Mientras la aplicación corre, :func:`get_content` comprueba como mucho cada dos segundos
+si cambió algún archivo de ``content/``. Si es así, un hilo de fondo compila la versión
+nueva mientras las sesiones siguen leyendo la anterior, y la publica con una sola
+asignación: ningún rerun ve contenido a medio cargar ni paga el análisis del YAML. Si
+la versión nueva no es válida, se registra el error y se mantiene la anterior.
+
+``python content.py`` compila la instantánea (``--check`` solo valida).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:  # logging solo se importa si hay algo que registrar
+    import logging
+
+SOURCE_ENV_VAR = "PERFUME_CONTENT_DIR"
+SNAPSHOT_ENV_VAR = "PERFUME_CONTENT_SNAPSHOT"
+DEFAULT_SOURCE_DIR = Path(__file__).parent / "content"
+DEFAULT_SNAPSHOT_PATH = Path(__file__).parent / "data" / "content.pickle"
+
+# Incrementar al cambiar la forma de los datos compilados: las instantáneas anteriores se descartan.
+SCHEMA_VERSION = 1
+
+# sección -> (tipo del documento, campos obligatorios, campos opcionales de cada entrada)
+SECTIONS: Dict[str, Tuple[type, Tuple[str, ...], Tuple[str, ...]]] = {
+    "tipos": (list, ("tipo", "concentracion", "duracion", "notas"), ()),
+    "familias": (list, ("nombre", "descripcion", "ejemplos", "imagen", "respaldo"), ()),
+    "curiosidades": (list, ("titulo", "descripcion"), ()),
+    "historia": (list, ("anio", "titulo", "descripcion"), ("familia", "categoria")),
+    "preguntas": (list, ("pregunta", "opciones"), ("pesos",)),
+    "recomendaciones": (dict, ("titulo", "descripcion", "imagen", "respaldo"), ()),
+}
+
+
+def _logger() -> logging.Logger:
+    import logging
+
+    return logging.getLogger("perfume.content")
+
+
+class ContentError(ValueError):
+    """El contenido de ``content/`` no cumple el esquema esperado."""
+
+
+@dataclass(frozen=True)
+class ContentSnapshot:
+    """Contenido compilado e inmutable; se sustituye entero al recargar."""
+
+    fingerprint: str
+    data: Mapping[str, Any]
+    compiled_at: float
+
+    def __getitem__(self, section: str) -> Any:
+        return self.data[section]
+
+
+def source_dir() -> Path:
+    return Path(os.environ.get(SOURCE_ENV_VAR, DEFAULT_SOURCE_DIR))
+
+
+def snapshot_path() -> Path:
+    return Path(os.environ.get(SNAPSHOT_ENV_VAR, DEFAULT_SNAPSHOT_PATH))
+
+
+def fingerprint(directory: Path) -> str:
+    """Huella de los YAML de ``directory`` (nombre, tamaño y mtime); no lee su contenido."""
+
+    sha = hashlib.sha256(str(SCHEMA_VERSION).encode())
+    for name in SECTIONS:
+        try:
+            stat = (directory / f"{name}.yaml").stat()
+        except OSError:
+            sha.update(f"{name}:-".encode())
+        else:
+            sha.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return sha.hexdigest()[:16]
+
+
+def _validate(data: Dict[str, Any]) -> List[str]:
+    errors = []
+    for name, (kind, fields, optional) in SECTIONS.items():
+        document = data[name]
+        if not isinstance(document, kind):
+            errors.append(f"{name}.yaml: se esperaba {'una lista' if kind is list else 'un diccionario'}")
+            continue
+        entries = document.items() if isinstance(document, dict) else enumerate(document, start=1)
+        for key, entry in entries:
+            missing = [field for field in fields if not isinstance(entry, dict) or entry.get(field) in (None, "")]
+            if missing:
+                errors.append(f"{name}.yaml [{key}]: faltan {', '.join(missing)}")
+            # un campo desconocido suele ser una errata que se perdería en silencio
+            unknown = sorted(str(field) for field in set(entry) - set(fields) - set(optional)) if isinstance(entry, dict) else []
+            if unknown:
+                errors.append(f"{name}.yaml [{key}]: campos desconocidos {', '.join(unknown)}")
+    if errors:
+        return errors
+
+    families = set(data["recomendaciones"])
+    for number, question in enumerate(data["preguntas"], start=1):
+        options = question["opciones"]
+        if not isinstance(options, dict):
+            errors.append(f"preguntas.yaml [{number}]: opciones debe ser un diccionario código -> texto")
+            continue
+        unknown = sorted(str(option) for option in set(options) - families)
+        if unknown:
+            errors.append(f"preguntas.yaml [{number}]: opciones sin resultado en recomendaciones.yaml: {', '.join(unknown)}")
+        custom = question.get("pesos") or {}
+        if not isinstance(custom, dict):
+            errors.append(f"preguntas.yaml [{number}]: pesos debe ser un diccionario opción -> {{familia: peso}}")
+            continue
+        for option, weights in custom.items():
+            if (
+                option not in options
+                or not isinstance(weights, dict)
+                or not set(weights) <= families
+                or not all(isinstance(weight, (int, float)) and not isinstance(weight, bool) for weight in weights.values())
+            ):
+                errors.append(f"preguntas.yaml [{number}]: pesos no válidos para {option!r}")
+    for number, event in enumerate(data["historia"], start=1):
+        if not isinstance(event["anio"], int) or isinstance(event["anio"], bool):
+            errors.append(f"historia.yaml [{number}]: el año debe ser un número entero")
+    return errors
+
+
+def compile_content(directory: Path) -> ContentSnapshot:
+    """Lee y valida los YAML de ``directory``; lanza :class:`ContentError` si hay errores."""
+
+    import yaml  # solo se necesita al compilar, no al cargar una instantánea
+
+    current = fingerprint(directory)
+    data: Dict[str, Any] = {}
+    errors: List[str] = []
+    for name in SECTIONS:
+        path = directory / f"{name}.yaml"
+        try:
+            with path.open(encoding="utf-8") as handle:
+                data[name] = yaml.safe_load(handle)
+        except OSError as error:
+            errors.append(f"{path.name}: {error.strerror or error}")
+        except UnicodeDecodeError as error:
+            errors.append(f"{path.name}: no está codificado en UTF-8 (byte {error.start})")
+        except yaml.YAMLError as error:
+            errors.append(f"{path.name}: {error}")
+    if not errors:
+        errors = _validate(data)
+    if errors:
+        raise ContentError("\n".join(errors))
+    return ContentSnapshot(current, data, time.time())
+
+
+def write_snapshot(snapshot: ContentSnapshot, path: Path) -> None:
+    """Guarda la instantánea en un temporal y la publica de forma atómica."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with tmp.open("wb") as handle:
+        pickle.dump(
+            {"schema": SCHEMA_VERSION, "fingerprint": snapshot.fingerprint, "compiled_at": snapshot.compiled_at, "data": snapshot.data},
+            handle,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    tmp.replace(path)
+
+
+def read_snapshot(path: Path) -> Optional[ContentSnapshot]:
+    """Instantánea guardada en ``path``, o ``None`` si no existe o es de otro esquema."""
+
+    try:
+        with path.open("rb") as handle:
+            stored = pickle.load(handle)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return None
+    if not isinstance(stored, dict) or stored.get("schema") != SCHEMA_VERSION:
+        return None
+    return ContentSnapshot(stored["fingerprint"], stored["data"], stored["compiled_at"])
+
+
+class ContentStore:
+    """Instantánea vigente del contenido, recargada cuando cambian los archivos fuente.
+
+    Las lecturas no toman ningún cerrojo: devuelven la instantánea publicada en ese
+    momento. Al detectar un cambio se compila en un hilo aparte, uno cada vez.
+    """
+
+    def __init__(self, source: Path, snapshot: Path, check_interval: float = 2.0) -> None:
+        self.source = source
+        self.snapshot_path = snapshot
+        self.check_interval = check_interval
+        self._reload_lock = threading.Lock()
+        self._checked_at = time.monotonic()
+        self._failed: Optional[str] = None  # huella de la última versión que no compiló
+        self._current = self._initial()
+
+    def _initial(self) -> ContentSnapshot:
+        stored = read_snapshot(self.snapshot_path)
+        if stored is not None and stored.fingerprint == fingerprint(self.source):
+            return stored
+        compiled = compile_content(self.source)  # sin una versión válida la aplicación no puede arrancar
+        self._publish(compiled)
+        return compiled
+
+    def _publish(self, snapshot: ContentSnapshot) -> None:
+        try:
+            write_snapshot(snapshot, self.snapshot_path)
+        except OSError as error:  # sin disco escribible se sigue con la versión en memoria
+            _logger().warning("No se pudo guardar la instantánea de contenido: %s", error)
+
+    def get(self) -> ContentSnapshot:
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            current = fingerprint(self.source)
+            if current not in (self._current.fingerprint, self._failed) and self._reload_lock.acquire(blocking=False):
+                threading.Thread(target=self._reload_in_background, name="perfume-content-reload", daemon=True).start()
+        return self._current
+
+    def _reload_in_background(self) -> None:
+        try:
+            self.reload()
+        finally:
+            self._reload_lock.release()
+
+    def reload(self) -> bool:
+        """Recompila si cambiaron las fuentes; devuelve ``True`` si se publicó una versión nueva."""
+
+        if fingerprint(self.source) == self._current.fingerprint:
+            return False
+        try:
+            compiled = compile_content(self.source)
+        except ContentError as error:
+            self._failed = fingerprint(self.source)
+            _logger().error("Contenido no válido, se mantiene la versión anterior:\n%s", error)
+            return False
+        self._publish(compiled)
+        self._current = compiled
+        return True
+
+
+_store: Optional[ContentStore] = None
+_store_lock = threading.Lock()
+
+
+def get_content_store() -> ContentStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ContentStore(source_dir(), snapshot_path())
+        return _store
+
+
+def get_content() -> ContentSnapshot:
+    """Instantánea vigente del contenido editorial."""
+
+    store = _store or get_content_store()
+    return store.get()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compila el contenido editorial de content/ a una instantánea.")
+    parser.add_argument("--source", type=Path, default=source_dir(), help="carpeta con los YAML")
+    parser.add_argument("--output", type=Path, default=snapshot_path(), help="ruta de la instantánea")
+    parser.add_argument("--check", action="store_true", help="solo valida, sin escribir la instantánea")
+    args = parser.parse_args(argv)
+
+    try:
+        snapshot = compile_content(args.source)
+    except ContentError as error:
+        print(error, file=sys.stderr)
+        return 1
+    if not args.check:
+        write_snapshot(snapshot, args.output)
+    sizes = {name: len(section) for name, section in snapshot.data.items()}
+    print(f"Contenido válido ({snapshot.fingerprint}): " + ", ".join(f"{name} {count}" for name, count in sizes.items()))
+    return 0
+
+
+__all__ = [
+    "ContentError",
+    "ContentSnapshot",
+    "ContentStore",
+    "compile_content",
+    "get_content",
+    "get_content_store",
+    "read_snapshot",
+    "write_snapshot",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
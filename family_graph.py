@@ -0,0 +1,185 @@
+"""Grafo de relaciones entre familias olfativas y su representación en SVG.
+
+El grafo se modela como listas de adyacencia, por lo que las consultas de vecinos y
+caminos mínimos no necesitan interpretar texto DOT. El SVG se genera una sola vez
+(con ``dot`` de Graphviz si está instalado, o con un trazado por capas en Python puro
+si no) y se guarda en disco con el hash del grafo como nombre.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import subprocess
+from collections import deque
+from dataclasses import dataclass
+from html import escape
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+NODE_COLOR = "#f1c40f"
+
+
+@dataclass(frozen=True)
+class Edge:
+    source: str
+    target: str
+    label: Optional[str] = None
+
+
+class FamilyGraph:
+    """Grafo dirigido de familias con consultas de vecindad y caminos."""
+
+    def __init__(self, edges: Iterable[Edge]) -> None:
+        self.edges: Tuple[Edge, ...] = tuple(edges)
+        self.nodes: List[str] = []
+        self._successors: Dict[str, List[str]] = {}
+        self._predecessors: Dict[str, List[str]] = {}
+        for edge in self.edges:
+            for node in (edge.source, edge.target):
+                if node not in self._successors:
+                    self.nodes.append(node)
+                    self._successors[node] = []
+                    self._predecessors[node] = []
+            self._successors[edge.source].append(edge.target)
+            self._predecessors[edge.target].append(edge.source)
+
+    def successors(self, node: str) -> List[str]:
+        return list(self._successors.get(node, ()))
+
+    def predecessors(self, node: str) -> List[str]:
+        return list(self._predecessors.get(node, ()))
+
+    def neighbors(self, node: str) -> List[str]:
+        """Familias adyacentes en cualquier sentido (p. ej. las vecinas de "Oriental")."""
+
+        seen = dict.fromkeys(self._successors.get(node, []) + self._predecessors.get(node, []))
+        return list(seen)
+
+    def shortest_path(self, start: str, goal: str, directed: bool = False) -> Optional[List[str]]:
+        """Camino con menos saltos entre dos familias (búsqueda en anchura), o ``None``."""
+
+        if start not in self._successors or goal not in self._successors:
+            return None
+        previous: Dict[str, Optional[str]] = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if node == goal:
+                path = [node]
+                while previous[path[-1]] is not None:
+                    path.append(previous[path[-1]])  # type: ignore[arg-type]
+                return path[::-1]
+            for neighbor in self.successors(node) if directed else self.neighbors(node):
+                if neighbor not in previous:
+                    previous[neighbor] = node
+                    queue.append(neighbor)
+        return None
+
+    def to_dot(self) -> str:
+        lines = [
+            "digraph FamiliasOlfativas {",
+            "    rankdir=LR;",
+            f'    node [shape=ellipse, style=filled, color="{NODE_COLOR}", fontname="Helvetica"];',
+        ]
+        for edge in self.edges:
+            label = f' [label="{edge.label}"]' if edge.label else ""
+            lines.append(f'    "{edge.source}" -> "{edge.target}"{label};')
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+    def content_hash(self) -> str:
+        return hashlib.sha256(self.to_dot().encode("utf-8")).hexdigest()[:16]
+
+    def layers(self) -> Dict[str, int]:
+        """Capa de cada nodo según el camino más largo desde una familia sin predecesoras."""
+
+        layer = {node: 0 for node in self.nodes}
+        for _ in range(len(self.nodes)):  # acotado por si el grafo tuviera ciclos
+            changed = False
+            for edge in self.edges:
+                if layer[edge.target] < layer[edge.source] + 1:
+                    layer[edge.target] = layer[edge.source] + 1
+                    changed = True
+            if not changed:
+                break
+        return layer
+
+
+def _layered_svg(graph: FamilyGraph) -> str:
+    """Trazado de izquierda a derecha por capas, sin dependencias externas."""
+
+    layer_of = graph.layers()
+    columns: Dict[int, List[str]] = {}
+    for node in graph.nodes:
+        columns.setdefault(layer_of[node], []).append(node)
+
+    col_width, row_height, margin, ry = 180, 70, 20, 20
+    tallest = max((len(nodes) for nodes in columns.values()), default=1)
+    height = tallest * row_height + 2 * margin
+    width = len(columns) * col_width + 2 * margin
+
+    position: Dict[str, Tuple[float, float, float]] = {}
+    for column, nodes in columns.items():
+        offset = (height - len(nodes) * row_height) / 2
+        for row, node in enumerate(nodes):
+            rx = max(45.0, len(node) * 4.8)
+            position[node] = (margin + column * col_width + col_width / 2, offset + row * row_height + row_height / 2, rx)
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" width="{width}" height="{height}" '
+        'font-family="Helvetica, sans-serif" font-size="13">',
+        '<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="7" markerHeight="7" '
+        'orient="auto-start-reverse"><path d="M0,0 L10,5 L0,10 z" fill="#555"/></marker></defs>',
+    ]
+    for edge in graph.edges:
+        x1, y1, rx1 = position[edge.source]
+        x2, y2, rx2 = position[edge.target]
+        start_x, end_x = (x1 + rx1, x2 - rx2) if x2 > x1 else (x1, x2)
+        start_y, end_y = (y1, y2) if x2 > x1 else (y1 + ry, y2 - ry)
+        parts.append(
+            f'<line x1="{start_x:.1f}" y1="{start_y:.1f}" x2="{end_x:.1f}" y2="{end_y:.1f}" '
+            'stroke="#555" stroke-width="1.2" marker-end="url(#arrow)"/>'
+        )
+        if edge.label:
+            parts.append(
+                f'<text x="{(start_x + end_x) / 2:.1f}" y="{(start_y + end_y) / 2 - 5:.1f}" text-anchor="middle" '
+                f'font-size="11" fill="#555">{escape(edge.label)}</text>'
+            )
+    for node, (x, y, rx) in position.items():
+        parts.append(
+            f'<ellipse cx="{x:.1f}" cy="{y:.1f}" rx="{rx:.1f}" ry="{ry}" fill="{NODE_COLOR}" stroke="{NODE_COLOR}"/>'
+            f'<text x="{x:.1f}" y="{y + 4:.1f}" text-anchor="middle">{escape(node)}</text>'
+        )
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+def render_svg(graph: FamilyGraph, cache_dir: Path) -> Path:
+    """Devuelve la ruta del SVG del grafo, generándolo solo si no está ya en caché."""
+
+    target = cache_dir / f"familias-{graph.content_hash()}.svg"
+    if target.exists():
+        return target
+
+    svg: Optional[str] = None
+    dot = shutil.which("dot")
+    if dot:
+        try:
+            svg = subprocess.run(
+                [dot, "-Tsvg"], input=graph.to_dot(), capture_output=True, text=True, check=True, timeout=30
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            svg = None
+    if not svg:
+        svg = _layered_svg(graph)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    tmp.write_text(svg, encoding="utf-8")
+    tmp.replace(target)
+    return target
+
+
+__all__ = ["Edge", "FamilyGraph", "render_svg"]
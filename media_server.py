@@ -0,0 +1,361 @@
+"""Servidor auxiliar de medios con soporte de peticiones HTTP por rangos.
+
+``st.video`` con una ruta local hace que Streamlit lea el archivo completo en memoria
+y lo envíe entero a cada sesión. Con este servidor el navegador recibe una URL y pide
+solo los bytes que necesita (``Range: bytes=...``), de modo que buscar en el video no
+descarga el archivo completo. Los archivos se leen mediante ``mmap`` compartido entre
+hilos, así que muchas descargas simultáneas aprovechan la caché de páginas del sistema
+en lugar de mantener copias en memoria.
+
+Con ``PERFUME_STATIC_ASSETS=1`` el mismo servidor publica también las imágenes con el
+hash de su contenido en el nombre (``esencia_1.3f9a…c2.jpg``). Esas URLs nunca cambian
+de contenido, así que se sirven con ``Cache-Control: immutable`` y el navegador no
+vuelve a descargarlas en otras páginas ni en visitas posteriores; al modificar una
+imagen cambia su hash y, con él, la URL. Si junto a una imagen hay una versión WebP con
+el mismo nombre (como los derivados de ``utils``), la URL de la imagen sirve el WebP a
+los navegadores que lo anuncian en ``Accept`` y el original al resto, con ``Vary: Accept``.
+
+Se activa con ``PERFUME_MEDIA_STREAMING=1`` (o ``PERFUME_STATIC_ASSETS=1``). ``PERFUME_MEDIA_HOST`` y
+``PERFUME_MEDIA_PORT`` fijan dónde escucha; por defecto solo en ``127.0.0.1`` y en un
+puerto libre elegido por el sistema, de modo que cada réplica tiene el suyo. Las URLs
+usan el mismo host con el que el navegador abrió la aplicación (cabecera ``Host``) y el
+puerto del servidor; si está enlazado a ``127.0.0.1`` solo se entregan a navegadores
+locales y el resto recibe los archivos a través de Streamlit. El servidor habla HTTP sin
+cifrar, así que a una página abierta por HTTPS tampoco se le ofrece (el navegador
+bloquearía el contenido mixto). Detrás de un proxy, ``PERFUME_MEDIA_PUBLIC_URL`` fija la
+URL base (y ``PERFUME_MEDIA_PORT`` el puerto).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import ipaddress
+import mimetypes
+import mmap
+import os
+import re
+import threading
+from email.utils import formatdate
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+from urllib.parse import quote, unquote, urlparse
+
+ENABLE_ENV_VAR = "PERFUME_MEDIA_STREAMING"
+ASSETS_ENV_VAR = "PERFUME_STATIC_ASSETS"
+HOST_ENV_VAR = "PERFUME_MEDIA_HOST"
+PORT_ENV_VAR = "PERFUME_MEDIA_PORT"
+PUBLIC_URL_ENV_VAR = "PERFUME_MEDIA_PUBLIC_URL"
+
+DEFAULT_ROOT = Path(__file__).parent / "assets"
+CHUNK_SIZE = 256 * 1024
+URL_PREFIX = "/media/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "public, max-age=3600"
+
+if TYPE_CHECKING:  # logging solo se importa si hay algo que registrar
+    import logging
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_HOST_RE = re.compile(r"^(?:\[(?P<ipv6>[0-9A-Fa-f:.]+)\]|(?P<name>[A-Za-z0-9.-]+))(?::\d+)?$")
+_FINGERPRINT_RE = re.compile(r"^(?P<stem>.+)\.(?P<digest>[0-9a-f]{16})(?P<suffix>\.[^.]+)$")
+_NEGOTIABLE_SUFFIXES = frozenset({".jpg", ".jpeg", ".png"})
+
+
+@lru_cache(maxsize=1024)
+def _digest(path: str, mtime_ns: int, size: int) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()[:16]
+
+
+def _logger() -> logging.Logger:
+    import logging
+
+    return logging.getLogger("perfume.media")
+
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def parse_host(header: Optional[str]) -> Optional[str]:
+    """Nombre de host de una cabecera ``Host`` (sin puerto); ``None`` si no es válida."""
+
+    match = _HOST_RE.match((header or "").strip())
+    if not match:
+        return None
+    return f"[{match['ipv6']}]" if match["ipv6"] else match["name"].lower()
+
+
+def fingerprint(path: Path) -> str:
+    """Hash del contenido del archivo; se recalcula solo si cambian su mtime o su tamaño."""
+
+    stat = path.stat()
+    return _digest(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def fingerprinted_name(path: Path) -> str:
+    return f"{path.stem}.{fingerprint(path)}{path.suffix}"
+
+
+class _MappedFiles:
+    """Mapas de memoria de solo lectura compartidos entre hilos, renovados si cambia el archivo."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._maps: Dict[Path, Tuple[int, int, Optional[mmap.mmap]]] = {}
+
+    def get(self, path: Path) -> Tuple[int, Optional[mmap.mmap], os.stat_result]:
+        stat = path.stat()
+        with self._lock:
+            cached = self._maps.get(path)
+            if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                return stat.st_size, cached[2], stat
+            mapped: Optional[mmap.mmap] = None
+            if stat.st_size:
+                with path.open("rb") as handle:
+                    mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            # El mapa anterior se libera solo cuando ninguna respuesta en curso lo usa.
+            self._maps[path] = (stat.st_mtime_ns, stat.st_size, mapped)
+            return stat.st_size, mapped, stat
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Interpreta un único rango ``bytes=inicio-fin``; devuelve ``(inicio, fin)`` inclusivo.
+
+    Devuelve ``None`` si no hay cabecera o si pide varios rangos (se sirve el archivo
+    completo) y lanza ``ValueError`` si el rango no es satisfacible.
+    """
+
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+class MediaRequestHandler(BaseHTTPRequestHandler):
+    server_version = "PerfumeMedia/1.0"
+    protocol_version = "HTTP/1.1"
+
+    root: Path = DEFAULT_ROOT
+    files: _MappedFiles = _MappedFiles()
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002 - firma de la clase base
+        pass
+
+    def _resolve(self) -> Tuple[Optional[Path], bool]:
+        """Archivo pedido y si la URL lleva el hash de su contenido (respuesta inmutable)."""
+
+        path = unquote(urlparse(self.path).path)
+        if not path.startswith(URL_PREFIX):
+            return None, False
+        candidate = (self.root / path[len(URL_PREFIX) :]).resolve()
+        try:
+            candidate.relative_to(self.root.resolve())
+        except ValueError:
+            return None, False
+        if candidate.is_file():
+            return candidate, False
+        match = _FINGERPRINT_RE.match(candidate.name)
+        if match:
+            original = candidate.with_name(match["stem"] + match["suffix"])
+            # Un hash antiguo no debe servir el contenido nuevo con caché inmutable.
+            if original.is_file() and fingerprint(original) == match["digest"]:
+                return original, True
+        return None, False
+
+    def _negotiate(self, path: Path) -> Tuple[Path, bool]:
+        """Versión WebP de la imagen si el navegador la acepta, y si existe esa alternativa."""
+
+        alternative = path.with_suffix(".webp")
+        if path.suffix.lower() not in _NEGOTIABLE_SUFFIXES or not alternative.is_file():
+            return path, False
+        return (alternative if "image/webp" in (self.headers.get("Accept") or "") else path), True
+
+    def do_HEAD(self) -> None:
+        self._serve(send_body=False)
+
+    def do_GET(self) -> None:
+        self._serve(send_body=True)
+
+    def _headers(self, stat: os.stat_result, path: Path, etag: str, immutable: bool, negotiated: bool = False) -> None:
+        self.send_header("Content-Type", mimetypes.guess_type(path.name)[0] or "application/octet-stream")
+        self.send_header("Accept-Ranges", "bytes")
+        if negotiated:
+            self.send_header("Vary", "Accept")
+        self.send_header("Last-Modified", formatdate(stat.st_mtime, usegmt=True))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", IMMUTABLE_CACHE_CONTROL if immutable else DEFAULT_CACHE_CONTROL)
+
+    def _serve(self, send_body: bool) -> None:
+        path, immutable = self._resolve()
+        if path is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        path, negotiated = self._negotiate(path)
+
+        size, mapped, stat = self.files.get(path)
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        if etag in (self.headers.get("If-None-Match") or ""):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._headers(stat, path, etag, immutable, negotiated)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        try:
+            byte_range = parse_range(self.headers.get("Range"), size)
+        except ValueError:
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if byte_range is None:
+            start, end = 0, size - 1
+            self.send_response(HTTPStatus.OK)
+        else:
+            start, end = byte_range
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        length = max(0, end - start + 1)
+        self._headers(stat, path, etag, immutable, negotiated)
+        self.send_header("Content-Length", str(length))
+        self.end_headers()
+
+        if not send_body or mapped is None or not length:
+            return
+        view = memoryview(mapped)
+        try:
+            position = start
+            while position <= end:
+                chunk_end = min(position + CHUNK_SIZE, end + 1)
+                self.wfile.write(view[position:chunk_end])
+                position = chunk_end
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # el navegador cancela la descarga al buscar en el video
+        finally:
+            view.release()
+
+
+class MediaServer:
+    """Servidor de medios en un hilo de fondo, con URLs públicas para los archivos servidos."""
+
+    def __init__(self, root: Path = DEFAULT_ROOT, host: str = "127.0.0.1", port: int = 0, public_url: Optional[str] = None) -> None:
+        handler = type("BoundMediaRequestHandler", (MediaRequestHandler,), {"root": root, "files": _MappedFiles()})
+        self.root = root
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.host = host
+        self.port = self.httpd.server_address[1]
+        self.public_url = public_url.rstrip("/") if public_url else None
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="perfume-media-server", daemon=True)
+        self._thread.start()
+
+    def base_url(self, request_host: Optional[str] = None, request_scheme: str = "http") -> Optional[str]:
+        """URL base para un navegador que abrió la aplicación con la cabecera ``request_host``.
+
+        Devuelve ``None`` si ese navegador no puede usar el servidor: no hay URL pública
+        configurada y, o bien se desconoce el host, o bien la página se abrió por HTTPS
+        (una URL ``http://`` sería contenido mixto), o bien el servidor solo escucha en
+        loopback y el navegador no es local.
+        """
+
+        if self.public_url:
+            return self.public_url
+        if request_scheme != "http":
+            return None
+        hostname = parse_host(request_host)
+        if hostname is None or (is_loopback(self.host) and not is_loopback(hostname.strip("[]"))):
+            return None
+        return f"http://{hostname}:{self.port}"
+
+    def url_for(self, path: Path, request_host: Optional[str] = None, request_scheme: str = "http") -> Optional[str]:
+        base = self.base_url(request_host, request_scheme)
+        if base is None:
+            return None
+        relative = path.resolve().relative_to(self.root.resolve())
+        return f"{base}{URL_PREFIX}{quote(relative.as_posix())}"
+
+    def asset_url(self, path: Path, request_host: Optional[str] = None, request_scheme: str = "http") -> Optional[str]:
+        """URL con el hash del contenido en el nombre, servida con caché inmutable."""
+
+        return self.url_for(path.with_name(fingerprinted_name(path)), request_host, request_scheme)
+
+    def shutdown(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def assets_enabled() -> bool:
+    """Si las imágenes locales deben publicarse con URLs con hash (``PERFUME_STATIC_ASSETS``)."""
+
+    return _env_flag(ASSETS_ENV_VAR)
+
+
+_server: Optional[MediaServer] = None
+_server_failed = False
+_server_lock = threading.Lock()
+
+
+def get_media_server() -> Optional[MediaServer]:
+    """Servidor compartido del proceso, arrancado en el primer uso; ``None`` si está desactivado."""
+
+    global _server, _server_failed
+    if not (_env_flag(ENABLE_ENV_VAR) or assets_enabled()):
+        return None
+    with _server_lock:
+        if _server is None and not _server_failed:
+            host = os.environ.get(HOST_ENV_VAR, "127.0.0.1")
+            port = int(os.environ.get(PORT_ENV_VAR, "0"))
+            try:
+                _server = MediaServer(host=host, port=port, public_url=os.environ.get(PUBLIC_URL_ENV_VAR))
+            except OSError as error:  # p. ej. el puerto fijo ya lo usa otra réplica
+                _server_failed = True
+                _logger().warning(
+                    "No se pudo iniciar el servidor de medios en %s:%s (%s); los archivos se servirán a través de Streamlit.",
+                    host,
+                    port,
+                    error,
+                )
+        return _server
+
+
+__all__ = [
+    "MediaServer",
+    "assets_enabled",
+    "fingerprint",
+    "fingerprinted_name",
+    "get_media_server",
+    "is_loopback",
+    "parse_host",
+    "parse_range",
+]
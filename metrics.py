@@ -0,0 +1,397 @@
+"""Métricas de actividad en formato de texto de Prometheus.
+
+Cuenta los reruns de cada página (y cuántos los provoca un widget), los reruns parciales
+de cada fragmento (``st.fragment``), los resultados del test por familia, los aciertos y fallos del índice de recursos y la latencia de cada
+rerun. Streamlit ejecuta cada sesión en su propio hilo, así que cada hilo acumula en
+su propio fragmento (``threading.local``) sin tomar ningún cerrojo; los fragmentos
+solo se suman al exportar.
+
+La recogida está siempre activa y cuesta poco más que sumar en un diccionario. Para
+exportarlas:
+
+* ``PERFUME_METRICS_PORT=9464`` publica ``/metrics`` en un servidor HTTP local
+  (``PERFUME_METRICS_HOST``, por defecto ``127.0.0.1``).
+* ``PERFUME_METRICS_FILE=/var/lib/node_exporter/perfume.prom`` reescribe el archivo de
+  forma atómica cada ``PERFUME_METRICS_INTERVAL`` segundos (15 por defecto), para el
+  *textfile collector* de node_exporter. ``{pid}`` en la ruta la distingue por réplica.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+PORT_ENV_VAR = "PERFUME_METRICS_PORT"
+HOST_ENV_VAR = "PERFUME_METRICS_HOST"
+FILE_ENV_VAR = "PERFUME_METRICS_FILE"
+INTERVAL_ENV_VAR = "PERFUME_METRICS_INTERVAL"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+M = TypeVar("M", bound="_Metric")
+F = TypeVar("F", bound=Callable[..., object])
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(value)
+
+
+class _Metric:
+    """Base de las métricas: un fragmento de datos por hilo, registrado al primer uso.
+
+    Streamlit lanza un hilo nuevo por rerun, así que al registrar un fragmento se
+    consolidan los de hilos ya terminados; la lista no crece con el número de reruns.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, dict]] = []
+        self._retired: dict = {}
+        self._shards_lock = threading.Lock()  # solo al crear el fragmento de un hilo nuevo y al exportar
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: dict = {}
+            with self._shards_lock:
+                self._retire_finished()
+                self._shards.append((threading.current_thread(), shard))
+            self._local.shard = shard
+            return shard
+
+    def _retire_finished(self) -> None:
+        alive = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:  # nadie más escribirá en este fragmento
+                self._merge(self._retired, shard)
+        self._shards = alive
+
+    def _merge(self, target: dict, shard: dict) -> None:
+        raise NotImplementedError
+
+    def _totals(self) -> dict:
+        with self._shards_lock:
+            self._retire_finished()
+            totals: dict = {}
+            self._merge(totals, self._retired)
+            for _, shard in self._shards:
+                self._merge(totals, dict(shard))  # copiar un dict es atómico bajo el GIL
+        return totals
+
+    def collect(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.collect())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Contador monótono con etiquetas."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def _merge(self, target: dict, shard: dict) -> None:
+        for labels, value in shard.items():
+            target[labels] = target.get(labels, 0) + value
+
+    def values(self) -> Dict[Labels, float]:
+        return self._totals()
+
+    def collect(self) -> Iterator[str]:
+        for labels, value in sorted(self.values().items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """Histograma acumulativo con cubetas fijas, como ``prometheus_client.Histogram``."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            # [cuenta por cubeta (la última es +Inf)..., suma]
+            series = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def _merge(self, target: dict, shard: dict) -> None:
+        for labels, series in shard.items():
+            current = target.setdefault(labels, [0] * len(series))
+            for index, value in enumerate(list(series)):
+                current[index] += value
+
+    def values(self) -> Dict[Labels, List[float]]:
+        return self._totals()
+
+    def collect(self) -> Iterator[str]:
+        names = self.labelnames + ("le",)
+        for labels, series in sorted(self.values().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(series[-1])}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: M) -> M:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+PAGE_RERUNS = REGISTRY.register(
+    Counter("perfume_page_reruns_total", "Reruns completos de cada página.", ("page",))
+)
+WIDGET_RERUNS = REGISTRY.register(
+    Counter("perfume_widget_reruns_total", "Reruns provocados por un widget de la misma página.", ("page",))
+)
+QUIZ_RESULTS = REGISTRY.register(
+    Counter("perfume_quiz_results_total", "Evaluaciones del test por familia resultante.", ("familia",))
+)
+ASSET_LOOKUPS = REGISTRY.register(
+    Counter("perfume_asset_lookups_total", "Búsquedas en el índice de recursos locales.", ("index", "result"))
+)
+RERUN_SECONDS = REGISTRY.register(
+    Histogram("perfume_rerun_duration_seconds", "Duración de cada rerun por página.", ("page",))
+)
+FRAGMENT_RERUNS = REGISTRY.register(
+    Counter("perfume_fragment_reruns_total", "Reruns parciales de cada fragmento.", ("page", "fragment"))
+)
+FRAGMENT_SECONDS = REGISTRY.register(
+    Histogram("perfume_fragment_rerun_duration_seconds", "Duración de cada rerun parcial.", ("page", "fragment"))
+)
+
+
+def render() -> str:
+    """Todas las métricas del proceso en formato de texto de Prometheus."""
+
+    return REGISTRY.render()
+
+
+_rerun_state = threading.local()
+
+
+def rerun_started(page: str) -> None:
+    """Marca el inicio del rerun de ``page`` en este hilo y lo clasifica.
+
+    Un rerun en la misma página que el anterior de la sesión lo ha provocado un widget
+    (o ``st.rerun``); el primero en cada página es una navegación.
+    """
+
+    start_exporters()
+    page = Path(page).stem
+    _rerun_state.page = page
+    _rerun_state.started = time.perf_counter()
+    import streamlit as st
+
+    if not st.runtime.exists():  # fuera de ``streamlit run`` no hay sesiones que distinguir
+        return
+    state = st.session_state
+    if state.get("_metrics_last_page") == page:
+        WIDGET_RERUNS.inc(page)
+    state["_metrics_last_page"] = page
+
+
+def rerun_finished() -> None:
+    page = getattr(_rerun_state, "page", None)
+    if page is None:
+        return
+    _rerun_state.page = None
+    PAGE_RERUNS.inc(page)
+    RERUN_SECONDS.observe(time.perf_counter() - _rerun_state.started, page)
+
+
+def track_fragment(func: F) -> F:
+    """Cuenta y cronometra los reruns parciales de un fragmento; se aplica bajo ``@st.fragment``.
+
+    En un rerun parcial Streamlit ejecuta solo el cuerpo del fragmento (no ``app.py``), así
+    que no pasa por :func:`rerun_started`. Cuando el cuerpo corre dentro del rerun completo
+    de la página ya está medido en las métricas de la página y no se vuelve a contar.
+    """
+
+    page = Path(func.__code__.co_filename).stem
+    fragment = func.__name__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if getattr(_rerun_state, "page", None) is not None:
+            return func(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            FRAGMENT_RERUNS.inc(page, fragment)
+            FRAGMENT_SECONDS.observe(time.perf_counter() - started, page, fragment)
+
+    return wrapper  # type: ignore[return-value]
+
+
+class MetricsServer:
+    """Endpoint ``/metrics`` en un hilo de fondo."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        # http.server solo se importa si se pide el endpoint, para no alargar el arranque.
+        from http import HTTPStatus
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] not in {"/metrics", "/"}:
+                    self.send_error(HTTPStatus.NOT_FOUND)
+                    return
+                body = render().encode("utf-8")
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:  # sin una línea por cada scrape
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="perfume-metrics-server", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def write_textfile(path: Path) -> None:
+    """Escribe las métricas en ``path`` de forma atómica (temporal y renombrado)."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(render(), encoding="utf-8")
+    tmp.replace(path)
+
+
+class TextfileWriter:
+    """Hilo que vuelca las métricas a un archivo cada ``interval`` segundos."""
+
+    def __init__(self, path: Path, interval: float = 15.0) -> None:
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="perfume-metrics-textfile", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                write_textfile(self.path)
+            except OSError:
+                pass  # se reintenta en el siguiente intervalo
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        write_textfile(self.path)
+
+
+_server: Optional[MetricsServer] = None
+_textfile: Optional[TextfileWriter] = None
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def start_exporters() -> None:
+    """Arranca una sola vez los exportadores configurados por variables de entorno."""
+
+    global _server, _textfile, _exporters_started
+    if _exporters_started:
+        return
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+        port = os.environ.get(PORT_ENV_VAR)
+        if port:
+            try:
+                _server = MetricsServer(os.environ.get(HOST_ENV_VAR, "127.0.0.1"), int(port))
+            except OSError:  # puerto ocupado (p. ej. otra réplica): se sigue sin endpoint
+                _server = None
+        path = os.environ.get(FILE_ENV_VAR)
+        if path:
+            import atexit
+
+            _textfile = TextfileWriter(
+                Path(path.format(pid=os.getpid())), float(os.environ.get(INTERVAL_ENV_VAR, "15"))
+            )
+            atexit.register(_textfile.close)
+
+
+__all__ = [
+    "ASSET_LOOKUPS",
+    "Counter",
+    "FRAGMENT_RERUNS",
+    "FRAGMENT_SECONDS",
+    "Histogram",
+    "MetricsServer",
+    "PAGE_RERUNS",
+    "QUIZ_RESULTS",
+    "REGISTRY",
+    "RERUN_SECONDS",
+    "Registry",
+    "TextfileWriter",
+    "WIDGET_RERUNS",
+    "render",
+    "rerun_finished",
+    "rerun_started",
+    "start_exporters",
+    "track_fragment",
+    "write_textfile",
+]
@@ -0,0 +1,102 @@
+"""Registro declarativo de las páginas de la aplicación.
+
+``app.py`` construye ``st.navigation`` a partir de :data:`PAGES`, de modo que la
+configuración común, la barra lateral y la instrumentación se ejecutan una sola vez en
+el script de entrada. Cada página es un archivo que Streamlit solo ejecuta (e importa
+con sus dependencias) cuando se visita.
+
+Para añadir una página basta con crear su archivo en ``pages/`` y registrarla aquí.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from streamlit.navigation.page import StreamlitPage
+
+
+@dataclass(frozen=True)
+class PageSpec:
+    path: str  # relativa a app.py
+    title: str  # título de la pestaña del navegador
+    label: str  # texto del enlace en la barra lateral
+    icon: str
+    default: bool = False
+
+    @property
+    def url_path(self) -> str:
+        """Ruta de la URL; la misma que Streamlit derivaba del nombre del archivo."""
+
+        return "" if self.default else Path(self.path).stem.split("_", 1)[1]
+
+    @property
+    def name(self) -> str:
+        return Path(self.path).stem
+
+
+INICIO_PAGE = "pages/0_Inicio.py"
+TIPOS_PAGE = "pages/1_Tipos_de_Perfumes.py"
+FAMILIAS_PAGE = "pages/2_Familias_Olfativas.py"
+CURIOSIDADES_PAGE = "pages/3_Curiosidades.py"
+TEST_PAGE = "pages/4_Test_Interactivo.py"
+CONTACTO_PAGE = "pages/5_Contacto.py"
+
+PAGES: Tuple[PageSpec, ...] = (
+    PageSpec(INICIO_PAGE, "El Arte del Perfume", "Inicio", "🌹", default=True),
+    PageSpec(TIPOS_PAGE, "Tipos de Perfumes", "Tipos de Perfumes", "📘"),
+    PageSpec(FAMILIAS_PAGE, "Familias Olfativas", "Familias Olfativas", "🌸"),
+    PageSpec(CURIOSIDADES_PAGE, "Curiosidades del Perfume", "Curiosidades", "💡"),
+    PageSpec(TEST_PAGE, "Test Interactivo", "Test Interactivo", "🧪"),
+    PageSpec(CONTACTO_PAGE, "Contacto y Créditos", "Contacto y Créditos", "📬"),
+)
+
+_BY_PATH: Dict[str, PageSpec] = {spec.path: spec for spec in PAGES}
+
+
+def get_page(path: str) -> PageSpec:
+    return _BY_PATH[path]
+
+
+def navigate() -> Tuple[PageSpec, StreamlitPage]:
+    """Registra las páginas en ``st.navigation`` y devuelve la que se debe ejecutar.
+
+    La navegación automática queda oculta: la barra lateral propia la construye
+    :func:`utils.render_sidebar` a partir del mismo registro.
+    """
+
+    import streamlit as st
+
+    pages = {
+        spec: st.Page(spec.path, title=spec.title, icon=spec.icon, url_path=spec.url_path or None, default=spec.default)
+        for spec in PAGES
+    }
+    selected = st.navigation(list(pages.values()), position="hidden")
+    spec = next((spec for spec, page in pages.items() if page is selected or page.url_path == selected.url_path), PAGES[0])
+    return spec, selected
+
+
+def page_link(path: str, label: Optional[str] = None, container: object = None) -> None:
+    """Enlace a una página registrada con su etiqueta e icono del registro."""
+
+    import streamlit as st
+
+    spec = get_page(path)
+    (container or st).page_link(spec.path, label=label or spec.label, icon=spec.icon)
+
+
+__all__ = [
+    "CONTACTO_PAGE",
+    "CURIOSIDADES_PAGE",
+    "FAMILIAS_PAGE",
+    "INICIO_PAGE",
+    "PAGES",
+    "PageSpec",
+    "TEST_PAGE",
+    "TIPOS_PAGE",
+    "get_page",
+    "navigate",
+    "page_link",
+]
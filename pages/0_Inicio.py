@@ -0,0 +1,73 @@
+"""Portada de El Arte del Perfume."""
+
+from __future__ import annotations
+
+import streamlit as st
+
+from navigation import CURIOSIDADES_PAGE, FAMILIAS_PAGE, TIPOS_PAGE, page_link
+from utils import GALLERY_IMAGE_WIDTH, get_hero_html, resolve_image, resolve_video
+
+
+st.markdown(get_hero_html(), unsafe_allow_html=True)
+
+st.write("")
+
+col1, col2 = st.columns([3, 2], gap="large")
+
+with col1:
+    st.subheader("Un viaje aromático a través del tiempo")
+    st.write(
+        """
+        Desde las civilizaciones antiguas hasta las casas de lujo contemporáneas, el perfume ha sido un símbolo de
+        status, seducción y expresión personal. En esta plataforma encontrarás recursos multimedia, datos curiosos y
+        un test interactivo para descubrir tu familia olfativa.
+        """
+    )
+
+    perfume_gallery = [
+        resolve_image("Esencia1.jpg", fallback_url="https://images.unsplash.com/photo-1501004318641-b39e6451bec6", width=GALLERY_IMAGE_WIDTH),
+        resolve_image("Esencia2.jpg", fallback_url="https://images.unsplash.com/photo-1498837167922-ddd27525d352", width=GALLERY_IMAGE_WIDTH),
+        resolve_image("Esencia3.jpg", fallback_url="https://images.unsplash.com/photo-1498842812179-c81beecf902c", width=GALLERY_IMAGE_WIDTH),
+    ]
+
+    st.markdown("#### Galería sensorial")
+    gallery_cols = st.columns(len(perfume_gallery))
+    for idx, (col, image_info) in enumerate(zip(gallery_cols, perfume_gallery), start=1):
+        with col:
+            if image_info["path"]:
+                col.image(image_info["path"], caption=f"Esencia {idx}", use_container_width=True)
+            elif image_info["fallback"]:
+                col.image(image_info["fallback"], caption=f"Esencia {idx}", use_container_width=True)
+
+with col2:
+    st.subheader("Elaboración artesanal")
+    st.write(
+        """
+        Aprende cómo las esencias naturales y sintéticas se combinan en un proceso meticuloso que mezcla creatividad
+        y química. Cada acorde resulta de cientos de pruebas para lograr armonías memorables.
+        """
+    )
+    video_info = resolve_video(
+        "historia_perfume.mp4",
+        fallback_url="https://www.youtube.com/watch?v=QRZPy8Oag3g",
+    )
+    if video_info["path"]:
+        st.video(video_info["path"])
+    elif video_info["fallback"]:
+        st.video(video_info["fallback"])
+
+
+st.divider()
+
+st.markdown("### Continúa explorando")
+
+cta_cols = st.columns(3)
+
+for col, page in zip(cta_cols, (TIPOS_PAGE, FAMILIAS_PAGE, CURIOSIDADES_PAGE)):
+    page_link(page, container=col)
+
+st.write("")
+
+st.info(
+    "¿Listo para descubrir tu aroma ideal? Dirígete al test interactivo en la barra lateral y obtén tu recomendación personalizada."
+)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import streamlit as st
+
+from metrics import track_fragment
+from utils import (
+    DETAIL_IMAGE_WIDTH,
+    filter_catalog,
+    get_perfume_examples,
+    get_perfume_types,
+    render_catalog_results,
+    resolve_image,
+)
+
+
+st.title("Tipos de Perfumes")
+st.caption("Comprende las concentraciones, duraciones y ejemplos emblemáticos.")
+
+df = get_perfume_types()
+st.dataframe(
+    df,
+    use_container_width=True,
+    hide_index=True,
+    column_order=["Tipo", "concentracion_min", "concentracion_max", "duracion_min", "duracion_max", "Notas Destacadas"],
+    column_config={
+        "concentracion_min": st.column_config.NumberColumn("Esencia mín.", format="%d %%"),
+        "concentracion_max": st.column_config.NumberColumn("Esencia máx.", format="%d %%"),
+        "duracion_min": st.column_config.NumberColumn("Duración mín.", format="%d h"),
+        "duracion_max": st.column_config.NumberColumn("Duración máx.", format="%d h"),
+    },
+)
+
+st.divider()
+
+imagenes_tipo = {
+    "Parfum (Extracto)": resolve_image(
+        "baccarat.jpg",
+        fallback_url="https://images.unsplash.com/photo-1512767347951-df63c80f31ea?auto=compress&fit=crop&w=900",
+        width=DETAIL_IMAGE_WIDTH,
+    ),
+    "Eau de Parfum": resolve_image(
+        "dior.jpg",
+        fallback_url="https://images.unsplash.com/photo-1487412720507-6297c0ae4bda?auto=compress&fit=crop&w=900",
+        width=DETAIL_IMAGE_WIDTH,
+    ),
+    "Eau de Toilette": resolve_image(
+        "acqua.jpg",
+        fallback_url="https://images.unsplash.com/photo-1521572267360-ee0c2909d518?auto=compress&fit=crop&w=900",
+        width=DETAIL_IMAGE_WIDTH,
+    ),
+    "Eau de Cologne": resolve_image(
+        "Cologne.jpg",
+        fallback_url="https://images.unsplash.com/photo-1498837167922-ddd27525d352?auto=compress&fit=crop&w=900",
+        width=DETAIL_IMAGE_WIDTH,
+    ),
+    "Body Mist": resolve_image(
+        "body.jpg",
+        fallback_url="https://images.unsplash.com/photo-1465408953385-7c4624fa7d6a?auto=compress&fit=crop&w=900",
+        width=DETAIL_IMAGE_WIDTH,
+    ),
+}
+
+
+@st.fragment
+@track_fragment
+def detalle_tipo() -> None:
+    """Selector y panel de detalle; al cambiar de tipo solo se vuelve a ejecutar este bloque."""
+
+    df = get_perfume_types()
+    tipo_seleccionado = st.radio("Selecciona un tipo para conocer más detalles:", df["Tipo"].tolist())
+
+    col_info, col_image = st.columns([2, 1], gap="large")
+
+    with col_info:
+        fila_tipo = df[df["Tipo"] == tipo_seleccionado].iloc[0]
+        st.subheader(tipo_seleccionado)
+        st.markdown(
+            f"**Concentración aproximada:** {fila_tipo['Concentración']}  \
+            **Duración estimada:** {fila_tipo['Duración']}  \
+            **Perfil olfativo:** {fila_tipo['Notas Destacadas']}"
+        )
+
+        ejemplos = get_perfume_examples().get(tipo_seleccionado, [])
+        if ejemplos:
+            st.markdown("**Referencias célebres:**")
+            st.write(" · ".join(ejemplos))
+
+        render_catalog_results("Más en el catálogo", key=f"pagina_tipo_{tipo_seleccionado}", tipo=tipo_seleccionado)
+
+        with st.expander("¿Cuándo elegir este tipo?", expanded=True):
+            recomendaciones = {
+                "Parfum (Extracto)": "Eventos memorables, noches y climas fríos donde la intensidad destaca.",
+                "Eau de Parfum": "Uso versátil, ideal para oficina, citas y salidas sociales.",
+                "Eau de Toilette": "Perfecto para el día a día, ambientes cálidos o reuniones informales.",
+                "Eau de Cologne": "Refréscate después del ejercicio o durante veranos intensos.",
+                "Body Mist": "Reaplica con frecuencia para mantener un halo sutil durante todo el día.",
+            }
+            st.write(recomendaciones.get(tipo_seleccionado, ""))
+
+    with col_image:
+        imagen = imagenes_tipo.get(tipo_seleccionado)
+        if imagen and imagen["path"]:
+            st.image(imagen["path"], caption=tipo_seleccionado)
+
+
+detalle_tipo()
+
+st.divider()
+
+
+@st.fragment
+@track_fragment
+def filtros_catalogo() -> None:
+    """Filtros por rango sobre el catálogo completo; solo este bloque se vuelve a ejecutar."""
+
+    st.subheader("Encuentra perfumes por duración y concentración")
+    col_duracion, col_concentracion = st.columns(2)
+    duracion = col_duracion.slider("Duración mínima (horas)", 0, 12, 0, key="filtro_duracion")
+    rango_completo = (0.0, 40.0)
+    concentracion = col_concentracion.slider(
+        "Concentración de esencia (%)", *rango_completo, rango_completo, step=0.5, key="filtro_concentracion"
+    )
+
+    # Con el rango completo no se filtra: así también aparecen los perfumes sin concentración conocida.
+    resultados = filter_catalog(
+        duracion_min=duracion or None,
+        concentracion=None if tuple(concentracion) == rango_completo else concentracion,
+    )
+    st.caption(f"{len(resultados)} perfumes del catálogo cumplen los filtros.")
+    if len(resultados):
+        st.dataframe(
+            resultados.head(50)[["nombre", "marca", "tipo", "familia", "concentracion"]],
+            use_container_width=True,
+            hide_index=True,
+            column_config={"concentracion": st.column_config.NumberColumn("concentración", format="%.1f %%")},
+        )
+
+
+filtros_catalogo()
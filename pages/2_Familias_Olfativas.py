@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import streamlit as st
+
+from metrics import track_fragment
+from utils import get_family_graph_svg, get_olfactive_families, render_catalog_results
+
+
+st.title("Familias Olfativas")
+st.caption("Explora los universos aromáticos que inspiran a perfumistas de todo el mundo.")
+
+
+@st.fragment
+@track_fragment
+def detalle_familia() -> None:
+    """Selector y ficha de la familia; al cambiar de familia solo se vuelve a ejecutar este bloque."""
+
+    familias = get_olfactive_families()
+    familia_seleccionada = st.selectbox("Elige una familia para ver sus características:", list(familias.keys()))
+
+    info_familia = familias[familia_seleccionada]
+
+    col_texto, col_imagen = st.columns([2, 1])
+
+    with col_texto:
+        st.subheader(familia_seleccionada)
+        st.write(info_familia["descripcion"])
+        st.markdown(f"**Perfumes representativos:** {info_familia['ejemplos']}")
+        render_catalog_results(
+            "Más en el catálogo", key=f"pagina_familia_{familia_seleccionada}", familia=familia_seleccionada
+        )
+
+    with col_imagen:
+        imagen_info = info_familia["imagen"]
+        image_source = imagen_info.get("path")
+        fallback_source = imagen_info.get("fallback")
+
+        if image_source:
+            st.image(image_source, caption=familia_seleccionada, width=320)
+        elif fallback_source:
+            st.image(fallback_source, caption=familia_seleccionada, width=320)
+
+
+detalle_familia()
+
+st.divider()
+
+st.markdown("#### Relaciones entre familias")
+st.image(get_family_graph_svg())
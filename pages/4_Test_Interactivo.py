@@ -2,12 +2,16 @@ from __future__ import annotations
 
 import streamlit as st
 
-from utils import evaluate_quiz, get_quiz_questions, render_sidebar
+from utils import (
+    evaluate_quiz,
+    get_quiz_questions,
+    get_recommendation_html,
+    recommend_perfumes,
+    record_quiz_result,
+    render_quiz_stats,
+)
 
 
-st.set_page_config(page_title="Test Interactivo", page_icon="🧪", layout="wide")
-render_sidebar()
-
 st.title("Descubre tu Familia Olfativa")
 st.caption("Responde las siguientes preguntas y obtén una recomendación personalizada.")
 
@@ -28,6 +32,7 @@ with st.form("quiz_form"):
 
 if submitted:
     resultado = evaluate_quiz(responses)
+    record_quiz_result(responses, resultado)
     st.success(
         f"Tu perfil predominante es: **{resultado['titulo']}**\n\n{resultado['descripcion']}"
     )
@@ -37,7 +42,14 @@ if submitted:
     for col, (familia, puntaje) in zip(cols, resultado["puntajes"].items()):
         col.metric(label=familia.capitalize(), value=puntaje)
 
+    recomendaciones = recommend_perfumes(resultado["puntajes"])
+    if recomendaciones:
+        st.markdown("#### Perfumes que podrían encantarte")
+        for recomendacion in recomendaciones:
+            st.markdown(get_recommendation_html(recomendacion), unsafe_allow_html=True)
+
 else:
     st.info("Completa el cuestionario y pulsa el botón para conocer tu familia olfativa ideal.")
 
-
+with st.expander("📊 Resultados de la comunidad"):
+    render_quiz_stats()
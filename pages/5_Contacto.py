@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import streamlit as st
+
+from contact import CONTACT_REASONS, MAX_MESSAGE_LENGTH, submit_contact, validate_contact
+
+
+st.title("Sobre Nosotras")
+
+st.markdown("---")
+
+st.header("Nuestra pasión por los aromas")
+
+st.write(
+    """
+    **Fragrances IeJ S.A.** Es una empresa ficticia dedicada a la divulgación de la cultura del perfume. Fundada en 2025 por una perfumistas y amantes de
+    las fragancias con el único propósito de compartir conocimientos y secretos sobre este arte.
+
+    Nuestro equipo está compuesto por:
+
+    * **Javiera:** Perfumista experta.
+    * **Maria** Social Management.
+    * **Patricia** Creadora de contenido digital.
+
+    """
+)
+
+st.warning("Toda la información y los perfumes son exclusivos de la dueña.")
+
+st.markdown("---")
+
+st.header("Escríbenos")
+
+with st.form("contact_form"):
+    col_nombre, col_email = st.columns(2)
+    nombre = col_nombre.text_input("Nombre")
+    email = col_email.text_input("Correo electrónico")
+    motivo = st.selectbox("Motivo", CONTACT_REASONS)
+    mensaje = st.text_area("Mensaje", max_chars=MAX_MESSAGE_LENGTH)
+    enviado = st.form_submit_button("Enviar mensaje")
+
+if enviado:
+    contacto, errores = validate_contact(nombre, email, motivo, mensaje)
+    if errores:
+        for error in errores:
+            st.error(error)
+    elif submit_contact(contacto):
+        st.success("¡Gracias por escribirnos! Te responderemos pronto.")
+    else:
+        st.warning("Estamos recibiendo muchos mensajes en este momento. Inténtalo de nuevo en unos minutos.")
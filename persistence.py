@@ -0,0 +1,359 @@
+"""Persistencia diferida (write-behind) de los resultados del test y sus agregados.
+
+Cada envío del test se encola en memoria y un hilo de fondo lo escribe en SQLite por
+lotes, de modo que el rerun nunca espera al disco. En la misma transacción que inserta
+el lote se actualizan los agregados (distribución por familia, respuestas por pregunta
+y empates) sumando solo lo nuevo, así que consultarlos cuesta lo mismo con diez envíos
+que con diez millones.
+
+La base se guarda en ``data/quiz.sqlite`` (configurable con ``PERFUME_QUIZ_DB``).
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+DB_ENV_VAR = "PERFUME_QUIZ_DB"
+DEFAULT_DB_PATH = Path(__file__).parent / "data" / "quiz.sqlite"
+
+T = TypeVar("T")
+
+_STOP = object()
+
+
+class BatchWriter(Generic[T]):
+    """Cola acotada que ``workers`` hilos de fondo vacían por lotes llamando a ``flush``.
+
+    Un lote se escribe cuando reúne ``max_batch`` elementos o cuando han pasado
+    ``flush_interval`` segundos desde el primero. Si ``flush`` falla, el lote se
+    reintenta con espera creciente hasta ``max_retries`` veces y después se descarta.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[T]], None],
+        name: str,
+        max_batch: int = 200,
+        flush_interval: float = 0.5,
+        max_queue: int = 10000,
+        max_retries: int = 5,
+        workers: int = 1,
+    ) -> None:
+        self._flush = flush
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self._threads = [
+            threading.Thread(target=self._run, name=f"{name}-{index}" if workers > 1 else name, daemon=True)
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, item: T, timeout: Optional[float] = None) -> bool:
+        """Encola ``item``; devuelve ``False`` si la cola sigue llena pasado ``timeout``."""
+
+        try:
+            self._queue.put(item, block=timeout is not None, timeout=timeout)
+        except queue.Full:
+            return False
+        return True
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def join(self) -> None:
+        """Espera a que se hayan escrito todos los elementos encolados hasta ahora."""
+
+        self._queue.join()
+
+    def close(self) -> None:
+        """Escribe lo pendiente y detiene los hilos."""
+
+        alive = [thread for thread in self._threads if thread.is_alive()]
+        for _ in alive:
+            self._queue.put(_STOP)
+        for thread in alive:
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            batch: List[T] = []
+            stop = first is _STOP
+            if not stop:
+                batch.append(first)  # type: ignore[arg-type]
+            deadline = time.monotonic() + self.flush_interval
+            while not stop and len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)  # type: ignore[arg-type]
+            if batch:
+                self._write(batch)
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: List[T]) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._flush(batch)
+                return
+            except Exception:  # se reintenta con cualquier error de escritura
+                if attempt == self.max_retries:
+                    self.dropped += len(batch)
+                    return
+                time.sleep(min(0.1 * 2**attempt, 5.0))
+
+
+@dataclass(frozen=True)
+class QuizSubmission:
+    respuestas: Tuple[str, ...]
+    codigo: str
+    empate: bool
+    creado: float = field(default_factory=time.time)
+
+
+@dataclass(frozen=True)
+class QuizAggregates:
+    total: int = 0
+    empates: int = 0
+    familias: Dict[str, int] = field(default_factory=dict)
+    # {número de pregunta (desde 1): {opción: envíos}}
+    respuestas: Dict[int, Dict[str, int]] = field(default_factory=dict)
+
+    @property
+    def tasa_empates(self) -> float:
+        return self.empates / self.total if self.total else 0.0
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    creado REAL NOT NULL,
+    respuestas TEXT NOT NULL,
+    codigo TEXT NOT NULL,
+    empate INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS family_counts (
+    codigo TEXT PRIMARY KEY,
+    total INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS answer_counts (
+    pregunta INTEGER NOT NULL,
+    opcion TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (pregunta, opcion)
+);
+CREATE TABLE IF NOT EXISTS totals (
+    clave TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+"""
+
+
+class QuizStore:
+    """Historial de envíos del test con agregados mantenidos de forma incremental."""
+
+    def __init__(self, path: Path, refresh_interval: float = 2.0, **writer_options: object) -> None:
+        self.path = path
+        self.refresh_interval = refresh_interval
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+        self._lock = threading.Lock()
+        self._aggregates = QuizAggregates()
+        self._loaded_at = float("-inf")
+        self._writer: BatchWriter[QuizSubmission] = BatchWriter(self._flush, name="perfume-quiz-writer", **writer_options)  # type: ignore[arg-type]
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def submit(self, submission: QuizSubmission) -> bool:
+        """Encola el envío sin bloquear; ``False`` si la cola está llena y se descartó."""
+
+        return self._writer.submit(submission)
+
+    def flush(self) -> None:
+        self._writer.join()
+
+    def close(self) -> None:
+        self._writer.close()
+
+    def _flush(self, batch: List[QuizSubmission]) -> None:
+        families: Dict[str, int] = {}
+        answers: Dict[Tuple[int, str], int] = {}
+        ties = 0
+        for submission in batch:
+            families[submission.codigo] = families.get(submission.codigo, 0) + 1
+            for number, option in enumerate(submission.respuestas, start=1):
+                answers[(number, option)] = answers.get((number, option), 0) + 1
+            ties += submission.empate
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO submissions (creado, respuestas, codigo, empate) VALUES (?, ?, ?, ?)",
+                    [(s.creado, json.dumps(s.respuestas), s.codigo, int(s.empate)) for s in batch],
+                )
+                conn.executemany(
+                    "INSERT INTO family_counts (codigo, total) VALUES (?, ?) "
+                    "ON CONFLICT (codigo) DO UPDATE SET total = total + excluded.total",
+                    families.items(),
+                )
+                conn.executemany(
+                    "INSERT INTO answer_counts (pregunta, opcion, total) VALUES (?, ?, ?) "
+                    "ON CONFLICT (pregunta, opcion) DO UPDATE SET total = total + excluded.total",
+                    [(number, option, count) for (number, option), count in answers.items()],
+                )
+                conn.executemany(
+                    "INSERT INTO totals (clave, valor) VALUES (?, ?) "
+                    "ON CONFLICT (clave) DO UPDATE SET valor = valor + excluded.valor",
+                    [("total", len(batch)), ("empates", ties)],
+                )
+        finally:
+            conn.close()
+
+    def aggregates(self) -> QuizAggregates:
+        """Agregados actuales; se releen de las tablas de totales como mucho cada ``refresh_interval``.
+
+        Las tablas de totales tienen una fila por familia u opción, así que la lectura no
+        depende del número de envíos acumulados (e incluye los de otros procesos).
+        """
+
+        with self._lock:
+            if time.monotonic() - self._loaded_at < self.refresh_interval:
+                return self._aggregates
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=30)
+            try:
+                totals = dict(conn.execute("SELECT clave, valor FROM totals"))
+                families = dict(conn.execute("SELECT codigo, total FROM family_counts ORDER BY total DESC"))
+                answers: Dict[int, Dict[str, int]] = {}
+                for number, option, count in conn.execute(
+                    "SELECT pregunta, opcion, total FROM answer_counts ORDER BY pregunta, total DESC"
+                ):
+                    answers.setdefault(number, {})[option] = count
+            finally:
+                conn.close()
+            self._aggregates = QuizAggregates(totals.get("total", 0), totals.get("empates", 0), families, answers)
+            self._loaded_at = time.monotonic()
+            return self._aggregates
+
+
+def db_path() -> Path:
+    return Path(os.environ.get(DB_ENV_VAR, DEFAULT_DB_PATH))
+
+
+_store: Optional[QuizStore] = None
+_store_lock = threading.Lock()
+_init_thread: Optional[threading.Thread] = None
+_init_lock = threading.Lock()
+
+# Envíos recibidos mientras el almacén se inicializa; se encolan en cuanto está listo.
+PENDING_LIMIT = 1000
+_pending: List[QuizSubmission] = []
+_pending_lock = threading.Lock()
+
+
+def get_quiz_store() -> QuizStore:
+    """Almacén compartido del proceso; al salir se escriben los envíos pendientes.
+
+    Crearlo ejecuta el DDL y arranca el hilo de escritura: desde un rerun conviene usar
+    :func:`start_quiz_store` y :func:`peek_quiz_store`, que no esperan.
+    """
+
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = QuizStore(db_path())
+            atexit.register(_store.close)
+        return _store
+
+
+def _initialize() -> None:
+    try:
+        store = get_quiz_store()
+    except (OSError, sqlite3.Error):  # se reintenta en la próxima llamada a start_quiz_store
+        return
+    with _pending_lock:
+        waiting = _pending[:]
+        _pending.clear()
+    for submission in waiting:
+        store.submit(submission)
+
+
+def start_quiz_store() -> None:
+    """Crea el almacén en un hilo de fondo si todavía no existe; vuelve de inmediato."""
+
+    global _init_thread
+    if _store is not None:
+        return
+    with _init_lock:
+        if _store is None and (_init_thread is None or not _init_thread.is_alive()):
+            _init_thread = threading.Thread(target=_initialize, name="perfume-quiz-init", daemon=True)
+            _init_thread.start()
+
+
+def peek_quiz_store() -> Optional[QuizStore]:
+    """El almacén si ya está listo, o ``None`` mientras se inicializa."""
+
+    return _store
+
+
+def record_submission(respuestas: Sequence[str], codigo: str, empate: bool) -> bool:
+    """Registra un envío sin tocar el disco; ``False`` si se descartó por falta de espacio.
+
+    Si el almacén aún se está creando, el envío espera en memoria (hasta ``PENDING_LIMIT``)
+    y el hilo de inicialización lo encola al terminar.
+    """
+
+    submission = QuizSubmission(tuple(respuestas), codigo, empate)
+    with _pending_lock:
+        # _store se lee bajo el cerrojo: _initialize publica el almacén antes de vaciar la lista.
+        store = _store
+        if store is None:
+            if len(_pending) >= PENDING_LIMIT:
+                return False
+            _pending.append(submission)
+    if store is None:
+        start_quiz_store()
+        return True
+    return store.submit(submission)
+
+
+__all__ = [
+    "BatchWriter",
+    "QuizAggregates",
+    "QuizStore",
+    "QuizSubmission",
+    "get_quiz_store",
+    "peek_quiz_store",
+    "record_submission",
+    "start_quiz_store",
+]
@@ -0,0 +1,241 @@
+"""Instrumentación opcional de cada rerun: tiempos, llamadas y perfiles por página.
+
+Se activa con la variable de entorno ``PERFUME_PROFILE``. El valor ``1`` registra tiempos
+y número de llamadas; se pueden añadir ``cprofile`` y/o ``tracemalloc`` separados por
+comas (o ``all``) para capturar además un perfil de CPU o las líneas que más memoria
+reservan. El parámetro de URL ``?profile=`` acepta los mismos valores, pero solo si el
+servidor se inició con ``PERFUME_PROFILE_QUERY=1``: cualquier visitante podría usarlo
+para encarecer los reruns.
+
+Cada rerun se resume en un panel de la barra lateral y se añade como una línea JSON a
+``logs/profile.jsonl`` (con rotación; ruta configurable con ``PERFUME_PROFILE_LOG``).
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, List, Optional, TypeVar
+
+import metrics
+
+if TYPE_CHECKING:  # cProfile, pstats y logging solo se importan si se activa el perfilado
+    import cProfile
+    import logging
+
+ENV_VAR = "PERFUME_PROFILE"
+LOG_ENV_VAR = "PERFUME_PROFILE_LOG"
+QUERY_PARAM = "profile"
+QUERY_ENV_VAR = "PERFUME_PROFILE_QUERY"
+DEFAULT_LOG_PATH = Path(__file__).parent / "logs" / "profile.jsonl"
+
+F = TypeVar("F", bound=Callable[..., object])
+
+_state = threading.local()
+_logger_lock = threading.Lock()
+_logger: Optional[logging.Logger] = None
+
+# tracemalloc es global al proceso: se inicia con el primer rerun que lo pide y se
+# detiene cuando termina el último, sin cortar la medición de otras sesiones.
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_started = False
+
+
+@dataclass
+class RerunProfile:
+    """Mediciones acumuladas durante un rerun de una página."""
+
+    page: str
+    modes: FrozenSet[str]
+    started: float = field(default_factory=time.perf_counter)
+    calls: Dict[str, int] = field(default_factory=dict)
+    wall_ms: Dict[str, float] = field(default_factory=dict)
+    profiler: Optional[cProfile.Profile] = None
+    uses_tracemalloc: bool = False
+
+    def record(self, name: str, elapsed_ms: float) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.wall_ms[name] = self.wall_ms.get(name, 0.0) + elapsed_ms
+
+
+def _parse_modes(value: Optional[str]) -> FrozenSet[str]:
+    if not value or value.strip().lower() in {"0", "false", "no", "off"}:
+        return frozenset()
+    modes = {part.strip().lower() for part in value.split(",") if part.strip()}
+    if "all" in modes:
+        modes |= {"cprofile", "tracemalloc"}
+    return frozenset(modes | {"timings"})
+
+
+def _requested_modes() -> FrozenSet[str]:
+    modes = _parse_modes(os.environ.get(ENV_VAR))
+    if os.environ.get(QUERY_ENV_VAR, "").strip().lower() not in {"1", "true", "yes", "on"}:
+        return modes
+    try:
+        import streamlit as st
+
+        modes |= _parse_modes(st.query_params.get(QUERY_PARAM))
+    except Exception:  # fuera de una sesión de Streamlit no hay query params
+        pass
+    return frozenset(modes)
+
+
+def current() -> Optional[RerunProfile]:
+    """Perfil del rerun en curso en este hilo, o ``None`` si la instrumentación está apagada."""
+
+    return getattr(_state, "profile", None)
+
+
+def start_rerun(page: str) -> Optional[RerunProfile]:
+    """Comienza a medir el rerun de ``page`` si la instrumentación está activada.
+
+    Las métricas de :mod:`metrics` se registran siempre, con o sin instrumentación.
+    """
+
+    metrics.rerun_started(page)
+    modes = _requested_modes()
+    if not modes:
+        _state.profile = None
+        return None
+
+    profile = RerunProfile(page=Path(page).stem, modes=modes)
+    if "tracemalloc" in modes:
+        _acquire_tracemalloc()
+        profile.uses_tracemalloc = True
+    if "cprofile" in modes:
+        import cProfile
+
+        profile.profiler = cProfile.Profile()
+        try:
+            profile.profiler.enable()
+        except ValueError:  # ya hay otro perfilador activo en el proceso
+            profile.profiler = None
+    _state.profile = profile
+    return profile
+
+
+def _acquire_tracemalloc() -> None:
+    global _tracemalloc_users, _tracemalloc_started
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_started = True
+        _tracemalloc_users += 1
+
+
+def _release_tracemalloc() -> None:
+    global _tracemalloc_users, _tracemalloc_started
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_started:  # si lo inició otro, no se toca
+            tracemalloc.stop()
+            _tracemalloc_started = False
+
+
+def instrument(func: F) -> F:
+    """Registra tiempo y número de llamadas de ``func`` cuando hay un rerun instrumentado."""
+
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = current()
+        if profile is None:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.record(name, (time.perf_counter() - start) * 1000)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _get_logger() -> logging.Logger:
+    global _logger
+    import logging
+    from logging.handlers import RotatingFileHandler
+
+    with _logger_lock:
+        if _logger is None:
+            path = Path(os.environ.get(LOG_ENV_VAR, DEFAULT_LOG_PATH))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(path, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger = logging.getLogger("perfume.profiling")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(handler)
+            _logger = logger
+        return _logger
+
+
+def finish_rerun() -> Optional[Dict[str, object]]:
+    """Cierra la medición del rerun, la escribe en el log y muestra el panel de desarrollo."""
+
+    metrics.rerun_finished()
+    profile = current()
+    if profile is None:
+        return None
+    _state.profile = None
+
+    total_ms = (time.perf_counter() - profile.started) * 1000
+    report: Dict[str, object] = {
+        "timestamp": time.time(),
+        "page": profile.page,
+        "total_ms": round(total_ms, 3),
+        "builders": {
+            name: {"calls": profile.calls[name], "wall_ms": round(profile.wall_ms[name], 3)}
+            for name in sorted(profile.wall_ms, key=profile.wall_ms.get, reverse=True)
+        },
+    }
+
+    if profile.profiler is not None:
+        import pstats
+
+        profile.profiler.disable()
+        buffer = io.StringIO()
+        pstats.Stats(profile.profiler, stream=buffer).sort_stats("cumulative").print_stats(15)
+        report["cprofile"] = buffer.getvalue()
+
+    if profile.uses_tracemalloc:
+        try:
+            top: List[str] = [str(stat) for stat in tracemalloc.take_snapshot().statistics("lineno")[:10]]
+            report["tracemalloc_peak_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+            report["tracemalloc_top"] = top
+        finally:
+            _release_tracemalloc()
+
+    _get_logger().info(json.dumps(report, ensure_ascii=False))
+    _render_panel(report)
+    return report
+
+
+def _render_panel(report: Dict[str, object]) -> None:
+    import streamlit as st
+
+    with st.sidebar.expander("🛠️ Perfilado del rerun", expanded=False):
+        st.metric("Tiempo total", f"{report['total_ms']:.1f} ms")
+        builders = report["builders"]
+        if builders:
+            st.dataframe(
+                [{"función": name, **values} for name, values in builders.items()],
+                hide_index=True,
+                use_container_width=True,
+            )
+        if "tracemalloc_top" in report:
+            st.caption(f"Pico de memoria: {report['tracemalloc_peak_kb']} KB")
+            st.code("\n".join(report["tracemalloc_top"]), language="text")
+        if "cprofile" in report:
+            st.code(report["cprofile"], language="text")
+
+
+__all__ = ["RerunProfile", "current", "finish_rerun", "instrument", "start_rerun"]
@@ -0,0 +1,136 @@
+"""Recomendador por similitud de notas olfativas.
+
+Cada perfume se representa como un vector de notas y familia. La matriz se normaliza
+una sola vez, de modo que la similitud coseno con una preferencia se reduce a un
+producto matriz-vector. Para catálogos grandes se puede activar un índice aproximado
+(IVF): los vectores se agrupan con k-means y cada consulta solo examina los grupos
+más cercanos.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Generic, Iterable, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+from search import normalize
+
+T = TypeVar("T")
+
+# A partir de este tamaño se construye el índice aproximado si no se indica lo contrario.
+APPROXIMATE_THRESHOLD = 20000
+
+
+def note_feature(note: str) -> str:
+    return normalize(note.strip())
+
+
+def family_feature(family: str) -> str:
+    return f"familia:{normalize(family.strip())}"
+
+
+@dataclass(frozen=True)
+class Recommendation(Generic[T]):
+    item: T
+    similarity: float
+
+
+class _IVFIndex:
+    """Índice de archivos invertidos sobre centroides de k-means (similitud coseno)."""
+
+    def __init__(self, matrix: np.ndarray, n_lists: int, iterations: int = 8, seed: int = 0) -> None:
+        rng = np.random.default_rng(seed)
+        n_lists = max(1, min(n_lists, len(matrix)))
+        centroids = matrix[rng.choice(len(matrix), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = (matrix @ centroids.T).argmax(axis=1)
+            for cluster in range(n_lists):
+                members = matrix[assignment == cluster]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    centroids[cluster] = centroid / norm if norm else centroid
+        assignment = (matrix @ centroids.T).argmax(axis=1)
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(n_lists + 1))
+        # Los grupos que quedaron vacíos se descartan: sondearlos no aportaría candidatos.
+        kept = [i for i in range(n_lists) if bounds[i + 1] > bounds[i]]
+        self.centroids = centroids[kept]
+        self.lists = [order[bounds[i] : bounds[i + 1]] for i in kept]
+
+    def candidates(self, query: np.ndarray, n_probe: int) -> np.ndarray:
+        nearest = np.argsort(-(self.centroids @ query))[:n_probe]
+        return np.concatenate([self.lists[i] for i in nearest])
+
+
+class NoteRecommender(Generic[T]):
+    """Vecinos más cercanos por similitud coseno sobre vectores de notas y familia."""
+
+    def __init__(
+        self,
+        items: Iterable[Tuple[T, Sequence[str], str]],
+        approximate: Optional[bool] = None,
+        n_probe: int = 4,
+    ) -> None:
+        """``items`` son tuplas ``(elemento, notas, familia)``."""
+
+        self.items: List[T] = []
+        rows: List[List[str]] = []
+        vocabulary: Dict[str, int] = {}
+        for item, notes, family in items:
+            features = [note_feature(note) for note in notes] + [family_feature(family)]
+            for feature in features:
+                vocabulary.setdefault(feature, len(vocabulary))
+            self.items.append(item)
+            rows.append(features)
+
+        self.vocabulary = vocabulary
+        matrix = np.zeros((len(rows), len(vocabulary)), dtype=np.float32)
+        for row, features in enumerate(rows):
+            matrix[row, [vocabulary[feature] for feature in features]] = 1.0
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.matrix = matrix / np.where(norms == 0, 1, norms)
+
+        if approximate is None:
+            approximate = len(self.items) >= APPROXIMATE_THRESHOLD
+        self.n_probe = n_probe
+        self._ivf = _IVFIndex(self.matrix, n_lists=int(np.sqrt(len(self.items)))) if approximate and self.items else None
+
+    def vectorize(self, weights: Mapping[str, float]) -> np.ndarray:
+        """Vector de preferencia normalizado a partir de pesos por nota o ``familia:<nombre>``."""
+
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for feature, weight in weights.items():
+            if feature.startswith("familia:"):
+                key = family_feature(feature.split(":", 1)[1])
+            else:
+                key = note_feature(feature)
+            index = self.vocabulary.get(key)
+            if index is not None:
+                vector[index] += weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def recommend(self, weights: Mapping[str, float], k: int = 5) -> List[Recommendation[T]]:
+        """Los ``k`` elementos más parecidos a la preferencia descrita por ``weights``."""
+
+        query = self.vectorize(weights)
+        if not self.items or not query.any():
+            return []
+
+        candidates = self._ivf.candidates(query, self.n_probe) if self._ivf is not None else None
+        if candidates is not None and len(candidates):
+            similarities = self.matrix[candidates] @ query
+        else:  # sin índice, o sin candidatos en los grupos sondeados: búsqueda exhaustiva
+            candidates = None
+            similarities = self.matrix @ query
+
+        k = min(k, len(similarities))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top], kind="stable")]
+        indices = candidates[top] if candidates is not None else top
+        return [Recommendation(self.items[i], float(similarities[j])) for i, j in zip(indices.tolist(), top.tolist())]
+
+
+__all__ = ["NoteRecommender", "Recommendation", "family_feature", "note_feature"]
@@ -0,0 +1,308 @@
+"""Caché local en disco para las imágenes remotas de respaldo.
+
+Cuando falta un recurso local, la app recurre a URLs de Unsplash. Con esta caché el
+servidor descarga cada URL una sola vez y entrega la copia local; pasado
+``revalidate_after`` la revalida con ``If-None-Match``/``If-Modified-Since`` y, si la
+red falla, sigue sirviendo la copia guardada. El tamaño total está acotado y se
+descartan primero los archivos usados hace más tiempo (LRU).
+
+Desde un rerun se consulta con ``get(url, wait=False)``: las descargas y revalidaciones
+se hacen en hilos de fondo y, mientras tanto, se entrega la copia que haya (aunque esté
+vencida) o ``None``, de modo que la página usa la URL remota y nunca espera a la red.
+
+Configuración por variables de entorno:
+
+* ``PERFUME_REMOTE_CACHE=1`` activa la caché.
+* ``PERFUME_REMOTE_CACHE_DIR`` carpeta de la caché (por defecto ``static/remote``, que
+  Streamlit publica en ``app/static/remote`` con ``enableStaticServing``).
+* ``PERFUME_REMOTE_CACHE_MAX_MB`` tamaño máximo (por defecto 200).
+* ``PERFUME_OFFLINE=1`` no accede a la red: solo se usan las copias existentes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+import time
+import urllib.error
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+ENABLE_ENV_VAR = "PERFUME_REMOTE_CACHE"
+DIR_ENV_VAR = "PERFUME_REMOTE_CACHE_DIR"
+MAX_MB_ENV_VAR = "PERFUME_REMOTE_CACHE_MAX_MB"
+OFFLINE_ENV_VAR = "PERFUME_OFFLINE"
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / "static" / "remote"
+STATIC_URL_PREFIX = "app/static/remote"
+
+# Hosts que sirven páginas (reproductores) y no archivos: no tiene sentido copiarlos.
+UNCACHEABLE_HOSTS = ("youtube.com", "www.youtube.com", "youtu.be", "m.youtube.com")
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    filename: str
+    size: int
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_type: Optional[str] = None
+
+
+class RemoteCache:
+    """Caché de URLs remotas en disco con revalidación condicional y desalojo LRU."""
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = 200 * 1024 * 1024,
+        offline: bool = False,
+        revalidate_after: float = 24 * 3600,
+        retry_after: float = 300,
+        timeout: float = 5.0,
+        opener: Optional[Callable[..., object]] = None,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.revalidate_after = revalidate_after
+        self.retry_after = retry_after
+        self.timeout = timeout
+        self._opener = opener
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._entries: Dict[str, CacheEntry] = {}
+        self._touched: Dict[str, float] = {}
+        self._failures: Dict[str, float] = {}
+        self._pending: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.generation = 0  # aumenta cada vez que se guarda un archivo nuevo
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:24]
+
+    def _meta_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _load(self, key: str) -> Optional[CacheEntry]:
+        try:
+            entry = CacheEntry(**json.loads(self._meta_path(key).read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+        return entry if (self.directory / entry.filename).exists() else None
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        tmp = self.directory / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp.write_text(json.dumps(entry.__dict__), encoding="utf-8")
+        tmp.replace(self._meta_path(key))
+
+    def _touch(self, key: str) -> None:
+        """Marca la entrada como usada; el mtime de sus metadatos define el orden del LRU."""
+
+        now = time.monotonic()
+        if now - self._touched.get(key, float("-inf")) < 60:
+            return
+        self._touched[key] = now
+        try:
+            os.utime(self._meta_path(key))
+        except OSError:
+            pass
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, url: str, wait: bool = True) -> Optional[Path]:
+        """Ruta local de ``url``; ``None`` si no hay copia.
+
+        Con ``wait=True`` la descarga o revalida en el acto si hace falta. Con ``wait=False``
+        devuelve la copia que ya exista y programa la descarga en un hilo de fondo.
+        """
+
+        if urlparse(url).hostname in UNCACHEABLE_HOSTS:
+            return None
+        if wait:
+            return self._get(url)
+        key = self.key(url)
+        entry = self._entries.get(key) or self._load(key)
+        if self._needs_fetch(url, entry):
+            self._schedule(url)
+        if entry is None:
+            return None
+        self._entries[key] = entry
+        self._touch(key)
+        return self.directory / entry.filename
+
+    def _needs_fetch(self, url: str, entry: Optional[CacheEntry]) -> bool:
+        fresh = entry is not None and time.time() - entry.fetched_at < self.revalidate_after
+        recently_failed = time.monotonic() - self._failures.get(url, float("-inf")) < self.retry_after
+        return not fresh and not self.offline and not recently_failed
+
+    def _schedule(self, url: str) -> None:
+        with self._lock:
+            if url in self._pending:
+                return
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="perfume-remote")
+            future = self._executor.submit(self._get, url)
+            self._pending[url] = future
+        future.add_done_callback(lambda _: self._done(url))
+
+    def _done(self, url: str) -> None:
+        with self._lock:
+            self._pending.pop(url, None)
+
+    def wait_pending(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que terminen las descargas programadas; ``False`` si vence ``timeout``."""
+
+        from concurrent.futures import wait
+
+        with self._lock:
+            futures = list(self._pending.values())
+        return not wait(futures, timeout=timeout).not_done
+
+    def _get(self, url: str) -> Optional[Path]:
+        key = self.key(url)
+        with self._key_lock(key):
+            entry = self._entries.get(key) or self._load(key)
+            if self._needs_fetch(url, entry):
+                try:
+                    entry = self._fetch(url, key, entry)
+                    self._failures.pop(url, None)
+                except (OSError, ValueError):  # URLError y HTTPError derivan de OSError
+                    self._failures[url] = time.monotonic()
+            if entry is None:
+                return None
+            self._entries[key] = entry
+            self._touch(key)
+            return self.directory / entry.filename
+
+    def static_url(self, url: str) -> Optional[str]:
+        """URL relativa bajo la que Streamlit publica la copia local (requiere ``enableStaticServing``)."""
+
+        path = self.get(url, wait=False)
+        if path is None or path.parent.resolve() != DEFAULT_CACHE_DIR.resolve():
+            return None
+        return f"{STATIC_URL_PREFIX}/{path.name}"
+
+    def _fetch(self, url: str, key: str, cached: Optional[CacheEntry]) -> CacheEntry:
+        import urllib.request  # importación diferida: solo se necesita al descargar
+
+        request = urllib.request.Request(url, headers={"User-Agent": "el-arte-del-perfume/1.0"})
+        if cached is not None:
+            if cached.etag:
+                request.add_header("If-None-Match", cached.etag)
+            if cached.last_modified:
+                request.add_header("If-Modified-Since", cached.last_modified)
+        try:
+            response = (self._opener or urllib.request.urlopen)(request, timeout=self.timeout)
+        except urllib.error.HTTPError as error:
+            if error.code == 304 and cached is not None:
+                cached.fetched_at = time.time()
+                self._store(key, cached)
+                return cached
+            raise
+
+        with response:  # type: ignore[attr-defined]
+            if getattr(response, "status", 200) == 304 and cached is not None:
+                cached.fetched_at = time.time()
+                self._store(key, cached)
+                return cached
+            headers = response.headers  # type: ignore[attr-defined]
+            content_type = (headers.get("Content-Type") or "").split(";")[0].strip() or None
+            suffix = mimetypes.guess_extension(content_type or "") or Path(urlparse(url).path).suffix or ".bin"
+            if suffix == ".jpe":
+                suffix = ".jpg"
+            filename = f"{key}{suffix}"
+
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self.directory / f".{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+            size = 0
+            with tmp.open("wb") as handle:
+                while True:
+                    chunk = response.read(64 * 1024)  # type: ignore[attr-defined]
+                    if not chunk:
+                        break
+                    handle.write(chunk)
+                    size += len(chunk)
+            tmp.replace(self.directory / filename)
+
+        if cached is not None and cached.filename != filename:
+            (self.directory / cached.filename).unlink(missing_ok=True)
+        entry = CacheEntry(
+            url=url,
+            filename=filename,
+            size=size,
+            fetched_at=time.time(),
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            content_type=content_type,
+        )
+        self._store(key, entry)
+        with self._lock:
+            self.generation += 1
+        self._evict()
+        return entry
+
+    def _evict(self) -> None:
+        """Borra las entradas usadas hace más tiempo hasta respetar ``max_bytes``."""
+
+        entries = []
+        for meta in self.directory.glob("*.json"):
+            entry = self._load(meta.stem)
+            if entry is None:
+                continue
+            try:
+                last_used = meta.stat().st_mtime
+            except OSError:
+                continue
+            entries.append((last_used, meta.stem, entry))
+
+        total = sum(entry.size for _, _, entry in entries)
+        for _, key, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            (self.directory / entry.filename).unlink(missing_ok=True)
+            self._meta_path(key).unlink(missing_ok=True)
+            self._entries.pop(key, None)
+            total -= entry.size
+
+
+_default_cache: Optional[RemoteCache] = None
+_default_lock = threading.Lock()
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def get_remote_cache() -> Optional[RemoteCache]:
+    """Caché configurada por variables de entorno, o ``None`` si está desactivada."""
+
+    global _default_cache
+    if not _env_flag(ENABLE_ENV_VAR):
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = RemoteCache(
+                Path(os.environ.get(DIR_ENV_VAR, DEFAULT_CACHE_DIR)),
+                max_bytes=int(float(os.environ.get(MAX_MB_ENV_VAR, "200")) * 1024 * 1024),
+                offline=_env_flag(OFFLINE_ENV_VAR),
+            )
+        return _default_cache
+
+
+__all__ = ["CacheEntry", "RemoteCache", "get_remote_cache"]
@@ -0,0 +1,93 @@
+"""Motor de puntuación vectorizado para el test olfativo."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Orden de prioridad de las familias: en caso de empate gana la que aparece primero.
+FAMILY_ORDER: Tuple[str, ...] = ("fresco", "floral", "oriental", "amaderado")
+
+
+class QuizScorer:
+    """Representa el test como una matriz de pesos pregunta × opción × familia.
+
+    Cada pregunta debe exponer ``opciones`` (clave de opción -> texto) y, opcionalmente,
+    ``pesos`` (clave de opción -> {familia: peso}). Sin pesos explícitos cada opción suma
+    1 punto a la familia con su mismo nombre. Las respuestas desconocidas no puntúan.
+    """
+
+    def __init__(self, questions: Sequence[object], families: Sequence[str] = FAMILY_ORDER) -> None:
+        self.families: Tuple[str, ...] = tuple(families)
+        self.options: List[Tuple[str, ...]] = [tuple(q.opciones) for q in questions]  # type: ignore[attr-defined]
+
+        n_options = max((len(opts) for opts in self.options), default=0)
+        family_index = {family: idx for idx, family in enumerate(self.families)}
+        # La última columna de opciones queda a cero y recoge respuestas ausentes o inválidas.
+        weights = np.zeros((len(self.options), n_options + 1, len(self.families)), dtype=np.float64)
+        for q_idx, question in enumerate(questions):
+            custom: Optional[Mapping[str, Mapping[str, float]]] = getattr(question, "pesos", None)
+            for o_idx, option in enumerate(self.options[q_idx]):
+                option_weights = custom.get(option, {}) if custom else {option: 1.0}
+                for family, weight in option_weights.items():
+                    if family in family_index:
+                        weights[q_idx, o_idx, family_index[family]] = weight
+        self.weights = weights
+        self._missing = n_options
+        self._lookup = [{option: idx for idx, option in enumerate(opts)} for opts in self.options]
+        self._outcomes: Optional[Dict[Tuple[str, ...], str]] = None
+
+    def encode(self, responses: Iterable[Sequence[str]]) -> np.ndarray:
+        """Convierte respuestas (claves de opción por pregunta) en una matriz de índices."""
+
+        rows = [
+            [self._lookup[q].get(answer, self._missing) for q, answer in enumerate(response[: len(self._lookup)])]
+            + [self._missing] * (len(self._lookup) - len(response))
+            for response in responses
+        ]
+        return np.asarray(rows, dtype=np.intp).reshape(-1, len(self._lookup))
+
+    def score_indices(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Puntúa una matriz de índices (N × preguntas).
+
+        Devuelve los puntajes (N × familias), el índice de la familia ganadora y si hubo empate.
+        El empate se resuelve de forma explícita según el orden de ``families``.
+        """
+
+        question_idx = np.arange(indices.shape[1])
+        scores = self.weights[question_idx, indices].sum(axis=1)
+        best = scores.max(axis=1, keepdims=True)
+        is_best = np.isclose(scores, best)
+        winners = is_best.argmax(axis=1)
+        ties = is_best.sum(axis=1) > 1
+        return scores, winners, ties
+
+    def score_batch(self, responses: Iterable[Sequence[str]]) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """Puntúa muchas respuestas a la vez; devuelve puntajes, familias ganadoras y empates."""
+
+        scores, winners, ties = self.score_indices(self.encode(responses))
+        return scores, [self.families[idx] for idx in winners], ties
+
+    def score(self, response: Sequence[str]) -> Tuple[Dict[str, float], str, bool]:
+        """Puntúa una única respuesta."""
+
+        scores, winners, ties = self.score_batch([response])
+        return dict(zip(self.families, scores[0].tolist())), winners[0], bool(ties[0])
+
+    def outcome_table(self) -> Dict[Tuple[str, ...], str]:
+        """Familia ganadora para todas las combinaciones posibles de respuestas (se calcula una vez)."""
+
+        if self._outcomes is None:
+            shape = tuple(len(opts) for opts in self.options)
+            indices = np.indices(shape).reshape(len(shape), -1).T
+            _, winners, _ = self.score_indices(indices)
+            self._outcomes = {
+                tuple(self.options[q][o] for q, o in enumerate(row)): self.families[winner]
+                for row, winner in zip(indices.tolist(), winners.tolist())
+            }
+        return self._outcomes
+
+
+__all__ = ["FAMILY_ORDER", "QuizScorer"]
@@ -0,0 +1,168 @@
+"""Índice invertido en memoria para la búsqueda de la barra lateral.
+
+La normalización ignora mayúsculas y acentos ("Cítrica" coincide con "citrica"), el último
+término de la consulta se busca por prefijo y los resultados se ordenan con una
+puntuación TF-IDF que favorece las coincidencias en el título. El índice admite altas,
+bajas y modificaciones de documentos sin reconstruirse.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"\w+")
+
+STOPWORDS = frozenset(
+    "a al como con de del el en es la las lo los para por que se su sus un una y o e u".split()
+)
+
+TITLE_WEIGHT = 3
+PREFIX_FACTOR = 0.5
+
+
+def normalize(text: str) -> str:
+    """Pasa a minúsculas y elimina los acentos."""
+
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    """Divide el texto en términos normalizados, sin palabras vacías."""
+
+    return [token for token in _TOKEN_RE.findall(normalize(text)) if token not in STOPWORDS]
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    id: str
+    titulo: str
+    texto: str
+    categoria: str
+    pagina: str
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    document: SearchDocument
+    score: float
+
+
+class SearchIndex:
+    """Índice invertido con actualización incremental, seguro entre hilos."""
+
+    def __init__(self, documents: Iterable[SearchDocument] = ()) -> None:
+        self._lock = threading.RLock()
+        self._documents: Dict[str, SearchDocument] = {}
+        self._term_freqs: Dict[str, Counter] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._terms: List[str] = []
+        for document in documents:
+            self.add(document)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._documents
+
+    def get(self, doc_id: str) -> Optional[SearchDocument]:
+        return self._documents.get(doc_id)
+
+    def add(self, document: SearchDocument) -> None:
+        """Indexa un documento, reemplazando la versión anterior si ya existía."""
+
+        freqs: Counter = Counter()
+        for token in tokenize(document.titulo):
+            freqs[token] += TITLE_WEIGHT
+        freqs.update(tokenize(document.texto))
+
+        with self._lock:
+            self.remove(document.id)
+            self._documents[document.id] = document
+            self._term_freqs[document.id] = freqs
+            for term, count in freqs.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    insort(self._terms, term)
+                postings[document.id] = count
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock:
+            freqs = self._term_freqs.pop(doc_id, None)
+            self._documents.pop(doc_id, None)
+            if not freqs:
+                return
+            for term in freqs:
+                postings = self._postings[term]
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+                    del self._terms[bisect_left(self._terms, term)]
+
+    def _expand(self, token: str, prefix: bool) -> List[Tuple[str, float]]:
+        """Términos del índice que coinciden con ``token`` y el factor de cada coincidencia."""
+
+        matches = [(token, 1.0)] if token in self._postings else []
+        if prefix:
+            start = bisect_left(self._terms, token)
+            for term in self._terms[start:]:
+                if not term.startswith(token):
+                    break
+                if term != token:
+                    matches.append((term, PREFIX_FACTOR))
+        return matches
+
+    def search(self, query: str, limit: int = 10) -> List[SearchResult]:
+        """Documentos que contienen todos los términos de la consulta, ordenados por relevancia."""
+
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            total = len(self._documents)
+            scores: Optional[Dict[str, float]] = None
+            for position, token in enumerate(tokens):
+                is_last = position == len(tokens) - 1
+                token_scores: Dict[str, float] = {}
+                for term, factor in self._expand(token, prefix=is_last):
+                    postings = self._postings[term]
+                    idf = math.log(1 + total / len(postings))
+                    for doc_id, count in postings.items():
+                        token_scores[doc_id] = token_scores.get(doc_id, 0.0) + count * idf * factor
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {doc_id: score + token_scores[doc_id] for doc_id, score in scores.items() if doc_id in token_scores}
+                if not scores:
+                    return []
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+            return [SearchResult(self._documents[doc_id], score) for doc_id, score in ranked]
+
+    def sync(self, documents: Iterable[SearchDocument]) -> int:
+        """Ajusta el índice a ``documents`` tocando solo lo que cambió; devuelve los cambios."""
+
+        incoming = {document.id: document for document in documents}
+        changes = 0
+        with self._lock:
+            for doc_id in [doc_id for doc_id in self._documents if doc_id not in incoming]:
+                self.remove(doc_id)
+                changes += 1
+            for doc_id, document in incoming.items():
+                if self._documents.get(doc_id) != document:
+                    self.add(document)
+                    changes += 1
+        return changes
+
+
+__all__ = ["SearchDocument", "SearchIndex", "SearchResult", "normalize", "tokenize"]
@@ -0,0 +1,166 @@
+"""Caché de artefactos compartida entre los procesos de Streamlit de una misma máquina.
+
+Cuando varias réplicas corren detrás de un balanceador, cada una construiría por su
+cuenta las mismas tablas, modelos y fragmentos HTML. Con esta caché el primer proceso
+que construye un artefacto lo publica en disco y el resto lo reutiliza:
+
+* Las claves llevan versión (fuentes del catálogo, ``CACHE_VERSION`` de los constructores
+  y versión de Python), así que un cambio en cualquiera de ellas publica un archivo nuevo.
+* La publicación es atómica: se escribe un temporal y se renombra; los lectores nunca
+  ven un archivo a medias y las versiones antiguas se borran tras publicar la nueva.
+* Un cerrojo de archivo por artefacto hace que, si dos réplicas arrancan a la vez, una
+  construya y la otra espere a leer el resultado.
+* Los datos se serializan con pickle 5 y los búferes grandes (arrays de NumPy, columnas
+  de pandas) quedan fuera de banda, alineados en el archivo. Al cargarlos se mapean en
+  memoria de solo lectura, de modo que todas las réplicas comparten las mismas páginas
+  de la caché del sistema en lugar de tener cada una su copia.
+
+Se activa con ``PERFUME_SHARED_CACHE=1``; ``PERFUME_SHARED_CACHE_DIR`` cambia la
+carpeta (por defecto ``data/shared_cache``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import pickle
+import re
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Callable, List, Optional, TypeVar
+
+try:  # los cerrojos entre procesos solo están disponibles en sistemas POSIX
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+ENABLE_ENV_VAR = "PERFUME_SHARED_CACHE"
+DIR_ENV_VAR = "PERFUME_SHARED_CACHE_DIR"
+DEFAULT_CACHE_DIR = Path(__file__).parent / "data" / "shared_cache"
+
+T = TypeVar("T")
+
+_MAGIC = b"PERFUMEC1\n"
+_ALIGN = 64
+_SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def dump(obj: object, path: Path) -> None:
+    """Escribe ``obj`` con los búferes fuera de banda alineados y publica el archivo de forma atómica."""
+
+    buffers: List[pickle.PickleBuffer] = []
+    payload = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    raws = [buffer.raw() for buffer in buffers]
+
+    header = _MAGIC + struct.pack("<QI", len(payload), len(raws)) + b"".join(struct.pack("<Q", raw.nbytes) for raw in raws)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with tmp.open("wb") as handle:
+        position = 0
+        for chunk in [header, payload, *raws]:
+            padding = _aligned(position) - position
+            handle.write(b"\0" * padding)
+            handle.write(chunk)
+            position += padding + memoryview(chunk).nbytes
+        handle.flush()
+        os.fsync(handle.fileno())
+    tmp.replace(path)
+
+
+def load(path: Path) -> Any:
+    """Lee un archivo escrito por :func:`dump`; los búferes quedan mapeados en memoria."""
+
+    with path.open("rb") as handle:
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    if bytes(view[: len(_MAGIC)]) != _MAGIC:
+        raise ValueError(f"formato desconocido: {path}")
+    position = len(_MAGIC)
+    payload_size, count = struct.unpack_from("<QI", view, position)
+    position += struct.calcsize("<QI")
+    sizes = struct.unpack_from(f"<{count}Q", view, position)
+    position = _aligned(position + 8 * count)
+    payload = view[position : position + payload_size]
+    position += payload_size
+    buffers = []
+    for size in sizes:
+        position = _aligned(position)
+        buffers.append(view[position : position + size])
+        position += size
+    return pickle.loads(payload, buffers=buffers)
+
+
+class SharedCache:
+    """Artefactos versionados en una carpeta compartida por los procesos de la máquina."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, name: str, version: str) -> tuple:
+        safe = _SAFE_NAME_RE.sub("_", name)
+        digest = hashlib.sha256(version.encode("utf-8")).hexdigest()[:16]
+        return self.directory / f"{safe}.{digest}.bin", self.directory / f"{safe}.lock", safe
+
+    def get(self, name: str, version: str) -> Optional[Any]:
+        path, _, _ = self._paths(name, version)
+        try:
+            return load(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+            path.unlink(missing_ok=True)  # archivo dañado: se reconstruye
+            return None
+
+    def get_or_build(self, name: str, version: str, build: Callable[[], T]) -> T:
+        """Devuelve el artefacto publicado o lo construye y publica, una sola vez por máquina."""
+
+        cached = self.get(name, version)
+        if cached is not None:
+            return cached
+        path, lock_path, safe = self._paths(name, version)
+        with lock_path.open("a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                cached = self.get(name, version)  # otra réplica pudo publicarlo mientras esperábamos
+                if cached is not None:
+                    return cached
+                value = build()
+                try:
+                    dump(value, path)
+                except (pickle.PicklingError, TypeError, AttributeError, OSError):
+                    return value  # no serializable o disco lleno: se usa solo en este proceso
+                for stale in self.directory.glob(f"{safe}.*.bin"):
+                    if stale != path:
+                        stale.unlink(missing_ok=True)
+                # Se devuelve la copia mapeada para que este proceso también comparta las páginas.
+                shared = self.get(name, version)
+                return value if shared is None else shared
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+_cache: Optional[SharedCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> Optional[SharedCache]:
+    """Caché configurada por variables de entorno, o ``None`` si está desactivada."""
+
+    global _cache
+    if os.environ.get(ENABLE_ENV_VAR, "").strip().lower() not in {"1", "true", "yes", "on"}:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SharedCache(Path(os.environ.get(DIR_ENV_VAR, DEFAULT_CACHE_DIR)))
+        return _cache
+
+
+__all__ = ["SharedCache", "dump", "get_shared_cache", "load"]
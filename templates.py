@@ -0,0 +1,169 @@
+"""Plantillas HTML/CSS precompiladas para los fragmentos que se inyectan con ``st.markdown``.
+
+Las hojas de estilo y las plantillas se minifican una sola vez por proceso; en cada
+rerun solo se sustituyen los valores variables (``$nombre``, con ``string.Template``).
+Los valores se escapan salvo que se marquen como :class:`Markup`.
+
+Streamlit elimina de la página los elementos que un rerun no vuelve a emitir, así que
+los estilos compartidos se envían en cada rerun, pero en un único bloque ya minificado
+y construido de antemano.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from html import escape
+from string import Template
+from typing import Dict, Iterable
+
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE_RE = re.compile(r"\s*([{}:;,>])\s*")
+_SPACE_RE = re.compile(r"\s+")
+# Bloques cuyo espacio en blanco es contenido (se copian tal cual) y etiquetas sueltas,
+# cuyos valores de atributo entre comillas tampoco se tocan.
+_HTML_TOKEN_RE = re.compile(r"""<(pre|textarea)\b.*?</\1\s*>|<(?:"[^"]*"|'[^']*'|[^'">])*>""", re.S | re.I)
+_QUOTED_RE = re.compile(r"""("[^"]*"|'[^']*')""")
+
+
+def minify_css(css: str) -> str:
+    css = _CSS_COMMENT_RE.sub("", css)
+    css = _SPACE_RE.sub(" ", css)
+    css = _CSS_SPACE_RE.sub(r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def _minify_text(text: str) -> str:
+    return "" if text.isspace() else _SPACE_RE.sub(" ", text)
+
+
+def _minify_tag(tag: str) -> str:
+    parts = _QUOTED_RE.split(tag)  # las posiciones impares son valores entre comillas
+    return "".join(part if index % 2 else _SPACE_RE.sub(" ", part) for index, part in enumerate(parts))
+
+
+def minify_html(html: str) -> str:
+    """Colapsa espacios entre etiquetas y en el texto; las hojas ``<style>`` internas se minifican como CSS.
+
+    El contenido de ``<pre>`` y ``<textarea>`` y los valores de atributo entre comillas se
+    conservan tal cual.
+    """
+
+    html = re.sub(r"(<style>)(.*?)(</style>)", lambda m: m[1] + minify_css(m[2]) + m[3], html, flags=re.S)
+    pieces = []
+    position = 0
+    for match in _HTML_TOKEN_RE.finditer(html):
+        pieces.append(_minify_text(html[position : match.start()]))
+        pieces.append(match[0] if match[1] else _minify_tag(match[0]))
+        position = match.end()
+    pieces.append(_minify_text(html[position:]))
+    return "".join(pieces).strip()
+
+
+class Markup(str):
+    """Texto HTML de confianza que las plantillas insertan sin escapar."""
+
+
+class HtmlTemplate:
+    """Plantilla minificada al crearla; ``render`` solo sustituye los valores."""
+
+    def __init__(self, source: str) -> None:
+        self.template = Template(minify_html(source))
+
+    def render(self, **values: object) -> Markup:
+        return Markup(
+            self.template.substitute(
+                {name: value if isinstance(value, Markup) else escape(str(value)) for name, value in values.items()}
+            )
+        )
+
+    def render_many(self, rows: Iterable[Dict[str, object]]) -> Markup:
+        return Markup("".join(self.render(**row) for row in rows))
+
+
+STYLESHEETS: Dict[str, str] = {
+    "hero": """
+        .hero {
+            position: relative;
+            padding: 4rem 2rem;
+            color: white;
+            border-radius: 1.5rem;
+            background: linear-gradient(135deg, rgba(231, 76, 60, 0.7), rgba(155, 89, 182, 0.7)),
+                        var(--hero-background) center/cover;
+            box-shadow: 0 20px 40px rgba(0,0,0,0.25);
+        }
+        .hero h1 {
+            font-size: 3.2rem;
+            margin-bottom: 0.5rem;
+            animation: fadeDown 1.2s ease-in-out;
+        }
+        .hero p {
+            font-size: 1.2rem;
+            max-width: 720px;
+            animation: fadeUp 1.4s ease-in-out;
+        }
+        @keyframes fadeDown {
+            from {opacity: 0; transform: translateY(-25px);} to {opacity: 1; transform: translateY(0);}
+        }
+        @keyframes fadeUp {
+            from {opacity: 0; transform: translateY(25px);} to {opacity: 1; transform: translateY(0);}
+        }
+    """,
+    "timeline": """
+        .timeline {font-family: 'Helvetica', sans-serif; margin-top: 1rem;}
+        .timeline-item {border-left: 3px solid #f39c12; padding-left: 1rem; margin-bottom: 1rem;}
+        .timeline-year {font-weight: bold; color: #d35400;}
+        .timeline-desc {margin: 0.25rem 0 0 0; color: #2c3e50;}
+    """,
+}
+
+
+@lru_cache(maxsize=None)
+def stylesheet(*names: str) -> Markup:
+    """Bloque ``<style>`` minificado con las hojas indicadas, construido una vez por proceso."""
+
+    return Markup(f"<style>{''.join(minify_css(STYLESHEETS[name]) for name in names)}</style>")
+
+
+HERO = HtmlTemplate(
+    """
+    <div class="hero" style="--hero-background: url('$background')">
+        <h1>$titulo</h1>
+        <p>$texto</p>
+    </div>
+    """
+)
+
+TIMELINE = HtmlTemplate('<div class="timeline">$styles$items</div>')
+
+TIMELINE_ITEM = HtmlTemplate(
+    """
+    <div class="timeline-item">
+        <div class="timeline-year">$anio · $titulo</div>
+        <p class="timeline-desc">$descripcion</p>
+    </div>
+    """
+)
+
+RECOMMENDATION = HtmlTemplate(
+    """
+    <p>
+        <strong>$nombre</strong> · $tipo · afinidad $afinidad<br>
+        <small>$notas</small>
+    </p>
+    """
+)
+
+
+__all__ = [
+    "HERO",
+    "HtmlTemplate",
+    "Markup",
+    "RECOMMENDATION",
+    "STYLESHEETS",
+    "TIMELINE",
+    "TIMELINE_ITEM",
+    "minify_css",
+    "minify_html",
+    "stylesheet",
+]
@@ -0,0 +1,8 @@
+"""Los módulos de la aplicación viven en la raíz del repositorio, junto a ``app.py``."""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
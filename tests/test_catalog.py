@@ -0,0 +1,82 @@
+import sqlite3
+
+import pytest
+
+import catalog
+
+
+@pytest.fixture(autouse=True)
+def _catalog_db(tmp_path, monkeypatch):
+    monkeypatch.setenv(catalog.DB_ENV_VAR, str(tmp_path / "catalog.sqlite"))
+    monkeypatch.setattr(catalog, "_local", type(catalog._local)())
+
+
+def test_featured_perfumes_keep_the_curated_examples():
+    assert [perfume.nombre for perfume in catalog.featured_perfumes("Eau de Toilette")] == ["Acqua di Gio", "CH 212"]
+    assert [perfume.nombre for perfume in catalog.featured_perfumes("Body Mist")] == [
+        "Victoria's Secret Love Spell",
+        "Bath & Body Works Gingham",
+    ]
+
+
+def test_featured_perfumes_prefer_flagged_rows_then_catalog_order():
+    catalog.build_catalog(
+        catalog.db_path(),
+        [
+            ("Uno", "A", "Eau de Parfum", "Floral", "", "", ""),
+            ("Dos", "A", "Eau de Parfum", "Floral", "", "", "1"),
+            ("Tres", "A", "Eau de Parfum", "Floral"),
+        ],
+    )
+    assert [perfume.nombre for perfume in catalog.featured_perfumes("Eau de Parfum")] == ["Dos", "Uno"]
+
+
+def test_connection_follows_a_rebuilt_database():
+    before = catalog.catalog_version()
+    assert catalog.query_perfumes(tipo="Body Mist").total == 2
+
+    catalog.build_catalog(catalog.db_path(), [("Nuevo", "Marca", "Body Mist", "Floral")])
+
+    assert catalog.catalog_version() != before
+    assert [perfume.nombre for perfume in catalog.query_perfumes(tipo="Body Mist").items] == ["Nuevo"]
+
+
+def _old_database(columns, rows, version=2):
+    conn = sqlite3.connect(catalog.db_path())
+    try:
+        conn.execute(f"CREATE TABLE perfumes (id INTEGER PRIMARY KEY, {', '.join(columns)})")
+        placeholders = ", ".join("?" for _ in columns)
+        conn.executemany(f"INSERT INTO perfumes ({', '.join(columns)}) VALUES ({placeholders})", rows)
+        conn.execute(f"PRAGMA user_version = {version}")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_imported_catalog_survives_a_schema_bump():
+    _old_database(
+        ["nombre", "marca", "tipo", "familia", "concentracion", "notas"],
+        [("Importado", "Casa", "Eau de Parfum", "Floral", 18.0, "rosa"), ("Otro", "Casa", "Body Mist", "Cítrica", None, "")],
+    )
+
+    assert [(p.nombre, p.concentracion, p.notas) for p in catalog.iter_perfumes()] == [
+        ("Importado", 18.0, "rosa"),
+        ("Otro", catalog.TYPICAL_CONCENTRATION["Body Mist"], ""),
+    ]
+
+
+def test_old_seed_catalog_gets_the_curated_examples_back():
+    _old_database(
+        ["nombre", "marca", "tipo", "familia", "notas"],
+        [record[:5] for record in reversed(catalog.SEED_PERFUMES)],
+    )
+    assert [perfume.nombre for perfume in catalog.featured_perfumes("Eau de Toilette")] == ["Acqua di Gio", "CH 212"]
+
+
+def test_unusable_catalog_fails_loudly_and_is_kept():
+    _old_database(["nombre", "tipo"], [("Importado", "Eau de Parfum")])
+    before = catalog.db_path().read_bytes()
+
+    with pytest.raises(catalog.CatalogError, match="--import"):
+        catalog.query_perfumes()
+    assert catalog.db_path().read_bytes() == before
@@ -0,0 +1,152 @@
+import socketserver
+import sqlite3
+import threading
+import time
+from email import message_from_bytes
+
+import pytest
+
+from contact import ContactMessage, ContactPipeline, SMTPNotifier
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Servidor SMTP mínimo: acepta cada mensaje salvo los que se le pida rechazar."""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        self.reply("220 stand-in")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 stand-in")
+            elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 fin con <CRLF>.<CRLF>")
+                lines = []
+                while True:
+                    data = self.rfile.readline()
+                    if data in (b".\r\n", b""):
+                        break
+                    lines.append(data)
+                with server.lock:
+                    server.attempts += 1
+                    rejected = server.attempts in server.reject
+                    if not rejected:
+                        server.messages.append(message_from_bytes(b"".join(lines)))
+                self.reply("451 rechazado" if rejected else "250 entregado")
+            elif command == "QUIT":
+                self.reply("221 adiós")
+                return
+            else:
+                self.reply("502 no implementado")
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.messages = []
+    server.attempts = 0
+    server.reject = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _message(number, creado=None):
+    options = {} if creado is None else {"creado": creado}
+    return ContactMessage(f"Persona {number}", f"p{number}@example.com", "Consulta general", f"Mensaje número {number}", **options)
+
+
+def _pipeline(tmp_path, smtp_server, **options):
+    notifier = SMTPNotifier("127.0.0.1", smtp_server.server_address[1], timeout=5)
+    return ContactPipeline(tmp_path / "contact.sqlite", notifier=notifier, flush_interval=0.05, **options)
+
+
+def _notified(tmp_path):
+    conn = sqlite3.connect(tmp_path / "contact.sqlite")
+    try:
+        return dict(conn.execute("SELECT nombre, notificado FROM contact_messages"))
+    finally:
+        conn.close()
+
+
+def test_messages_are_stored_and_mailed(tmp_path, smtp_server):
+    pipeline = _pipeline(tmp_path, smtp_server, workers=1)
+    for number in range(3):
+        assert pipeline.submit(_message(number))
+    pipeline.close()
+
+    assert sorted(mail["Reply-To"] for mail in smtp_server.messages) == [f"p{n}@example.com" for n in range(3)]
+    assert _notified(tmp_path) == {f"Persona {n}": 1 for n in range(3)}
+
+
+def test_retry_after_partial_failure_only_sends_the_rest(tmp_path, smtp_server):
+    smtp_server.reject = {2}  # el servidor rechaza el segundo correo una sola vez
+    pipeline = _pipeline(tmp_path, smtp_server, workers=1, max_batch=10)
+    for number in range(3):
+        pipeline.submit(_message(number))
+    pipeline.close()
+
+    delivered = [mail["Reply-To"] for mail in smtp_server.messages]
+    assert sorted(delivered) == [f"p{n}@example.com" for n in range(3)]
+    assert len(delivered) == len(set(delivered)), "ningún correo se envía dos veces"
+    assert _notified(tmp_path) == {f"Persona {n}": 1 for n in range(3)}
+
+
+def test_unnotified_rows_are_requeued_on_startup(tmp_path, smtp_server):
+    smtp_server.reject = {1, 2, 3, 4, 5, 6}  # agota los reintentos del primer proceso
+    first = _pipeline(tmp_path, smtp_server, workers=1)
+    first._writer.max_retries = 1
+    first.submit(_message(0, creado=time.time() - 3600))
+    first.close()
+    assert _notified(tmp_path) == {"Persona 0": 0}
+
+    smtp_server.reject = set()
+    second = _pipeline(tmp_path, smtp_server, workers=1)
+    second._requeue_thread.join()
+    second.close()
+
+    assert [mail["Reply-To"] for mail in smtp_server.messages] == ["p0@example.com"]
+    assert _notified(tmp_path) == {"Persona 0": 1}
+
+
+def test_recent_unnotified_rows_are_left_to_their_own_process(tmp_path, smtp_server):
+    smtp_server.reject = {1, 2}
+    first = _pipeline(tmp_path, smtp_server, workers=1)
+    first._writer.max_retries = 1
+    first.submit(_message(0))
+    first.close()
+
+    second = _pipeline(tmp_path, smtp_server, workers=1, requeue_after=60)
+    second.close()
+    assert smtp_server.messages == []
+
+
+def test_submit_never_blocks_when_the_queue_is_full(tmp_path):
+    release = threading.Event()
+
+    class BlockingNotifier:
+        def send(self, messages, on_sent=None):
+            release.wait(5)
+
+    pipeline = ContactPipeline(tmp_path / "contact.sqlite", notifier=BlockingNotifier(), workers=1, max_queue=1, max_batch=1)
+    try:
+        accepted = [pipeline.submit(_message(number)) for number in range(5)]
+        start = time.monotonic()
+        assert not pipeline.submit(_message(99))
+        assert time.monotonic() - start < 0.05
+        assert not all(accepted)
+    finally:
+        release.set()
+        pipeline.close()
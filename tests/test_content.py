@@ -0,0 +1,74 @@
+import shutil
+
+import pytest
+
+from content import DEFAULT_SOURCE_DIR, ContentError, ContentStore, compile_content
+
+
+@pytest.fixture
+def source(tmp_path):
+    directory = tmp_path / "content"
+    shutil.copytree(DEFAULT_SOURCE_DIR, directory)
+    return directory
+
+
+def _append_event(source, text):
+    with (source / "historia.yaml").open("a", encoding="utf-8") as handle:
+        handle.write(text)
+
+
+def test_shipped_content_is_valid():
+    snapshot = compile_content(DEFAULT_SOURCE_DIR)
+    assert [event["anio"] for event in snapshot["historia"]] == [1921, 1957, 1992, 2013]
+
+
+def test_unknown_fields_are_rejected(source):
+    _append_event(source, "- anio: 1889\n  titulo: Jicky\n  descripcion: Guerlain\n  famlia: Aromática\n")
+
+    with pytest.raises(ContentError, match=r"historia.yaml \[5\]: campos desconocidos famlia"):
+        compile_content(source)
+
+
+def test_boolean_years_are_rejected(source):
+    _append_event(source, "- anio: yes\n  titulo: Jicky\n  descripcion: Guerlain\n")
+
+    with pytest.raises(ContentError, match=r"historia.yaml \[5\]: el año debe ser un número entero"):
+        compile_content(source)
+
+
+def test_invalid_edit_keeps_the_previous_snapshot(source, tmp_path):
+    store = ContentStore(source, tmp_path / "content.pickle")
+    previous = store.get()
+    _append_event(source, "- anio: 1889\n  titulo: Jicky\n")
+
+    assert not store.reload()
+    assert store.get() is previous
+
+
+def test_files_that_are_not_utf8_are_reported_with_the_other_errors(source):
+    (source / "curiosidades.yaml").write_bytes("- titulo: Ámbar\n  descripcion: Resina\n".encode("latin-1"))
+    (source / "tipos.yaml").unlink()
+
+    with pytest.raises(ContentError) as excinfo:
+        compile_content(source)
+    assert str(excinfo.value).splitlines() == [
+        "tipos.yaml: No such file or directory",
+        "curiosidades.yaml: no está codificado en UTF-8 (byte 10)",
+    ]
+
+
+@pytest.mark.parametrize(
+    "question, message",
+    [
+        ("  opciones: [fresco, floral]\n", "opciones debe ser un diccionario"),
+        ("  opciones: {fresco: Fresco}\n  pesos: [1]\n", "pesos debe ser un diccionario"),
+        ("  opciones: {fresco: Fresco}\n  pesos: {fresco: 1}\n", "pesos no válidos para 'fresco'"),
+        ("  opciones: {fresco: Fresco}\n  pesos: {fresco: {floral: mucho}}\n", "pesos no válidos para 'fresco'"),
+    ],
+)
+def test_malformed_options_and_weights_are_content_errors(source, question, message):
+    with (source / "preguntas.yaml").open("a", encoding="utf-8") as handle:
+        handle.write("- pregunta: ¿Nueva?\n" + question)
+
+    with pytest.raises(ContentError, match=rf"preguntas.yaml \[\d+\]: {message}"):
+        compile_content(source)
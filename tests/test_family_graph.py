@@ -0,0 +1,47 @@
+import xml.etree.ElementTree as ET
+
+import family_graph
+from family_graph import Edge, FamilyGraph, render_svg
+
+GRAPH = FamilyGraph(
+    [
+        Edge("Floral", "Oriental"),
+        Edge("Floral", "Aromática"),
+        Edge("Cítrica", "Aromática"),
+        Edge("Oriental", "Amaderada"),
+        Edge("Oriental", "Gourmand", "subfamilia"),
+        Edge("Aromática", "Fougere", "mezcla <clásica>"),
+    ]
+)
+
+
+def test_neighbors_follow_both_directions():
+    assert GRAPH.neighbors("Oriental") == ["Amaderada", "Gourmand", "Floral"]
+    assert GRAPH.neighbors("Aromática") == ["Fougere", "Floral", "Cítrica"]
+    assert GRAPH.neighbors("Cuero") == []
+
+
+def test_shortest_path_uses_the_fewest_hops():
+    assert GRAPH.shortest_path("Cítrica", "Gourmand") == ["Cítrica", "Aromática", "Floral", "Oriental", "Gourmand"]
+    assert GRAPH.shortest_path("Floral", "Floral") == ["Floral"]
+    assert GRAPH.shortest_path("Floral", "Fougere", directed=True) == ["Floral", "Aromática", "Fougere"]
+
+
+def test_unreachable_or_unknown_nodes_have_no_path():
+    assert GRAPH.shortest_path("Gourmand", "Floral", directed=True) is None
+    assert GRAPH.shortest_path("Floral", "Cuero") is None
+    assert FamilyGraph([Edge("A", "B"), Edge("C", "D")]).shortest_path("A", "D") is None
+
+
+def test_svg_fallback_without_graphviz(tmp_path, monkeypatch):
+    monkeypatch.setattr(family_graph.shutil, "which", lambda name: None)
+
+    path = render_svg(GRAPH, tmp_path)
+
+    root = ET.fromstring(path.read_text(encoding="utf-8"))  # SVG bien formado, etiquetas escapadas
+    texts = [element.text for element in root.iter("{http://www.w3.org/2000/svg}text")]
+    assert set(GRAPH.nodes) <= set(texts)
+    assert "mezcla <clásica>" in texts
+    assert len(list(root.iter("{http://www.w3.org/2000/svg}line"))) == len(GRAPH.edges)
+    assert path.name == f"familias-{GRAPH.content_hash()}.svg"
+    assert render_svg(GRAPH, tmp_path) == path  # segunda llamada: desde la caché
@@ -0,0 +1,88 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+import utils
+
+Image = pytest.importorskip("PIL.Image")
+
+CHROME = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+OLD_SAFARI = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/13.1.2 Safari/605.1.15"
+SAFARI = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15"
+OLD_EDGE = "Mozilla/5.0 (Windows NT 10.0) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/64.0.3282.140 Safari/537.36 Edge/17.17134"
+IE = "Mozilla/5.0 (Windows NT 10.0; Trident/7.0; rv:11.0) like Gecko"
+
+
+@pytest.fixture
+def photo(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "DERIVATIVES_DIR", tmp_path / "derivados")
+    utils._image_derivative.cache_clear()
+    path = tmp_path / "esencia.jpg"
+    Image.new("RGB", (1200, 800), (200, 120, 90)).save(path)
+    yield path
+    utils._image_derivative.cache_clear()
+
+
+def test_derivatives_are_written_in_both_formats(photo):
+    jpeg, webp = utils._image_derivative(str(photo), photo.stat().st_mtime_ns, 600)
+
+    with Image.open(jpeg) as image:
+        assert (image.format, image.size) == ("JPEG", (600, 400))
+    with Image.open(webp) as image:
+        assert (image.format, image.size) == ("WEBP", (600, 400))
+
+    utils._image_derivative.cache_clear()  # otro proceso reutiliza los archivos del disco
+    assert utils._image_derivative(str(photo), photo.stat().st_mtime_ns, 600) == (jpeg, webp)
+
+
+def test_concurrent_cold_requests_share_one_build(photo):
+    barrier = threading.Barrier(8)
+    results, errors = [], []
+
+    def request():
+        barrier.wait()
+        try:
+            # sin lru_cache, como varias réplicas o sesiones que llegan a la vez
+            results.append(utils._image_derivative.__wrapped__(str(photo), photo.stat().st_mtime_ns, 600))
+        except Exception as error:  # noqa: BLE001 - cualquier error es un fallo del test
+            errors.append(error)
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(set(results)) == 1 and results[0][1] is not None
+    assert sorted(path.suffix for path in utils.DERIVATIVES_DIR.iterdir()) == [".jpg", ".webp"]
+
+
+def test_failed_publish_falls_back_to_the_original(photo, monkeypatch):
+    def refuse(self, target):
+        raise PermissionError(13, "Permission denied")
+
+    monkeypatch.setattr(Path, "replace", refuse)
+    assert utils._image_derivative(str(photo), photo.stat().st_mtime_ns, 600) == (str(photo), None)
+    assert list(utils.DERIVATIVES_DIR.iterdir()) == []
+
+
+def test_narrow_images_are_served_as_they_are(photo):
+    assert utils._image_derivative(str(photo), photo.stat().st_mtime_ns, 1600) == (str(photo), None)
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({"Accept": "image/avif,image/webp,*/*"}, True),
+        ({"User-Agent": CHROME}, True),
+        ({"User-Agent": SAFARI}, True),
+        ({"User-Agent": OLD_SAFARI}, False),
+        ({"User-Agent": OLD_EDGE}, False),
+        ({"User-Agent": IE}, False),
+        ({}, False),
+    ],
+)
+def test_webp_only_for_browsers_that_support_it(headers, expected):
+    assert utils._accepts_webp(headers) is expected
@@ -0,0 +1,109 @@
+import urllib.request
+
+import pytest
+
+import utils
+from media_server import MediaServer, parse_range
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / "video").mkdir()
+    (tmp_path / "video" / "intro.mp4").write_bytes(bytes(range(256)) * 4)
+    return tmp_path
+
+
+@pytest.fixture
+def servers():
+    started = []
+
+    def start(*args, **kwargs):
+        server = MediaServer(*args, **kwargs)
+        started.append(server)
+        return server
+
+    yield start
+    for server in started:
+        server.shutdown()
+
+
+def test_each_replica_gets_its_own_port(root, servers):
+    first, second = servers(root), servers(root)
+    assert first.port != second.port
+
+
+def test_urls_follow_the_request_host(root, servers):
+    server = servers(root, host="0.0.0.0")
+    path = root / "video" / "intro.mp4"
+
+    assert server.url_for(path, "perfumes.example:8501") == f"http://perfumes.example:{server.port}/media/video/intro.mp4"
+    assert server.url_for(path, "[::1]:8501").startswith(f"http://[::1]:{server.port}/")
+    assert server.url_for(path, None) is None
+    assert server.url_for(path, "evil.example/<script>") is None
+
+
+def test_loopback_server_is_only_offered_to_local_browsers(root, servers):
+    server = servers(root)
+    path = root / "video" / "intro.mp4"
+
+    assert server.url_for(path, "localhost:8501") == f"http://localhost:{server.port}/media/video/intro.mp4"
+    assert server.url_for(path, "192.168.1.20:8501") is None
+
+
+def test_https_pages_are_not_offered_the_plain_http_server(root, servers):
+    server = servers(root, host="0.0.0.0")
+    path = root / "video" / "intro.mp4"
+
+    assert server.url_for(path, "perfumes.example", "https") is None
+    assert server.url_for(path, "perfumes.example", "http").startswith("http://perfumes.example:")
+    proxied = servers(root, public_url="https://cdn.example")
+    assert proxied.url_for(path, "perfumes.example", "https") == "https://cdn.example/media/video/intro.mp4"
+
+
+def test_public_url_wins(root, servers):
+    server = servers(root, public_url="https://cdn.example/medios/")
+    assert server.url_for(root / "video" / "intro.mp4", "192.168.1.20") == "https://cdn.example/medios/media/video/intro.mp4"
+
+
+def test_range_request(root, servers):
+    server = servers(root)
+    request = urllib.request.Request(server.url_for(root / "video" / "intro.mp4", "127.0.0.1"), headers={"Range": "bytes=10-19"})
+    with urllib.request.urlopen(request, timeout=5) as response:
+        assert response.status == 206
+        assert response.headers["Content-Range"] == "bytes 10-19/1024"
+        assert response.read() == bytes(range(10, 20))
+
+
+def test_webp_is_negotiated_from_the_accept_header(root, servers):
+    (root / "images").mkdir()
+    (root / "images" / "rosa.jpg").write_bytes(b"jpeg")
+    (root / "images" / "rosa.webp").write_bytes(b"webp")
+    server = servers(root)
+    url = server.asset_url(root / "images" / "rosa.jpg", "127.0.0.1")
+
+    for accept, body, content_type in (("image/avif,image/webp,*/*", b"webp", "image/webp"), ("image/png,image/*", b"jpeg", "image/jpeg")):
+        with urllib.request.urlopen(urllib.request.Request(url, headers={"Accept": accept}), timeout=5) as response:
+            assert (response.read(), response.headers["Content-Type"], response.headers["Vary"]) == (body, content_type, "Accept")
+
+
+def test_parse_range():
+    assert parse_range("bytes=-100", 1000) == (900, 999)
+    assert parse_range("bytes=0-", 10) == (0, 9)
+    assert parse_range("bytes=0-1,4-5", 10) is None
+    with pytest.raises(ValueError):
+        parse_range("bytes=20-", 10)
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({"Origin": "http://perfumes.example"}, "http"),
+        ({"Origin": "https://perfumes.example"}, "https"),
+        ({"Origin": "http://10.0.0.5", "X-Forwarded-Proto": "https"}, "https"),
+        ({"X-Forwarded-Proto": "HTTPS, http"}, "https"),
+        ({}, "http"),
+    ],
+)
+def test_request_scheme_follows_the_proxy_and_the_origin(headers, expected, monkeypatch):
+    monkeypatch.setattr(utils, "_session_headers", lambda: headers)
+    assert utils._request_scheme() == expected
@@ -0,0 +1,84 @@
+import threading
+import urllib.request
+
+import metrics
+from metrics import CONTENT_TYPE, Counter, Histogram, MetricsServer
+
+
+def test_counter_sums_the_shards_of_every_thread():
+    counter = Counter("perfume_test_total", "Prueba.", ("page",))
+
+    def work():
+        for _ in range(100):
+            counter.inc("Inicio")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc("Contacto", amount=2)
+
+    assert counter.values() == {("Inicio",): 800, ("Contacto",): 2}
+    assert counter.render().splitlines() == [
+        "# HELP perfume_test_total Prueba.",
+        "# TYPE perfume_test_total counter",
+        'perfume_test_total{page="Contacto"} 2',
+        'perfume_test_total{page="Inicio"} 800',
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("perfume_test_seconds", "Prueba.", ("page",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, "Inicio")
+
+    assert list(histogram.collect()) == [
+        'perfume_test_seconds_bucket{page="Inicio",le="0.1"} 1',
+        'perfume_test_seconds_bucket{page="Inicio",le="1"} 3',
+        'perfume_test_seconds_bucket{page="Inicio",le="+Inf"} 4',
+        'perfume_test_seconds_sum{page="Inicio"} 4.05',
+        'perfume_test_seconds_count{page="Inicio"} 4',
+    ]
+
+
+def test_label_values_are_escaped():
+    counter = Counter("perfume_test_total", "Prueba.", ("familia",))
+    counter.inc('Floral "blanca"\n')
+    assert list(counter.collect()) == ['perfume_test_total{familia="Floral \\"blanca\\"\\n"} 1']
+
+
+def test_metrics_endpoint():
+    server = MetricsServer()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            assert "# TYPE perfume_page_reruns_total counter" in response.read().decode()
+    finally:
+        server.shutdown()
+
+
+def test_fragment_reruns_are_labelled_with_page_and_fragment():
+    @metrics.track_fragment
+    def filtros():
+        return "ok"
+
+    labels = ("test_metrics", "filtros")
+    before = metrics.FRAGMENT_RERUNS.values().get(labels, 0)
+
+    def full_rerun():
+        metrics.rerun_started("pages/test_metrics.py")
+        try:
+            filtros()  # dentro del rerun de la página: ya lo mide la página
+        finally:
+            metrics.rerun_finished()
+
+    for target in (full_rerun, filtros, filtros):  # cada rerun de Streamlit corre en un hilo nuevo
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+
+    assert filtros() == "ok"
+    assert metrics.FRAGMENT_RERUNS.values()[labels] == before + 3
+    assert sum(metrics.FRAGMENT_SECONDS.values()[labels][:-1]) == before + 3
+    assert 'perfume_fragment_reruns_total{page="test_metrics",fragment="filtros"}' in metrics.render()
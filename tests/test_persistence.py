@@ -0,0 +1,111 @@
+import sqlite3
+import threading
+
+import pytest
+
+import persistence
+from persistence import QuizStore, QuizSubmission
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = QuizStore(tmp_path / "quiz.sqlite", refresh_interval=0, flush_interval=0.01)
+    yield store
+    store.close()
+
+
+def test_aggregates_are_updated_incrementally(store):
+    store.submit(QuizSubmission(("Cítricos", "Flores"), "fresco", False))
+    store.submit(QuizSubmission(("Cítricos", "Especias"), "fresco", True))
+    store.submit(QuizSubmission(("Maderas", "Flores"), "amaderado", False))
+    store.flush()
+
+    stats = store.aggregates()
+    assert (stats.total, stats.empates) == (3, 1)
+    assert stats.familias == {"fresco": 2, "amaderado": 1}
+    assert stats.respuestas[1] == {"Cítricos": 2, "Maderas": 1}
+
+
+def test_schema_setup_does_not_leak_connections(tmp_path, monkeypatch):
+    opened = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(sqlite3, "connect", tracking_connect)
+    QuizStore(tmp_path / "quiz.sqlite").close()
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+
+def test_start_quiz_store_returns_before_the_store_exists(tmp_path, monkeypatch):
+    release = threading.Event()
+    created = threading.Event()
+
+    class SlowStore:
+        def __init__(self, path):
+            release.wait(5)
+            created.set()
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(persistence, "QuizStore", SlowStore)
+    monkeypatch.setattr(persistence, "_store", None)
+    monkeypatch.setattr(persistence, "_init_thread", None)
+    monkeypatch.setenv(persistence.DB_ENV_VAR, str(tmp_path / "quiz.sqlite"))
+
+    persistence.start_quiz_store()
+    persistence.start_quiz_store()  # no lanza un segundo hilo mientras el primero trabaja
+    assert persistence.peek_quiz_store() is None
+
+    release.set()
+    assert created.wait(5)
+    persistence._init_thread.join(5)
+    assert isinstance(persistence.peek_quiz_store(), SlowStore)
+
+
+def test_submissions_wait_in_memory_while_the_store_initializes(tmp_path, monkeypatch):
+    release = threading.Event()
+    real_store = QuizStore
+
+    def slow_store(path):
+        release.wait(5)
+        return real_store(path, refresh_interval=0, flush_interval=0.01)
+
+    monkeypatch.setattr(persistence, "QuizStore", slow_store)
+    monkeypatch.setattr(persistence, "_store", None)
+    monkeypatch.setattr(persistence, "_init_thread", None)
+    monkeypatch.setattr(persistence, "_pending", [])
+    monkeypatch.setattr(persistence, "PENDING_LIMIT", 2)
+    monkeypatch.setenv(persistence.DB_ENV_VAR, str(tmp_path / "quiz.sqlite"))
+
+    assert persistence.record_submission(("Cítricos",), "fresco", False)
+    assert persistence.record_submission(("Flores",), "floral", False)
+    assert not persistence.record_submission(("Maderas",), "amaderado", False)  # como una cola llena
+    assert persistence.peek_quiz_store() is None
+
+    release.set()
+    persistence._init_thread.join(5)
+    store = persistence.peek_quiz_store()
+    try:
+        assert persistence.record_submission(("Especias",), "oriental", True)
+        store.flush()
+        assert store.aggregates().familias == {"fresco": 1, "floral": 1, "oriental": 1}
+    finally:
+        store.close()
+
+
+def test_writes_do_not_shorten_the_refresh_interval(tmp_path):
+    store = QuizStore(tmp_path / "quiz.sqlite", refresh_interval=60, flush_interval=0.01)
+    try:
+        assert store.aggregates().total == 0
+        store.submit(QuizSubmission(("Cítricos",), "fresco", False))
+        store.flush()
+        assert store.aggregates().total == 0  # se relee cuando vence el intervalo, no en cada lote
+    finally:
+        store.close()
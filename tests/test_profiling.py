@@ -0,0 +1,61 @@
+import threading
+import tracemalloc
+
+import pytest
+
+import profiling
+
+
+@pytest.fixture(autouse=True)
+def _profile_log(tmp_path, monkeypatch):
+    monkeypatch.setenv(profiling.LOG_ENV_VAR, str(tmp_path / "profile.jsonl"))
+    monkeypatch.setattr(profiling, "_logger", None)
+    monkeypatch.setattr(profiling, "_render_panel", lambda report: None)
+
+
+def _in_thread(func):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_tracemalloc_stays_on_until_the_last_session_finishes(monkeypatch):
+    monkeypatch.setenv(profiling.ENV_VAR, "tracemalloc")
+    assert not tracemalloc.is_tracing()
+
+    first = profiling.start_rerun("pages/1_Tipos_de_Perfumes.py")
+    _in_thread(lambda: profiling.start_rerun("pages/2_Familias_Olfativas.py"))
+    report = _in_thread(lambda: (profiling.start_rerun("pages/3_Curiosidades.py"), profiling.finish_rerun())[1])
+
+    assert "tracemalloc_top" in report
+    assert tracemalloc.is_tracing(), "otra sesión sigue midiendo"
+    assert first.uses_tracemalloc
+    assert "tracemalloc_top" in profiling.finish_rerun()
+    assert tracemalloc.is_tracing(), "el segundo rerun no ha terminado"
+
+    profiling._release_tracemalloc()  # el rerun que nunca llamó a finish_rerun
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracemalloc_started_elsewhere_is_left_running(monkeypatch):
+    monkeypatch.setenv(profiling.ENV_VAR, "tracemalloc")
+    tracemalloc.start()
+    try:
+        profiling.start_rerun("pages/0_Inicio.py")
+        profiling.finish_rerun()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_query_param_requires_opt_in(monkeypatch):
+    import streamlit as st
+
+    monkeypatch.delenv(profiling.ENV_VAR, raising=False)
+    monkeypatch.setattr(st, "query_params", {profiling.QUERY_PARAM: "all"})
+    assert profiling._requested_modes() == frozenset()
+
+    monkeypatch.setenv(profiling.QUERY_ENV_VAR, "1")
+    assert {"cprofile", "tracemalloc"} <= profiling._requested_modes()
@@ -0,0 +1,49 @@
+import math
+
+import pandas as pd
+import pytest
+
+import utils
+
+
+def test_parse_numeric_range_reads_ranges_single_values_and_decimals():
+    bounds = utils.parse_numeric_range(
+        pd.Series(["20-40% esencia", "8 – 12 horas", "5 horas", "0,5-1,5%", "sin datos"])
+    )
+
+    assert str(bounds["min"].dtype) == "float32"
+    assert bounds["min"].tolist()[:4] == [20.0, 8.0, 5.0, 0.5]
+    assert bounds["max"].tolist()[:4] == [40.0, 12.0, 5.0, 1.5]
+    assert math.isnan(bounds.loc[4, "min"]) and math.isnan(bounds.loc[4, "max"])
+
+
+def test_perfume_types_expose_numeric_bounds():
+    types = utils.get_perfume_types().set_index("Tipo")
+    assert (types.loc["Parfum (Extracto)", ["concentracion_min", "concentracion_max"]] == [20.0, 40.0]).all()
+    assert types["duracion_min"].notna().all()
+
+
+@pytest.fixture
+def frame(monkeypatch):
+    frame = pd.DataFrame(
+        {
+            "nombre": ["Intenso", "Ligero", "Sin ficha"],
+            "familia": pd.Categorical(["Oriental", "Cítrica", "Floral"]),
+            "concentracion": pd.Series([25.0, 4.0, float("nan")], dtype="float32"),
+            "duracion_min": pd.Series([8.0, 2.0, 6.0], dtype="float32"),
+        }
+    )
+    monkeypatch.setattr(utils, "get_catalog_frame", lambda: frame)
+    return frame
+
+
+def test_filters_combine_as_masks(frame):
+    assert utils.filter_catalog(duracion_min=6)["nombre"].tolist() == ["Intenso", "Sin ficha"]
+    assert utils.filter_catalog(concentracion=(2.0, 10.0))["nombre"].tolist() == ["Ligero"]
+    assert utils.filter_catalog(duracion_min=6, familias=["Floral"])["nombre"].tolist() == ["Sin ficha"]
+    assert utils.filter_catalog(concentracion=(30.0, 40.0)).empty
+
+
+def test_unknown_concentration_is_only_dropped_by_a_concentration_filter(frame):
+    assert len(utils.filter_catalog()) == 3
+    assert "Sin ficha" not in utils.filter_catalog(concentracion=(0.0, 40.0))["nombre"].tolist()
@@ -0,0 +1,25 @@
+import numpy as np
+
+from recommender import NoteRecommender
+
+
+def _items(count):
+    return [(f"perfume {i}", ["rosa", "jazmín"], "Floral") for i in range(count)]
+
+
+def test_ivf_drops_empty_clusters():
+    # Vectores idénticos: k-means deja todos en un grupo y el resto vacíos.
+    recommender = NoteRecommender(_items(16), approximate=True, n_probe=1)
+
+    assert all(len(members) for members in recommender._ivf.lists)
+    assert len(recommender.recommend({"rosa": 1.0}, k=3)) == 3
+
+
+def test_empty_candidate_set_falls_back_to_exhaustive_search(monkeypatch):
+    recommender = NoteRecommender(_items(4) + [("cítrico", ["limón"], "Cítrica")], approximate=True)
+    monkeypatch.setattr(recommender._ivf, "candidates", lambda query, n_probe: np.array([], dtype=np.intp))
+
+    results = recommender.recommend({"limón": 1.0}, k=2)
+
+    assert [result.item for result in results][0] == "cítrico"
+    assert len(results) == 2
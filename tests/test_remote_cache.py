@@ -0,0 +1,119 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from remote_cache import RemoteCache
+
+IMAGE = b"\xff\xd8\xff\xe0" + b"perfume" * 100
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802 - nombre impuesto por http.server
+        server = self.server
+        server.requests.append(self.path)
+        if self.path.startswith("/slow"):
+            time.sleep(server.delay)
+        if self.path.startswith("/missing"):
+            self.send_error(404)
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(IMAGE)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(IMAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.requests = []
+    httpd.delay = 0.0
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_hit_downloads_once_and_serves_the_local_copy(tmp_path, server):
+    cache = RemoteCache(tmp_path)
+    url = _url(server, "/floral.jpg")
+
+    path = cache.get(url)
+    assert path is not None and path.read_bytes() == IMAGE
+    assert path.suffix == ".jpg"
+    assert cache.get(url) == path
+    assert RemoteCache(tmp_path).get(url) == path  # otro proceso reutiliza la copia del disco
+    assert server.requests == ["/floral.jpg"]
+
+
+def test_stale_copy_is_revalidated_with_etag(tmp_path, server):
+    cache = RemoteCache(tmp_path, revalidate_after=0)
+    url = _url(server, "/floral.jpg")
+
+    first = cache.get(url)
+    generation = cache.generation
+    assert cache.get(url) == first
+    assert len(server.requests) == 2
+    assert cache.generation == generation  # un 304 no reescribe el archivo
+
+
+def test_miss_returns_none_and_backs_off(tmp_path, server):
+    cache = RemoteCache(tmp_path, retry_after=60)
+    url = _url(server, "/missing.jpg")
+
+    assert cache.get(url) is None
+    assert cache.get(url) is None
+    assert server.requests == ["/missing.jpg"]
+
+
+def test_offline_mode_only_uses_existing_copies(tmp_path, server):
+    url = _url(server, "/floral.jpg")
+    assert RemoteCache(tmp_path, offline=True).get(url) is None
+    assert server.requests == []
+
+    path = RemoteCache(tmp_path).get(url)
+    offline = RemoteCache(tmp_path, offline=True, revalidate_after=0)
+    assert offline.get(url) == path
+    assert offline.get(url, wait=False) == path
+    assert server.requests == ["/floral.jpg"]
+
+
+def test_timeout_is_a_miss(tmp_path, server):
+    server.delay = 1.0
+    cache = RemoteCache(tmp_path, timeout=0.2)
+
+    start = time.monotonic()
+    assert cache.get(_url(server, "/slow.jpg")) is None
+    assert time.monotonic() - start < 0.9
+
+
+def test_non_blocking_get_fetches_in_the_background(tmp_path, server):
+    server.delay = 0.5
+    cache = RemoteCache(tmp_path)
+    url = _url(server, "/slow.jpg")
+
+    start = time.monotonic()
+    assert cache.get(url, wait=False) is None
+    assert cache.get(url, wait=False) is None
+    assert time.monotonic() - start < 0.2
+
+    assert cache.wait_pending(timeout=5)
+    assert cache.get(url, wait=False).read_bytes() == IMAGE
+    assert cache.generation == 1
+    assert server.requests == ["/slow.jpg"]
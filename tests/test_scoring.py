@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from scoring import FAMILY_ORDER, QuizScorer
+
+
+def _question(opciones, pesos=None):
+    return SimpleNamespace(pregunta="¿?", opciones={option: option.title() for option in opciones}, pesos=pesos)
+
+
+QUESTIONS = [
+    _question(FAMILY_ORDER),
+    _question(FAMILY_ORDER),
+    _question(("fresco", "oriental"), pesos={"fresco": {"fresco": 1.0, "floral": 0.5}, "oriental": {"oriental": 2.0}}),
+]
+
+
+def test_ties_are_broken_by_family_order():
+    scorer = QuizScorer(QUESTIONS[:2])
+
+    scores, winner, tie = scorer.score(["amaderado", "floral"])
+    assert scores == {"fresco": 0.0, "floral": 1.0, "oriental": 0.0, "amaderado": 1.0}
+    assert (winner, tie) == ("floral", True)
+    assert scorer.score(["oriental", "fresco"])[1:] == ("fresco", True)
+    assert scorer.score(["oriental", "oriental"])[1:] == ("oriental", False)
+
+
+def test_custom_weights_are_applied():
+    scores, winner, tie = QuizScorer(QUESTIONS).score(["floral", "amaderado", "oriental"])
+    assert scores["oriental"] == 2.0
+    assert (winner, tie) == ("oriental", False)
+
+
+def test_missing_and_unknown_answers_do_not_score():
+    scorer = QuizScorer(QUESTIONS)
+
+    assert scorer.encode([["floral"]]).tolist() == [[1, 4, 4]]  # la columna extra recoge lo que falta
+    assert scorer.encode([["cuero", "floral", "fresco", "sobrante"]]).tolist() == [[4, 1, 0]]
+    scores, winner, tie = scorer.score(["cuero"])
+    assert set(scores.values()) == {0.0}
+    assert (winner, tie) == (FAMILY_ORDER[0], True)
+
+
+def test_score_batch_on_empty_and_full_input():
+    scorer = QuizScorer(QUESTIONS)
+
+    scores, winners, ties = scorer.score_batch([])
+    assert scores.shape == (0, len(FAMILY_ORDER)) and winners == [] and ties.shape == (0,)
+
+    responses = [["fresco", "fresco", "fresco"], ["floral", "floral", "oriental"], ["amaderado", "oriental", "fresco"]]
+    scores, winners, ties = scorer.score_batch(responses)
+    assert winners == [scorer.score(response)[1] for response in responses]
+    assert ties.tolist() == [scorer.score(response)[2] for response in responses]
+    assert np.allclose(scores[0], [3.0, 0.5, 0.0, 0.0])
+
+
+def test_outcome_table_matches_score():
+    scorer = QuizScorer(QUESTIONS)
+    table = scorer.outcome_table()
+
+    assert len(table) == 4 * 4 * 2
+    for answers, family in table.items():
+        assert scorer.score(list(answers))[1] == family
@@ -0,0 +1,56 @@
+from search import SearchDocument, SearchIndex, tokenize
+
+
+def _doc(doc_id, titulo, texto="", categoria="Familia"):
+    return SearchDocument(doc_id, titulo, texto, categoria, "pages/2_Familias_Olfativas.py")
+
+
+DOCUMENTS = [
+    _doc("citrica", "Cítrica", "Frescura de bergamota, limón y mandarina."),
+    _doc("floral", "Floral", "Rosas y jazmín; algunas notas cítricas de fondo."),
+    _doc("amaderada", "Amaderada", "Maderas nobles, resinas y vetiver."),
+]
+
+
+def test_accents_and_case_are_folded():
+    index = SearchIndex(DOCUMENTS)
+
+    assert tokenize("La CÍTRICA y el Limón") == ["citrica", "limon"]
+    assert index.search("CITRICA")[0].document.id == "citrica"
+    assert [result.document.id for result in index.search("LIMÓN")] == ["citrica"]
+
+
+def test_only_the_last_term_matches_by_prefix():
+    index = SearchIndex(DOCUMENTS)
+
+    assert [result.document.id for result in index.search("mader")] == ["amaderada"]
+    assert [result.document.id for result in index.search("madera nobles")] == []
+    assert [result.document.id for result in index.search("maderas nob")] == ["amaderada"]
+
+
+def test_title_matches_rank_first():
+    results = SearchIndex(DOCUMENTS).search("citric")
+
+    assert [result.document.id for result in results] == ["citrica", "floral"]
+    assert results[0].score > results[1].score
+
+
+def test_all_terms_must_match_and_stopwords_are_ignored():
+    index = SearchIndex(DOCUMENTS)
+
+    assert [result.document.id for result in index.search("rosas y jazmin")] == ["floral"]
+    assert index.search("rosas vetiver") == []
+    assert index.search("de la y") == []
+
+
+def test_sync_adds_updates_and_removes_documents():
+    index = SearchIndex(DOCUMENTS)
+
+    changes = index.sync([DOCUMENTS[0], _doc("floral", "Floral", "Peonía y magnolia."), _doc("oriental", "Oriental", "Ámbar.")])
+
+    assert changes == 3  # floral cambió, oriental es nuevo y amaderada ya no está
+    assert "amaderada" not in index and len(index) == 3
+    assert index.search("vetiver") == [] and index.search("mader") == []
+    assert index.search("jazmin") == []
+    assert [result.document.id for result in index.search("ambar")] == ["oriental"]
+    assert index.sync(list(index._documents.values())) == 0
@@ -0,0 +1,61 @@
+import pytest
+
+import shared_cache
+import utils
+
+
+@pytest.fixture
+def shared(tmp_path, monkeypatch):
+    monkeypatch.setenv(shared_cache.ENABLE_ENV_VAR, "1")
+    monkeypatch.setenv(shared_cache.DIR_ENV_VAR, str(tmp_path / "shared"))
+    monkeypatch.setattr(shared_cache, "_cache", None)
+    monkeypatch.setattr(utils, "_VERSION_CHECK_INTERVAL", 0)  # cada llamada vuelve a mirar las fuentes
+    utils.clear_catalog_cache()
+    yield tmp_path / "shared"
+    utils.clear_catalog_cache()
+
+
+def test_artifacts_are_reused_until_cache_version_changes(shared, monkeypatch):
+    calls = []
+
+    @utils.catalog_cache
+    def build():
+        calls.append(1)
+        return {"valor": len(calls)}
+
+    assert build() == {"valor": 1}
+    build.cache_clear()  # como otra réplica: solo queda la copia del disco
+    assert build() == {"valor": 1}
+    assert len(calls) == 1
+
+    monkeypatch.setattr(utils, "CACHE_VERSION", utils.CACHE_VERSION + 1)
+    build.cache_clear()  # un despliegue nuevo no reutiliza lo publicado por el código anterior
+    assert build() == {"valor": 2}
+
+
+def test_timeline_csv_is_part_of_the_key(shared, tmp_path, monkeypatch):
+    csv_path = tmp_path / "historia.csv"
+    csv_path.write_text("anio,titulo,descripcion\n1889,Hito de prueba,Desde el CSV\n", encoding="utf-8")
+    monkeypatch.setenv("PERFUME_TIMELINE_CSV", str(csv_path))
+    assert "Hito de prueba" in {event.titulo for event in utils.get_timeline().events}
+
+    csv_path.write_text("anio,titulo,descripcion\n1889,Hito de prueba,Desde el CSV\n1925,Segundo hito,Desde el CSV\n", encoding="utf-8")
+    assert "Segundo hito" in {event.titulo for event in utils.get_timeline().events}
+
+    monkeypatch.delenv("PERFUME_TIMELINE_CSV")
+    assert "Hito de prueba" not in {event.titulo for event in utils.get_timeline().events}
+
+
+def test_source_fingerprint_is_checked_at_most_every_interval(monkeypatch):
+    calls = []
+    monkeypatch.setattr(utils, "csv_version", lambda: calls.append(1))
+    utils.clear_catalog_cache()
+
+    first = utils._catalog_version()
+    assert utils._catalog_version() is first
+    assert len(calls) == 1
+
+    monkeypatch.setattr(utils, "_VERSION_CHECK_INTERVAL", 0)
+    utils._catalog_version()
+    assert len(calls) == 2
+    utils.clear_catalog_cache()
@@ -0,0 +1,51 @@
+import templates
+from templates import HtmlTemplate, Markup, minify_css, minify_html
+
+
+def test_values_are_escaped_unless_marked_as_markup():
+    template = HtmlTemplate('<p title="$titulo">$texto</p>')
+
+    html = template.render(titulo='"><script>', texto="<b>Rosa & jazmín</b>")
+    assert html == '<p title="&quot;&gt;&lt;script&gt;">&lt;b&gt;Rosa &amp; jazmín&lt;/b&gt;</p>'
+    assert isinstance(html, Markup)
+
+    assert template.render(titulo="x", texto=Markup("<b>Rosa</b>")) == '<p title="x"><b>Rosa</b></p>'
+
+
+def test_rendered_fragments_nest_without_double_escaping():
+    items = templates.TIMELINE_ITEM.render_many(
+        [{"anio": 1921, "titulo": "Chanel Nº5", "descripcion": "Aldehídos & flores"}]
+    )
+    html = templates.TIMELINE.render(styles=templates.stylesheet("timeline"), items=items)
+
+    assert html.count("&amp;") == 1
+    assert "<style>.timeline{" in html
+    assert '<div class="timeline-year">1921 · Chanel Nº5</div>' in html
+
+
+def test_minify_collapses_markup_and_css():
+    assert minify_html("<div>\n    <p>  Hola\n  mundo </p>\n</div>\n") == "<div><p> Hola mundo </p></div>"
+    assert minify_html("<style>\n  .a > b { color : red ; }\n</style>") == "<style>.a>b{color:red}</style>"
+    assert minify_css("/* comentario */ .a { margin: 0 ; }") == ".a{margin:0}"
+
+
+def test_minify_keeps_preformatted_text_and_attribute_values():
+    source = """
+        <div   class="nota  destacada"  data-notas='bergamota,   limón'>
+            <pre>
+  línea 1
+      línea 2
+</pre>
+            <textarea>  a\n  b</textarea>
+        </div>
+    """
+
+    assert minify_html(source) == (
+        "<div class=\"nota  destacada\" data-notas='bergamota,   limón'>"
+        "<pre>\n  línea 1\n      línea 2\n</pre><textarea>  a\n  b</textarea></div>"
+    )
+
+
+def test_placeholders_survive_minification():
+    template = HtmlTemplate('<pre>\n $codigo\n</pre><span title="a  $valor">$valor</span>')
+    assert template.render(codigo="x < 1", valor="b") == '<pre>\n x &lt; 1\n</pre><span title="a  b">b</span>'
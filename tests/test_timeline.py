@@ -0,0 +1,86 @@
+import logging
+
+from timeline import CSV_ENV_VAR, Timeline, TimelineEvent, iter_events, load_timeline
+
+
+def _events():
+    return [
+        TimelineEvent(1992, "Angel", "Gourmand", "Oriental"),
+        TimelineEvent(1921, "Chanel No.5", "Aldehídos", "Floral"),
+        TimelineEvent(2013, "Baccarat Rouge 540", "Lujo moderno"),
+        TimelineEvent(1957, "Diorissimo", "Lirio del valle", "Floral"),
+    ]
+
+
+def test_range_queries_include_both_limits():
+    timeline = Timeline(_events())
+
+    assert [event.anio for event in timeline.events] == [1921, 1957, 1992, 2013]
+    assert [event.titulo for event in timeline.query(1957, 1992)] == ["Diorissimo", "Angel"]
+    assert timeline.count(1930, 1950) == 0
+    assert [event.titulo for event in timeline.query(familia="Floral")] == ["Chanel No.5", "Diorissimo"]
+    assert timeline.decades() == [1920, 1950, 1990, 2010]
+    assert timeline.families() == ["Floral", "Oriental"]
+
+
+def test_pages_are_clamped_to_the_last_one():
+    page = Timeline(_events()).page(page=9, page_size=3)
+
+    assert (page.page, page.pages, page.total) == (2, 2, 4)
+    assert [event.titulo for event in page.items] == ["Baccarat Rouge 540"]
+
+
+def test_bad_csv_rows_are_skipped_and_logged(tmp_path, monkeypatch, caplog):
+    csv_path = tmp_path / "historia.csv"
+    csv_path.write_text(
+        "anio,titulo,descripcion,familia\n"
+        "1889,Jicky,Guerlain,Aromática\n"
+        "mil novecientos,Shalimar,Guerlain,Oriental\n"
+        "1970,,Sin título,\n"
+        "1978\n"
+        "2001,Flowerbomb,Viktor&Rolf,\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setenv(CSV_ENV_VAR, str(csv_path))
+
+    with caplog.at_level(logging.WARNING, logger="perfume.timeline"):
+        events = list(iter_events())
+
+    assert [(event.anio, event.familia) for event in events] == [(1889, "Aromática"), (2001, None)]
+    assert [record.getMessage().split(": ", 1)[0] for record in caplog.records] == [
+        f"{csv_path}, línea {line}" for line in (3, 4, 5)
+    ]
+
+
+def test_editorial_records_come_before_the_csv(tmp_path, monkeypatch):
+    csv_path = tmp_path / "historia.csv"
+    csv_path.write_text("anio,titulo,descripcion\n1921,Chanel No.5 (CSV),Desde el CSV\n", encoding="utf-8")
+    monkeypatch.setenv(CSV_ENV_VAR, str(csv_path))
+
+    timeline = load_timeline([{"anio": 1921, "titulo": "Chanel No.5", "descripcion": "Aldehídos"}])
+    assert [event.titulo for event in timeline.events] == ["Chanel No.5", "Chanel No.5 (CSV)"]
+
+
+def test_missing_csv_falls_back_to_the_editorial_records(tmp_path, monkeypatch, caplog):
+    monkeypatch.setenv(CSV_ENV_VAR, str(tmp_path / "no-existe.csv"))
+
+    with caplog.at_level(logging.ERROR, logger="perfume.timeline"):
+        timeline = load_timeline([{"anio": 1921, "titulo": "Chanel No.5", "descripcion": "Aldehídos"}])
+
+    assert [event.titulo for event in timeline.events] == ["Chanel No.5"]
+    assert [record.name for record in caplog.records] == ["perfume.timeline"]
+    assert "no-existe.csv" in caplog.records[0].getMessage()
+
+
+def test_csv_that_is_not_utf8_is_ignored_as_a_whole(tmp_path, monkeypatch, caplog):
+    csv_path = tmp_path / "historia.csv"
+    lines = ["anio,titulo,descripcion"] + [f"{1900 + number},Hito {number},Sin acentos" for number in range(500)]
+    lines.append("1999,Eau de Café,Año de lanzamiento")
+    csv_path.write_bytes("\n".join(lines).encode("latin-1"))  # las primeras filas ya se habrían leído
+    monkeypatch.setenv(CSV_ENV_VAR, str(csv_path))
+
+    with caplog.at_level(logging.ERROR, logger="perfume.timeline"):
+        timeline = load_timeline([{"anio": 1921, "titulo": "Chanel No.5", "descripcion": "Aldehídos"}])
+
+    assert [event.titulo for event in timeline.events] == ["Chanel No.5"]
+    assert len(caplog.records) == 1 and str(csv_path) in caplog.records[0].getMessage()
@@ -0,0 +1,193 @@
+"""Línea de tiempo de la perfumería: hitos ordenados por año con consultas por rango.
+
+Los eventos se ordenan una vez al construir :class:`Timeline` y se guarda aparte la
+lista de años (también una por familia), de modo que filtrar por rango de años es una
+búsqueda binaria y una página de resultados es un corte de la tupla: el costo de cada
+consulta no depende de cuántos eventos haya fuera de la página.
+
+Los hitos editoriales se escriben en ``content/historia.yaml``; además se pueden cargar
+miles de eventos desde un CSV con columnas ``anio``, ``titulo``, ``descripcion`` y
+(opcionales) ``familia`` y ``categoria``, indicado con ``PERFUME_TIMELINE_CSV``. Las filas
+incompletas o con un año que no es un número entero se omiten y se registran; si el
+archivo no se puede leer (no existe, permisos, no es UTF-8) se registra el error y la
+línea de tiempo se queda solo con los hitos editoriales.
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+import os
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:  # logging solo se importa si hay algo que registrar
+    import logging
+
+CSV_ENV_VAR = "PERFUME_TIMELINE_CSV"
+
+
+def _logger() -> logging.Logger:
+    import logging
+
+    return logging.getLogger("perfume.timeline")
+
+
+@dataclass(frozen=True)
+class TimelineEvent:
+    anio: int
+    titulo: str
+    descripcion: str
+    familia: Optional[str] = None
+    categoria: str = "Lanzamiento"
+
+    @property
+    def decada(self) -> int:
+        return self.anio // 10 * 10
+
+
+@dataclass(frozen=True)
+class TimelinePage:
+    """Una página de eventos junto con el total de coincidencias."""
+
+    items: Sequence[TimelineEvent]
+    total: int
+    page: int
+    page_size: int
+
+    @property
+    def pages(self) -> int:
+        return max(1, math.ceil(self.total / self.page_size))
+
+
+class Timeline:
+    """Eventos en orden cronológico con índices por año para consultar rangos."""
+
+    def __init__(self, events: Iterable[TimelineEvent]) -> None:
+        # El orden es estable: los eventos del mismo año conservan su orden editorial.
+        self.events: Tuple[TimelineEvent, ...] = tuple(sorted(events, key=lambda event: event.anio))
+        self._years = [event.anio for event in self.events]
+        by_family: Dict[str, List[TimelineEvent]] = {}
+        for event in self.events:
+            if event.familia:
+                by_family.setdefault(event.familia, []).append(event)
+        self._families: Dict[str, Tuple[List[int], Tuple[TimelineEvent, ...]]] = {
+            family: ([event.anio for event in items], tuple(items)) for family, items in by_family.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def _range(
+        self, desde: Optional[int], hasta: Optional[int], familia: Optional[str]
+    ) -> Tuple[Tuple[TimelineEvent, ...], int, int]:
+        if familia is None:
+            years, events = self._years, self.events
+        else:
+            years, events = self._families.get(familia, ([], ()))
+        start = 0 if desde is None else bisect_left(years, desde)
+        stop = len(years) if hasta is None else bisect_right(years, hasta)
+        return events, start, max(start, stop)
+
+    def count(self, desde: Optional[int] = None, hasta: Optional[int] = None, familia: Optional[str] = None) -> int:
+        _, start, stop = self._range(desde, hasta, familia)
+        return stop - start
+
+    def query(
+        self, desde: Optional[int] = None, hasta: Optional[int] = None, familia: Optional[str] = None
+    ) -> Tuple[TimelineEvent, ...]:
+        """Eventos con ``desde <= anio <= hasta`` (límites incluidos), opcionalmente de una familia."""
+
+        events, start, stop = self._range(desde, hasta, familia)
+        return events[start:stop]
+
+    def page(
+        self,
+        desde: Optional[int] = None,
+        hasta: Optional[int] = None,
+        familia: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 10,
+    ) -> TimelinePage:
+        """Devuelve la página ``page`` (desde 1) del rango; si no existe, la última."""
+
+        events, start, stop = self._range(desde, hasta, familia)
+        total = stop - start
+        page = min(max(1, page), max(1, math.ceil(total / page_size)))
+        offset = start + (page - 1) * page_size
+        return TimelinePage(events[offset : min(stop, offset + page_size)], total, page, page_size)
+
+    def decades(self) -> List[int]:
+        return sorted({event.decada for event in self.events})
+
+    def families(self) -> List[str]:
+        return sorted(self._families)
+
+
+def _read_csv(path: Path) -> Iterator[TimelineEvent]:
+    """Eventos del CSV; una fila no válida se registra y se omite sin detener la carga."""
+
+    with path.open(newline="", encoding="utf-8") as handle:
+        reader = csv.DictReader(handle)
+        for row in reader:
+            missing = [field for field in ("anio", "titulo", "descripcion") if not (row.get(field) or "").strip()]
+            if missing:
+                _logger().warning("%s, línea %d: faltan %s; se omite la fila", path, reader.line_num, ", ".join(missing))
+                continue
+            try:
+                anio = int(row["anio"])
+            except ValueError:
+                _logger().warning("%s, línea %d: año no válido %r; se omite la fila", path, reader.line_num, row["anio"])
+                continue
+            yield TimelineEvent(
+                anio,
+                row["titulo"],
+                row["descripcion"],
+                row.get("familia") or None,
+                row.get("categoria") or "Lanzamiento",
+            )
+
+
+def csv_version() -> Optional[Tuple[str, int, int]]:
+    """Ruta, tamaño y mtime del CSV de ``PERFUME_TIMELINE_CSV``; ``None`` si no hay CSV."""
+
+    path = os.environ.get(CSV_ENV_VAR)
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (os.path.abspath(path), -1, -1)
+    return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+
+def iter_events(records: Iterable[Mapping[str, Any]] = ()) -> Iterator[TimelineEvent]:
+    """Eventos de ``records`` más los del CSV de ``PERFUME_TIMELINE_CSV``, si está configurado."""
+
+    for record in records:
+        yield TimelineEvent(**record)
+    path = os.environ.get(CSV_ENV_VAR)
+    if path:
+        try:
+            # Se lee entero antes de entregar nada: un error a mitad del archivo no deja la mitad de los eventos.
+            events = list(_read_csv(Path(path)))
+        except (OSError, UnicodeDecodeError) as error:
+            _logger().error("No se pudo leer %s (%s); se usan solo los hitos editoriales", path, error)
+            return
+        yield from events
+
+
+def load_timeline(records: Iterable[Mapping[str, Any]] = ()) -> Timeline:
+    return Timeline(iter_events(records))
+
+
+__all__ = [
+    "Timeline",
+    "TimelineEvent",
+    "TimelinePage",
+    "csv_version",
+    "iter_events",
+    "load_timeline",
+]
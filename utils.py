@@ -2,17 +2,184 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
+import sys
+import threading
+import time
 from dataclasses import dataclass
+from functools import lru_cache, wraps
+from html import escape
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple, TypeVar
 
-import pandas as pd
+from catalog import TYPICAL_CONCENTRATION, Perfume, catalog_version, featured_perfumes, iter_perfumes, query_perfumes
+from content import get_content
+from family_graph import Edge, FamilyGraph, render_svg
+from metrics import ASSET_LOOKUPS, QUIZ_RESULTS
+from navigation import CURIOSIDADES_PAGE, FAMILIAS_PAGE, PAGES, TIPOS_PAGE, page_link
+from persistence import peek_quiz_store, record_submission, start_quiz_store
+from profiling import instrument
+from remote_cache import get_remote_cache
+from search import SearchDocument, SearchIndex
+from shared_cache import get_shared_cache
+from templates import HERO, RECOMMENDATION, TIMELINE, TIMELINE_ITEM, stylesheet
+from timeline import Timeline, TimelineEvent, csv_version, load_timeline
+
+if TYPE_CHECKING:  # pandas y numpy se importan en el primer uso: cada página importa utils
+    import pandas as pd
+
+    from recommender import NoteRecommender, Recommendation
+    from scoring import QuizScorer
 
 
 BASE_DIR = Path(__file__).parent
 ASSETS_DIR = BASE_DIR / "assets"
 IMAGES_DIR = ASSETS_DIR / "images"
 VIDEO_DIR = ASSETS_DIR / "video"
+DERIVATIVES_DIR = ASSETS_DIR / ".cache" / "images"
+GRAPHS_DIR = ASSETS_DIR / ".cache" / "graphs"
+
+# Anchos en píxeles de los derivados: el doble del tamaño mostrado, para pantallas HiDPI.
+CARD_IMAGE_WIDTH = 640  # imágenes mostradas con width=320
+GALLERY_IMAGE_WIDTH = 600  # galerías de tres columnas
+DETAIL_IMAGE_WIDTH = 800  # columna lateral de detalle
+
+# Incrementar al cambiar la forma de generar derivados para invalidar los existentes.
+_DERIVATIVE_VERSION = 1
+
+# Incrementar al cambiar lo que devuelve un constructor de @catalog_cache: las réplicas que
+# comparten caché solo reutilizan artefactos publicados con la misma versión.
+CACHE_VERSION = 1
+
+T = TypeVar("T")
+
+
+class AssetIndex:
+    """Índice en memoria de los archivos de una carpeta de recursos.
+
+    La carpeta se escanea en la primera consulta y solo se vuelve a escanear cuando
+    cambia su mtime, que se comprueba como mucho cada ``check_interval`` segundos.
+    Las búsquedas se resuelven desde un diccionario sin tocar el disco.
+    """
+
+    def __init__(self, directory: Path, check_interval: float = 2.0) -> None:
+        self.directory = directory
+        self.name = directory.name
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._files: Dict[str, int] = {}
+        self._version: Optional[int] = None
+        self._checked_at = float("-inf")
+        self._missing: Set[str] = set()
+
+    def _scan(self) -> Dict[str, int]:
+        files: Dict[str, int] = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        files[entry.name] = entry.stat().st_mtime_ns
+        except OSError:
+            pass
+        return files
+
+    def refresh(self, force: bool = False) -> None:
+        """Vuelve a escanear la carpeta si su mtime cambió desde el último escaneo."""
+
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                version: Optional[int] = self.directory.stat().st_mtime_ns
+            except OSError:
+                version = None
+            if not force and version == self._version:
+                return
+            self._files = self._scan() if version is not None else {}
+            self._version = version
+
+    def version(self) -> Optional[int]:
+        """mtime de la carpeta en el último escaneo, o ``None`` si no existe."""
+
+        self.refresh()
+        return self._version
+
+    def lookup(self, name: str) -> Optional[int]:
+        """Devuelve el mtime del archivo si existe; si no, lo registra como faltante."""
+
+        self.refresh()
+        mtime_ns = self._files.get(name)
+        if mtime_ns is None:
+            self._missing.add(name)
+        ASSET_LOOKUPS.inc(self.name, "miss" if mtime_ns is None else "hit")
+        return mtime_ns
+
+    def missing(self) -> List[str]:
+        """Nombres solicitados que no se encontraron en la carpeta."""
+
+        self.refresh()
+        return sorted(name for name in self._missing if name not in self._files)
+
+
+_IMAGE_INDEX = AssetIndex(IMAGES_DIR)
+_VIDEO_INDEX = AssetIndex(VIDEO_DIR)
+
+_CATALOG_BUILDERS: List[Callable[[], object]] = []
+
+# La huella de las fuentes se recalcula como mucho cada tantos segundos, como AssetIndex y
+# ContentStore: cada rerun consulta varios constructores y no debe pagar un stat por cada uno.
+_VERSION_CHECK_INTERVAL = 2.0
+_version_state: Dict[str, Tuple[float, Tuple[object, ...]]] = {}
+
+
+def _catalog_version() -> Tuple[object, ...]:
+    """Huella de las fuentes del catálogo: imágenes, base de perfumes, contenido editorial y CSV de historia."""
+
+    now = time.monotonic()
+    cached = _version_state.get("current")
+    if cached is not None and now - cached[0] < _VERSION_CHECK_INTERVAL:
+        return cached[1]
+    version = (_IMAGE_INDEX.version(), catalog_version(), get_content().fingerprint, csv_version())
+    _version_state["current"] = (now, version)  # una sola asignación: los lectores ven la pareja completa
+    return version
+
+
+def catalog_cache(builder: Callable[[], T]) -> Callable[[], T]:
+    """Memoriza un constructor de datos una vez por proceso y lo invalida si cambian sus fuentes.
+
+    El resultado se comparte entre todas las sesiones, por lo que debe tratarse como de solo lectura.
+    Con la caché compartida activada, además se reutiliza lo que ya construyó otro proceso, así
+    que el resultado no puede depender de la réplica (URLs del servidor de medios, host, sesión).
+    """
+
+    name = f"{builder.__module__}.{builder.__qualname__}"
+
+    def build(version: Tuple[object, ...]) -> T:
+        shared = get_shared_cache()
+        if shared is None:
+            return builder()
+        return shared.get_or_build(name, f"{version}:{CACHE_VERSION}:{sys.version_info[:2]}", builder)
+
+    cached = lru_cache(maxsize=1)(build)
+
+    @wraps(builder)
+    def wrapper() -> T:
+        return cached(_catalog_version())
+
+    wrapper.cache_clear = cached.cache_clear  # type: ignore[attr-defined]
+    _CATALOG_BUILDERS.append(wrapper)
+    return wrapper
+
+
+def clear_catalog_cache() -> None:
+    """Descarta todos los datos memorizados para forzar su reconstrucción."""
+
+    _version_state.clear()
+    for builder in _CATALOG_BUILDERS:
+        builder.cache_clear()  # type: ignore[attr-defined]
 
 
 def get_asset_path(*parts: str) -> Path:
@@ -21,318 +188,718 @@ def get_asset_path(*parts: str) -> Path:
     return ASSETS_DIR.joinpath(*parts)
 
 
-def resolve_image(name: str, fallback_url: Optional[str] = None) -> Dict[str, Optional[str]]:
-    """Devuelve un diccionario con la ruta local o el fallback para una imagen."""
+_derivative_locks: Dict[str, threading.Lock] = {}
+_derivative_locks_lock = threading.Lock()
+
+
+def _derivative_lock(stem: str) -> threading.Lock:
+    with _derivative_locks_lock:
+        return _derivative_locks.setdefault(stem, threading.Lock())
+
+
+@lru_cache(maxsize=256)
+def _image_derivative(source: str, mtime_ns: int, width: int) -> Tuple[str, Optional[str]]:
+    """Genera (una sola vez) versiones reducidas de la imagen y devuelve ``(jpeg, webp)``.
+
+    El JPEG progresivo sirve a cualquier navegador; el WebP, más ligero, solo a los que lo
+    aceptan, y es ``None`` si Pillow no sabe escribirlo. Sin Pillow o si la imagen original
+    ya es más estrecha que ``width`` se devuelve el original.
+    """
+
+    try:
+        from PIL import Image
+    except ImportError:
+        return source, None
+
+    source_path = Path(source)
+    digest = hashlib.sha256(source_path.read_bytes())
+    digest.update(f"{width}:{_DERIVATIVE_VERSION}".encode())
+    stem = f"{source_path.stem}-{width}w-{digest.hexdigest()[:12]}"
+    jpeg, webp = DERIVATIVES_DIR / f"{stem}.jpg", DERIVATIVES_DIR / f"{stem}.webp"
+
+    # lru_cache no serializa la primera llamada: las sesiones que piden la misma imagen en
+    # frío esperan aquí a que una la genere. Otras réplicas escriben sus propios temporales.
+    with _derivative_lock(stem):
+        if jpeg.exists():
+            return str(jpeg), str(webp) if webp.exists() else None
+
+        with Image.open(source_path) as image:
+            if image.width <= width:
+                return source, None
+            height = round(image.height * width / image.width)
+            resized = image.convert("RGB").resize((width, height), Image.LANCZOS)
+
+        DERIVATIVES_DIR.mkdir(parents=True, exist_ok=True)
+        written: Dict[Path, bool] = {}
+        # El JPEG se publica el último: su presencia indica que el par ya está completo.
+        formats = (
+            (webp, {"format": "WEBP", "quality": 80, "method": 6}),
+            (jpeg, {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True}),
+        )
+        for target, options in formats:
+            tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                resized.save(tmp, **options)
+                tmp.replace(target)
+            except (KeyError, OSError):
+                tmp.unlink(missing_ok=True)
+                written[target] = False
+            else:
+                written[target] = True
+    if not written[jpeg]:
+        return source, None
+    return str(jpeg), str(webp) if written[webp] else None
+
+
+# Primera versión con WebP de cada navegador, en el orden en que se buscan en ``User-Agent``
+# (Edge clásico también dice "Chrome/"; Safari indica su versión con "Version/").
+_WEBP_BROWSERS = (("Edge/", 18), ("Chrome/", 32), ("Firefox/", 65), ("Version/", 14))
+
+
+def _session_headers() -> Mapping[str, str]:
+    """Cabeceras HTTP con las que el navegador de esta sesión abrió la aplicación."""
+
+    import streamlit as st  # importación local para evitar dependencias circulares
+
+    return st.context.headers if st.runtime.exists() else {}
+
+
+def _request_host() -> Optional[str]:
+    """Cabecera ``Host`` con la que el navegador de esta sesión abrió la aplicación."""
+
+    return _session_headers().get("Host")
+
+
+def _request_scheme() -> str:
+    """Esquema (``http`` o ``https``) con el que el navegador de esta sesión abrió la aplicación.
+
+    Detrás de un proxy que termina TLS lo indica ``X-Forwarded-Proto``; si no, el ``Origin``
+    de la conexión de la sesión.
+    """
+
+    headers = _session_headers()
+    forwarded = headers.get("X-Forwarded-Proto", "").split(",", 1)[0].strip().lower()
+    if forwarded:
+        return forwarded
+    return "https" if headers.get("Origin", "").lower().startswith("https://") else "http"
+
+
+def _accepts_webp(headers: Mapping[str, str]) -> bool:
+    """Si el navegador muestra WebP; ante la duda, no (se le entrega JPEG).
+
+    Las cabeceras de la sesión son las de su conexión: ``Accept`` rara vez menciona
+    imágenes ahí, así que también se mira la versión del navegador en ``User-Agent``.
+    """
+
+    if "image/webp" in headers.get("Accept", ""):
+        return True
+    agent = headers.get("User-Agent", "")
+    for token, first_version in _WEBP_BROWSERS:
+        _, found, rest = agent.partition(token)
+        if found:
+            major = rest.split(".", 1)[0]
+            return major.isdigit() and int(major) >= first_version
+    return False
+
+
+def _static_asset_url(local: str) -> Optional[str]:
+    from media_server import assets_enabled, get_media_server
+
+    server = get_media_server() if assets_enabled() else None
+    return server.asset_url(Path(local), _request_host(), _request_scheme()) if server is not None else None
+
+
+def _for_client(jpeg: str, webp: Optional[str]) -> str:
+    return webp if webp is not None and _accepts_webp(_session_headers()) else jpeg
 
-    path = IMAGES_DIR / name
-    if path.exists():
-        return {"path": str(path), "fallback": fallback_url}
+
+def resolve_image(
+    name: str, fallback_url: Optional[str] = None, width: Optional[int] = None
+) -> Dict[str, Optional[str]]:
+    """Devuelve un diccionario con la ruta local o el fallback para una imagen.
+
+    Si se indica ``width`` se devuelve un derivado redimensionado a ese ancho en píxeles:
+    WebP si el navegador de la sesión lo admite y JPEG si no. Con ``PERFUME_STATIC_ASSETS=1``
+    las imágenes locales se entregan como URL con el hash de su contenido, que el navegador
+    guarda en caché de forma indefinida; la URL apunta al JPEG y el servidor de medios
+    entrega el WebP a quien lo pide en ``Accept``. Como la URL y el formato dependen de la
+    sesión, el resultado no debe guardarse en cachés del proceso.
+    """
+
+    mtime_ns = _IMAGE_INDEX.lookup(name)
+    if mtime_ns is not None:
+        local, webp = str(IMAGES_DIR / name), None
+        if width:
+            local, webp = _image_derivative(local, mtime_ns, width)
+        url = _static_asset_url(local)  # el servidor de medios elige WebP o JPEG en cada petición
+        return {"path": url or _for_client(local, webp), "fallback": fallback_url}
+
+    cache = get_remote_cache()
+    cached = cache.get(fallback_url, wait=False) if cache is not None and fallback_url else None
+    if cached is not None:
+        local = str(cached)
+        if width:
+            local = _for_client(*_image_derivative(local, cached.stat().st_mtime_ns, width))
+        return {"path": local, "fallback": fallback_url}
     return {"path": fallback_url, "fallback": fallback_url}
 
 
 def resolve_video(name: str, fallback_url: Optional[str] = None) -> Dict[str, Optional[str]]:
-    """Devuelve un diccionario con la ruta local o el fallback para un video."""
+    """Devuelve un diccionario con la ruta local o el fallback para un video.
 
-    path = VIDEO_DIR / name
-    if path.exists():
-        return {"path": str(path), "fallback": fallback_url}
+    Con el servidor de medios activado, los videos locales se entregan como URL con soporte de rangos.
+    """
+
+    if _VIDEO_INDEX.lookup(name) is not None:
+        from media_server import get_media_server
+
+        server = get_media_server()
+        url = server.url_for(VIDEO_DIR / name, _request_host(), _request_scheme()) if server is not None else None
+        return {"path": url or str(VIDEO_DIR / name), "fallback": fallback_url}
+
+    cache = get_remote_cache()
+    cached = cache.get(fallback_url, wait=False) if cache is not None and fallback_url else None
+    if cached is not None:
+        return {"path": str(cached), "fallback": fallback_url}
     return {"path": fallback_url, "fallback": fallback_url}
 
 
+HERO_BACKGROUND_URL = "https://images.unsplash.com/photo-1501004318641-b39e6451bec6?auto=compress&fit=crop&w=1600"
+
+
+def hero_background_url() -> str:
+    """URL del fondo de la portada: la copia local servida por Streamlit si existe, o la remota."""
+
+    cache = get_remote_cache()
+    local = cache.static_url(HERO_BACKGROUND_URL) if cache is not None else None
+    return local or HERO_BACKGROUND_URL
+
+
+HERO_TITLE = "El Arte del Perfume"
+HERO_TEXT = (
+    "Una experiencia sensorial que explora la historia, la ciencia y la emoción detrás de las fragancias. "
+    "Descubre cómo los perfumes acompañan nuestros recuerdos y reflejan nuestra identidad."
+)
+
+
+@lru_cache(maxsize=4)
+def _hero_html(background: str) -> str:
+    return stylesheet("hero") + HERO.render(background=background, titulo=HERO_TITLE, texto=HERO_TEXT)
+
+
+def get_hero_html() -> str:
+    """Portada con sus estilos, ya minificada; solo se reconstruye si cambia la URL del fondo."""
+
+    return _hero_html(hero_background_url())
+
+
+def report_missing_assets() -> Dict[str, List[str]]:
+    """Lista los recursos solicitados que no existen y se están sirviendo desde el fallback."""
+
+    return {"images": _IMAGE_INDEX.missing(), "video": _VIDEO_INDEX.missing()}
+
+
+@instrument
+@catalog_cache
 def get_perfume_types() -> pd.DataFrame:
     """Información tabular acerca de los tipos de perfumes y sus concentraciones."""
 
+    import pandas as pd
+
     data = [
-        {
-            "Tipo": "Parfum (Extracto)",
-            "Concentración": "20-40% esencia",
-            "Duración": "8-12 horas",
-            "Notas Destacadas": "Ricas, intensas, cercanas a la piel",
-        },
-        {
-            "Tipo": "Eau de Parfum",
-            "Concentración": "15-20% esencia",
-            "Duración": "6-8 horas",
-            "Notas Destacadas": "Profundidad, gran estela",
-        },
-        {
-            "Tipo": "Eau de Toilette",
-            "Concentración": "8-12% esencia",
-            "Duración": "4-6 horas",
-            "Notas Destacadas": "Versátil, ideal para el día",
-        },
-        {
-            "Tipo": "Eau de Cologne",
-            "Concentración": "2-5% esencia",
-            "Duración": "2-3 horas",
-            "Notas Destacadas": "Refrescante, cítrica",
-        },
-        {
-            "Tipo": "Body Mist",
-            "Concentración": "1-3% esencia",
-            "Duración": "1-2 horas",
-            "Notas Destacadas": "Muy ligera, uso frecuente",
-        },
+        {"Tipo": row["tipo"], "Concentración": row["concentracion"], "Duración": row["duracion"], "Notas Destacadas": row["notas"]}
+        for row in get_content()["tipos"]
     ]
-    return pd.DataFrame(data)
+    df = pd.DataFrame(data)
+    concentracion = parse_numeric_range(df["Concentración"])
+    duracion = parse_numeric_range(df["Duración"])
+    df["concentracion_min"], df["concentracion_max"] = concentracion["min"], concentracion["max"]
+    df["duracion_min"], df["duracion_max"] = duracion["min"], duracion["max"]
+    # Categoría ordenada de mayor a menor concentración, en el orden de la tabla.
+    df["Tipo"] = pd.Categorical(df["Tipo"], categories=df["Tipo"], ordered=True)
+    return df
+
+
+_RANGE_PATTERN = r"(?P<min>\d+(?:[.,]\d+)?)(?:\s*[-–]\s*(?P<max>\d+(?:[.,]\d+)?))?"
 
 
+def parse_numeric_range(values: pd.Series) -> pd.DataFrame:
+    """Extrae ``min`` y ``max`` de textos como "20-40% esencia" u "8-12 horas" de forma vectorizada.
+
+    Un valor único ("5 horas") se usa como mínimo y máximo; los textos sin números quedan en ``NaN``.
+    """
+
+    bounds = values.str.extract(_RANGE_PATTERN)
+    bounds = bounds.apply(lambda column: column.str.replace(",", ".", regex=False)).astype("float32")
+    bounds["max"] = bounds["max"].fillna(bounds["min"])
+    return bounds
+
+
+@catalog_cache
+def get_catalog_frame() -> pd.DataFrame:
+    """Catálogo completo como tabla tipada para filtrar por rangos sin operaciones de texto.
+
+    Marca, tipo y familia son categorías y los rangos de duración se toman de la tabla de tipos.
+    """
+
+    import pandas as pd
+
+    frame = pd.DataFrame.from_records(
+        ((p.nombre, p.marca, p.tipo, p.familia, p.concentracion) for p in iter_perfumes()),
+        columns=["nombre", "marca", "tipo", "familia", "concentracion"],
+    )
+    for column in ("marca", "tipo", "familia"):
+        frame[column] = frame[column].astype("category")
+    frame["concentracion"] = frame["concentracion"].astype("float32")
+
+    types = get_perfume_types()
+    for column in ("duracion_min", "duracion_max"):
+        by_type = dict(zip(types["Tipo"].astype(str), types[column]))
+        frame[column] = frame["tipo"].map(by_type).astype("float32")
+    return frame
+
+
+def filter_catalog(
+    duracion_min: Optional[float] = None,
+    concentracion: Optional[Tuple[float, float]] = None,
+    familias: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """Perfumes cuya duración mínima y concentración están en los rangos indicados.
+
+    Los perfumes sin concentración conocida solo se descartan si se pide un rango de concentración.
+    """
+
+    import pandas as pd
+
+    frame = get_catalog_frame()
+    mask = pd.Series(True, index=frame.index)
+    if duracion_min is not None:
+        mask &= frame["duracion_min"] >= duracion_min
+    if concentracion is not None:
+        mask &= frame["concentracion"].between(*concentracion)  # NaN nunca está en el rango
+    if familias:
+        mask &= frame["familia"].isin(familias)
+    return frame[mask]
+
+
+@catalog_cache
 def get_perfume_examples() -> Dict[str, List[str]]:
-    """Devuelve ejemplos de marcas asociadas a cada tipo."""
+    """Devuelve ejemplos de marcas asociadas a cada tipo, tomados del catálogo."""
 
-    return {
-        "Parfum (Extracto)": ["Chanel No.5 Parfum", "Maison Francis Kurkdjian Baccarat Rouge 540"],
-        "Eau de Parfum": ["Dior J'adore", "YSL Libre"],
-        "Eau de Toilette": ["Acqua di Gio", "CH 212"],
-        "Eau de Cologne": ["4711 Original", "Tom Ford Neroli Portofino"],
-        "Body Mist": ["Victoria's Secret Love Spell", "Bath & Body Works Gingham"],
-    }
+    return {tipo: [perfume.nombre for perfume in featured_perfumes(tipo)] for tipo in TYPICAL_CONCENTRATION}
 
 
+@instrument
 def get_olfactive_families() -> Dict[str, Dict[str, str]]:
-    """Información descriptiva de familias olfativas."""
+    """Información descriptiva de familias olfativas.
+
+    No se memoriza: las URLs de las imágenes dependen de la sesión (ver :func:`resolve_image`)
+    y el resto ya está en la instantánea de contenido.
+    """
 
     return {
-        "Floral": {
-            "descripcion": "Bouquets ricos en notas de flores frescas y pétalos dulces.",
-            "ejemplos": "Chanel No.5, Marc Jacobs Daisy",
-            "imagen": resolve_image("floral.jpg", fallback_url="https://images.unsplash.com/photo-1487412720507-6297c0ae4bda"),
-        },
-        "Cítrica": {
-            "descripcion": "Fragancias vivaces con notas de limón, bergamota, mandarina.",
-            "ejemplos": "Dior Eau Sauvage, Atelier Cologne Orange Sanguine",
-            "imagen": resolve_image("citricas.jpg", fallback_url="https://images.unsplash.com/photo-1521572267360-ee0c2909d518?auto=compress&fit=crop&w=900"),
-        },
-        "Amaderada": {
-            "descripcion": "Aromas de maderas nobles, resinas y vetiver.",
-            "ejemplos": "Terre d'Hermès, Tom Ford Oud Wood",
-            "imagen": resolve_image("amaderadas.jpg", fallback_url="https://images.unsplash.com/photo-1498842812179-c81beecf902c?auto=compress&fit=crop&w=800"),
-        },
-        "Oriental": {
-            "descripcion": "Composiciones especiadas, dulces y envolventes.",
-            "ejemplos": "Guerlain Shalimar, Yves Saint Laurent Opium",
-            "imagen": resolve_image("orientales.jpg", fallback_url="https://images.unsplash.com/photo-1512767347951-df63c80f31ea?auto=compress&fit=crop&w=900"),
-        },
-        "Aromática": {
-            "descripcion": "Notas herbales como lavanda, salvia y romero.",
-            "ejemplos": "Giorgio Armani Acqua di Giò Profumo, Dior Sauvage",
-            "imagen": resolve_image("aromatica.jpg", fallback_url="https://images.unsplash.com/photo-1465408953385-7c4624fa7d6a?auto=compress&fit=crop&w=800"),
-        },
+        row["nombre"]: {
+            "descripcion": row["descripcion"],
+            "ejemplos": row["ejemplos"],
+            "imagen": resolve_image(row["imagen"], fallback_url=row["respaldo"], width=CARD_IMAGE_WIDTH),
+        }
+        for row in get_content()["familias"]
     }
 
 
+@catalog_cache
+def get_family_graph_model() -> FamilyGraph:
+    """Relaciones entre familias olfativas como grafo con consultas de vecinos y caminos."""
+
+    return FamilyGraph(
+        [
+            Edge("Floral", "Oriental"),
+            Edge("Floral", "Aromática"),
+            Edge("Cítrica", "Aromática"),
+            Edge("Cítrica", "Amaderada"),
+            Edge("Oriental", "Amaderada"),
+            Edge("Oriental", "Gourmand", "subfamilia"),
+            Edge("Amaderada", "Aromática"),
+            Edge("Aromática", "Fougere", "mezcla clásica"),
+        ]
+    )
+
+
 def get_family_graph() -> str:
     """Genera un gráfico en formato Graphviz DOT que relaciona las familias olfativas."""
 
-    return """
-        digraph FamiliasOlfativas {
-            rankdir=LR;
-            node [shape=ellipse, style=filled, color="#f1c40f", fontname="Helvetica"];
-            Floral -> Oriental;
-            Floral -> Aromática;
-            Cítrica -> Aromática;
-            Cítrica -> Amaderada;
-            Oriental -> Amaderada;
-            Oriental -> Gourmand [label="subfamilia"];
-            Amaderada -> Aromática;
-            Aromática -> Fougere [label="mezcla clásica"];
-        }
-    """
+    return get_family_graph_model().to_dot()
+
+
+@catalog_cache
+def get_family_graph_svg() -> str:
+    """Ruta del SVG pre-renderizado del grafo de familias (se genera una vez y queda en disco)."""
 
+    return str(render_svg(get_family_graph_model(), GRAPHS_DIR))
 
+
+@catalog_cache
 def get_curiosities() -> List[Dict[str, str]]:
     """Lista de curiosidades destacadas del universo del perfume."""
 
-    return [
-        {
-            "titulo": "El origen del término perfume",
-            "descripcion": "Proviene del latín 'per fumum', que significa 'a través del humo'.",
-        },
-        {
-            "titulo": "Perfume como símbolo de estatus",
-            "descripcion": "En el Antiguo Egipto, solo la realeza podía utilizar ciertos aceites aromáticos.",
-        },
-        {
-            "titulo": "La primera casa moderna",
-            "descripcion": "Guerlain, fundada en 1828, revolucionó la perfumería francesa con composiciones complejas.",
-        },
-        {
-            "titulo": "Narices profesionales",
-            "descripcion": "Los maestros perfumistas pueden identificar cientos de materias primas con un solo olfato.",
-        },
-    ]
+    return [{"titulo": row["titulo"], "descripcion": row["descripcion"]} for row in get_content()["curiosidades"]]
 
 
-def get_timeline_html() -> str:
-    """Devuelve HTML sencillo para una línea de tiempo histórica de perfumes icónicos."""
-
-    return """
-    <div class="timeline">
-      <style>
-        .timeline {font-family: 'Helvetica', sans-serif; margin-top: 1rem;}
-        .timeline-item {border-left: 3px solid #f39c12; padding-left: 1rem; margin-bottom: 1rem;}
-        .timeline-year {font-weight: bold; color: #d35400;}
-        .timeline-desc {margin: 0.25rem 0 0 0; color: #2c3e50;}
-      </style>
-      <div class="timeline-item">
-        <div class="timeline-year">1921</div>
-        <p class="timeline-desc">Chanel No.5 introduce aldehídos y redefine la perfumería moderna.</p>
-      </div>
-      <div class="timeline-item">
-        <div class="timeline-year">1957</div>
-        <p class="timeline-desc">Diorissimo celebra las notas florales verdes con lirio del valle.</p>
-      </div>
-      <div class="timeline-item">
-        <div class="timeline-year">1992</div>
-        <p class="timeline-desc">Thierry Mugler Angel populariza la familia gourmand.</p>
-      </div>
-      <div class="timeline-item">
-        <div class="timeline-year">2013</div>
-        <p class="timeline-desc">Maison Francis Kurkdjian Baccarat Rouge 540 simboliza el lujo moderno.</p>
-      </div>
-    </div>
-    """
+@catalog_cache
+def get_timeline() -> Timeline:
+    """Hitos históricos de la perfumería indexados por año y familia."""
+
+    return load_timeline(get_content()["historia"])
+
 
+def get_timeline_events() -> Sequence[TimelineEvent]:
+    """Hitos históricos de perfumes icónicos, en orden cronológico."""
 
-@dataclass
+    return get_timeline().events
+
+
+def get_timeline_html(events: Optional[Sequence[TimelineEvent]] = None) -> str:
+    """HTML de la línea de tiempo; solo se construye para los eventos indicados (por defecto, todos)."""
+
+    events = get_timeline_events() if events is None else events
+    return TIMELINE.render(
+        styles=stylesheet("timeline"),
+        items=TIMELINE_ITEM.render_many(
+            {"anio": event.anio, "titulo": event.titulo, "descripcion": event.descripcion} for event in events
+        ),
+    )
+
+
+def render_timeline(key: str = "timeline", page_size: int = 10) -> None:
+    """Línea de tiempo filtrable por décadas y familia; solo se envía al navegador la página visible."""
+
+    import streamlit as st  # importación local para evitar dependencias circulares
+
+    timeline = get_timeline()
+    decades = timeline.decades()
+    if not decades:
+        return
+    col_decadas, col_familia = st.columns([2, 1])
+    with col_decadas:
+        desde, hasta = (
+            st.select_slider(
+                "Décadas",
+                options=decades,
+                value=(decades[0], decades[-1]),
+                format_func=lambda decada: f"{decada}s",
+                key=f"{key}_decadas",
+            )
+            if len(decades) > 1
+            else (decades[0], decades[0])
+        )
+    with col_familia:
+        familia = st.selectbox("Familia", ["Todas", *timeline.families()], key=f"{key}_familia")
+
+    filters = {"desde": desde, "hasta": hasta + 9, "familia": None if familia == "Todas" else familia}
+    page = st.session_state.get(f"{key}_pagina", 1)
+    results = timeline.page(page=page, page_size=page_size, **filters)
+    if results.page != page:  # los filtros dejaron menos páginas que la elegida
+        st.session_state[f"{key}_pagina"] = results.page
+    if not results.total:
+        st.caption("No hay hitos para esos filtros.")
+        return
+    st.markdown(get_timeline_html(results.items), unsafe_allow_html=True)
+    if results.pages > 1:
+        st.number_input(
+            f"Página (de {results.pages}; {results.total} hitos)",
+            min_value=1,
+            max_value=results.pages,
+            step=1,
+            key=f"{key}_pagina",
+        )
+
+
+@dataclass(frozen=True)
 class QuizQuestion:
     pregunta: str
     opciones: Dict[str, str]
+    # Pesos opcionales por opción: {opción: {familia: peso}}. Por defecto cada opción vale 1 para su familia.
+    pesos: Optional[Dict[str, Dict[str, float]]] = None
 
 
+@catalog_cache
 def get_quiz_questions() -> List[QuizQuestion]:
     """Genera la lista de preguntas para el test olfativo."""
 
     return [
-        QuizQuestion(
-            pregunta="¿Qué sensación buscas en tu fragancia diaria?",
-            opciones={
-                "fresco": "Ligereza y frescura",
-                "floral": "Romanticismo y dulzura",
-                "oriental": "Sensualidad y calidez",
-                "amaderado": "Sofisticación y elegancia",
-            },
-        ),
-        QuizQuestion(
-            pregunta="¿Qué notas prefieres al inicio de un perfume?",
-            opciones={
-                "fresco": "Cítricos chispeantes",
-                "floral": "Pétalos suaves",
-                "oriental": "Especias exóticas",
-                "amaderado": "Hierbas y maderas aromáticas",
-            },
-        ),
-        QuizQuestion(
-            pregunta="¿Cómo quieres que te recuerden?",
-            opciones={
-                "floral": "Delicada y encantadora",
-                "oriental": "Misteriosa e intensa",
-                "amaderado": "Elegante y profesional",
-                "fresco": "Vibrante y jovial",
-            },
-        ),
-        QuizQuestion(
-            pregunta="¿Qué entorno te inspira más?",
-            opciones={
-                "fresco": "Una costa mediterránea",
-                "floral": "Un jardín en primavera",
-                "oriental": "Un bazar oriental",
-                "amaderado": "Un bosque lluvioso",
-            },
-        ),
-        QuizQuestion(
-            pregunta="Elige un accesorio que complemente tu estilo",
-            opciones={
-                "amaderado": "Reloj de cuero",
-                "oriental": "Joyas doradas",
-                "floral": "Fular de seda",
-                "fresco": "Gafas de sol",
-            },
-        ),
+        QuizQuestion(pregunta=row["pregunta"], opciones=dict(row["opciones"]), pesos=row.get("pesos"))
+        for row in get_content()["preguntas"]
     ]
 
 
-RECOMMENDATIONS = {
+def get_recommendations() -> Dict[str, Dict[str, Any]]:
+    """Resultado del test para cada familia, con su imagen resuelta para la sesión actual."""
+
+    return {
+        code: {
+            "titulo": row["titulo"],
+            "descripcion": row["descripcion"],
+            "imagen": resolve_image(row["imagen"], fallback_url=row["respaldo"]),
+        }
+        for code, row in get_content()["recomendaciones"].items()
+    }
+
+
+# Notas (o ``familia:<nombre>``) que definen cada perfil del test, con su peso relativo.
+QUIZ_NOTE_PROFILES: Dict[str, Dict[str, float]] = {
     "fresco": {
-        "titulo": "Familia Cítrica/Acuática",
-        "descripcion": "A todas luces refrescante, perfecta para días dinámicos y climas cálidos.",
-        "imagen": resolve_image("esencia_3.jpg", fallback_url="https://images.unsplash.com/photo-1521572267360-ee0c2909d518?auto=compress&fit=crop&w=900"),
+        "cítricos": 1.0, "bergamota": 1.0, "limón": 0.8, "mandarina": 0.8, "neroli": 0.8,
+        "acuático": 1.0, "verde": 0.6, "romero": 0.4, "familia:Cítrica": 1.5,
     },
     "floral": {
-        "titulo": "Familia Floral",
-        "descripcion": "Delicada y romántica, ideal para momentos íntimos y ocasiones especiales.",
-        "imagen": resolve_image("esencia_2.jpg", fallback_url="https://images.unsplash.com/photo-1487412720507-6297c0ae4bda"),
+        "rosa": 1.0, "jazmín": 1.0, "flores blancas": 1.0, "iris": 0.8, "frutal": 0.6,
+        "almizcle": 0.4, "familia:Floral": 1.5,
     },
     "oriental": {
-        "titulo": "Familia Oriental/Ámbar",
-        "descripcion": "Notas especiadas y dulces que envuelven con magnetismo nocturno.",
-        "imagen": resolve_image("esencia_1.jpg", fallback_url="https://images.unsplash.com/photo-1512767347951-df63c80f31ea?auto=compress&fit=crop&w=900"),
+        "ámbar": 1.0, "vainilla": 1.0, "especias": 1.0, "incienso": 0.8, "azafrán": 0.8,
+        "tonka": 0.6, "pachulí": 0.5, "familia:Oriental": 1.5,
     },
     "amaderado": {
-        "titulo": "Familia Amaderada/Aromática",
-        "descripcion": "Elegancia serena basada en vetiver, cedro y hierbas nobles.",
-        "imagen": resolve_image("esencia_1.jpg", fallback_url="https://images.unsplash.com/photo-1498842812179-c81beecf902c?auto=compress&fit=crop&w=800"),
+        "cedro": 1.0, "sándalo": 1.0, "vetiver": 1.0, "oud": 0.8, "lavanda": 0.6, "salvia": 0.6,
+        "romero": 0.6, "familia:Amaderada": 1.5, "familia:Aromática": 1.0,
     },
 }
 
 
-def evaluate_quiz(responses: List[str]) -> Dict[str, str]:
-    """Analiza las respuestas y retorna la mejor recomendación."""
+@catalog_cache
+def get_recommender() -> NoteRecommender[Perfume]:
+    """Recomendador construido una vez por proceso sobre todo el catálogo."""
+
+    from recommender import NoteRecommender
+
+    return NoteRecommender((perfume, perfume.lista_notas, perfume.familia) for perfume in iter_perfumes())
+
+
+def recommend_perfumes(puntajes: Dict[str, float], k: int = 5) -> List[Recommendation[Perfume]]:
+    """Perfumes más afines a los puntajes del test, combinando los perfiles de cada familia."""
+
+    preference: Dict[str, float] = {}
+    for code, score in puntajes.items():
+        for feature, weight in QUIZ_NOTE_PROFILES.get(code, {}).items():
+            preference[feature] = preference.get(feature, 0.0) + score * weight
+    return get_recommender().recommend(preference, k=k)
 
-    scores: Dict[str, int] = {"fresco": 0, "floral": 0, "oriental": 0, "amaderado": 0}
-    for choice in responses:
-        if choice in scores:
-            scores[choice] += 1
 
-    best = max(scores, key=scores.get)
-    result = RECOMMENDATIONS[best]
+def get_recommendation_html(recommendation: Recommendation[Perfume]) -> str:
+    """Tarjeta de una recomendación; los datos del catálogo se escapan antes de insertarlos."""
+
+    perfume = recommendation.item
+    return RECOMMENDATION.render(
+        nombre=perfume.nombre, tipo=perfume.tipo, afinidad=f"{recommendation.similarity:.0%}", notas=perfume.notas
+    )
+
+
+@catalog_cache
+def get_quiz_scorer() -> QuizScorer:
+    """Motor de puntuación construido a partir de las preguntas del test."""
+
+    from scoring import FAMILY_ORDER, QuizScorer
+
+    return QuizScorer(get_quiz_questions(), FAMILY_ORDER)
+
+
+@instrument
+def evaluate_quiz(responses: List[str]) -> Dict[str, object]:
+    """Analiza las respuestas y retorna la mejor recomendación.
+
+    Los empates se resuelven según ``FAMILY_ORDER``; el campo ``empate`` indica si lo hubo.
+    """
+
+    raw_scores, best, tie = get_quiz_scorer().score(responses)
+    scores = {family: int(value) if float(value).is_integer() else value for family, value in raw_scores.items()}
+    result = get_recommendations()[best]
+    QUIZ_RESULTS.inc(best)
     return {
         "codigo": best,
         "titulo": result["titulo"],
         "descripcion": result["descripcion"],
         "imagen": result["imagen"],
         "puntajes": scores,
+        "empate": tie,
     }
 
 
-def render_sidebar():
-    """Construye la barra lateral de navegación con enlaces a todas las páginas."""
+def record_quiz_result(responses: List[str], resultado: Dict[str, object]) -> bool:
+    """Guarda el envío del test en segundo plano; devuelve ``False`` si se descartó por saturación."""
+
+    return record_submission(responses, str(resultado["codigo"]), bool(resultado["empate"]))
+
+
+_SEARCH_INDEX = SearchIndex()
+_search_state: Dict[str, object] = {"version": object()}
+
+
+def get_search_documents() -> List[SearchDocument]:
+    """Documentos buscables: tipos, ejemplos, familias, curiosidades e hitos históricos."""
+
+    documents = [
+        SearchDocument(
+            f"tipo:{row['Tipo']}",
+            row["Tipo"],
+            f"{row['Concentración']} {row['Duración']} {row['Notas Destacadas']}",
+            "Tipo",
+            TIPOS_PAGE,
+        )
+        for row in get_perfume_types().to_dict("records")
+    ]
+    for tipo, nombres in get_perfume_examples().items():
+        documents.extend(SearchDocument(f"perfume:{nombre}", nombre, tipo, "Perfume", TIPOS_PAGE) for nombre in nombres)
+    for nombre, info in get_olfactive_families().items():
+        documents.append(
+            SearchDocument(f"familia:{nombre}", nombre, f"{info['descripcion']} {info['ejemplos']}", "Familia", FAMILIAS_PAGE)
+        )
+    for dato in get_curiosities():
+        documents.append(
+            SearchDocument(f"curiosidad:{dato['titulo']}", dato["titulo"], dato["descripcion"], "Curiosidad", CURIOSIDADES_PAGE)
+        )
+    for event in get_timeline_events():
+        documents.append(
+            SearchDocument(
+                f"historia:{event.anio}:{event.titulo}",
+                f"{event.anio} · {event.titulo}",
+                event.descripcion,
+                "Historia",
+                CURIOSIDADES_PAGE,
+            )
+        )
+    return documents
+
+
+def get_search_index() -> SearchIndex:
+    """Índice de búsqueda compartido; se sincroniza de forma incremental cuando cambia el catálogo."""
+
+    version = _catalog_version()
+    if _search_state["version"] != version:
+        _SEARCH_INDEX.sync(get_search_documents())
+        _search_state["version"] = version
+    return _SEARCH_INDEX
+
+
+def render_catalog_results(label: str, key: str, page_size: int = 6, **filters: object) -> None:
+    """Muestra una página de perfumes del catálogo con un selector de página si hace falta."""
 
     import streamlit as st  # importación local para evitar dependencias circulares
 
-    st.markdown(
-        """
-        <style>
-        [data-testid="stSidebarNav"] {display: none;}
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    page = st.session_state.get(key, 1)
+    results = query_perfumes(page=page, page_size=page_size, **filters)
+    if not results.items and results.total:
+        results = query_perfumes(page=1, page_size=page_size, **filters)
+    if not results.total:
+        return
+
+    st.markdown(f"**{label}** ({results.total})")
+    st.write(" · ".join(perfume.nombre for perfume in results.items))
+    if results.pages > 1:
+        st.number_input("Página", min_value=1, max_value=results.pages, step=1, key=key)
+
+
+def render_quiz_stats() -> None:
+    """Muestra la distribución de familias, las respuestas más elegidas y la tasa de empates."""
+
+    import streamlit as st  # importación local para evitar dependencias circulares
+
+    store = peek_quiz_store()
+    if store is None:
+        start_quiz_store()
+        st.caption("Cargando los resultados…")
+        return
+    stats = store.aggregates()
+    if not stats.total:
+        st.caption("Todavía no hay resultados guardados.")
+        return
+
+    titles = {code: value["titulo"] for code, value in get_recommendations().items()}
+    col_total, col_empates = st.columns(2)
+    col_total.metric("Tests completados", stats.total)
+    col_empates.metric("Resultados con empate", f"{stats.tasa_empates:.0%}")
+    for code, count in stats.familias.items():
+        st.progress(count / stats.total, text=f"{titles.get(code, code)}: {count}")
+
+    questions = get_quiz_questions()
+    for number, counts in sorted(stats.respuestas.items()):
+        if not 1 <= number <= len(questions) or not counts:
+            continue
+        question = questions[number - 1]
+        option, count = next(iter(counts.items()))
+        st.caption(
+            f"{number}. {question.pregunta}: **{question.opciones.get(option, option)}** "
+            f"({count / sum(counts.values()):.0%})"
+        )
+
+
+@instrument
+def render_sidebar():
+    """Construye la barra lateral de navegación con enlaces a las páginas del registro."""
+
+    import streamlit as st  # importación local para evitar dependencias circulares
 
     st.sidebar.title("El Arte del Perfume")
     st.sidebar.caption("Explora cada sección para descubrir el universo aromático.")
 
-    st.sidebar.page_link("app.py", label="Inicio")
-    st.sidebar.page_link("pages/1_Tipos_de_Perfumes.py", label="Tipos de Perfumes")
-    st.sidebar.page_link("pages/2_Familias_Olfativas.py", label="Familias Olfativas")
-    st.sidebar.page_link("pages/3_Curiosidades.py", label="Curiosidades")
-    st.sidebar.page_link("pages/4_Test_Interactivo.py", label="Test Interactivo")
-    st.sidebar.page_link("pages/5_Contacto.py", label="Contacto y Créditos")
+    for spec in PAGES:
+        page_link(spec.path, container=st.sidebar)
+
+    query = st.sidebar.text_input("Buscar", key="busqueda", placeholder="Ej. cítrica, Chanel, 1921…")
+    if query:
+        results = get_search_index().search(query, limit=5)
+        for result in results:
+            document = result.document
+            st.sidebar.page_link(document.pagina, label=f"{document.titulo} · {document.categoria}")
+        if not results:
+            st.sidebar.caption("Sin resultados.")
 
 
 __all__ = [
+    "CACHE_VERSION",
+    "CARD_IMAGE_WIDTH",
+    "DETAIL_IMAGE_WIDTH",
+    "GALLERY_IMAGE_WIDTH",
+    "catalog_cache",
+    "clear_catalog_cache",
     "get_asset_path",
     "resolve_image",
     "resolve_video",
+    "hero_background_url",
+    "get_hero_html",
+    "report_missing_assets",
+    "AssetIndex",
     "get_perfume_types",
+    "parse_numeric_range",
+    "get_catalog_frame",
+    "filter_catalog",
     "get_perfume_examples",
     "get_olfactive_families",
     "get_family_graph",
+    "get_family_graph_model",
+    "get_family_graph_svg",
     "get_curiosities",
+    "get_timeline",
+    "get_timeline_events",
     "get_timeline_html",
+    "get_search_documents",
+    "get_search_index",
     "get_quiz_questions",
+    "get_quiz_scorer",
     "evaluate_quiz",
+    "get_recommendations",
+    "record_quiz_result",
+    "render_quiz_stats",
+    "get_recommender",
+    "recommend_perfumes",
+    "get_recommendation_html",
+    "render_catalog_results",
     "render_sidebar",
+    "render_timeline",
 ]
 
 
+def __getattr__(name: str) -> Any:
+    # Compatibilidad: ``RECOMMENDATIONS`` era una constante calculada al importar el módulo.
+    if name == "RECOMMENDATIONS":
+        return get_recommendations()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")